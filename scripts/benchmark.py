@@ -13,6 +13,7 @@ import os
 import sys
 import time
 import argparse
+import tempfile
 import numpy as np
 from typing import Dict, List, Tuple
 
@@ -62,18 +63,21 @@ def benchmark_inference(
 ) -> Dict:
     """Benchmark inference with multiple iterations."""
     inference_times = []
+    results = []
     
     # Warmup run (don't count)
     _ = transcriber.transcribe(audio)
     
-    # Timed runs
+    # Timed runs; each result carries its own per-stage breakdown
     for i in range(num_iterations):
         start = time.perf_counter()
-        result = transcriber.transcribe(audio)
+        result = transcriber.transcribe(audio, return_result=True)
         elapsed = time.perf_counter() - start
         inference_times.append(elapsed)
+        results.append(result)
     
     audio_duration = len(audio) / 16000
+    stages = list(results[0].timings)
     
     return {
         "audio_duration_s": audio_duration,
@@ -84,6 +88,9 @@ def benchmark_inference(
         "max_inference_s": np.max(inference_times),
         "mean_rtf": np.mean(inference_times) / audio_duration,
         "throughput_x": audio_duration / np.mean(inference_times),
+        "stage_ms": {stage: float(np.mean([r.timings[stage] for r in results])) for stage in stages},
+        "bucket": results[0].bucket,
+        "padding_ratio": results[0].padding_ratio,
     }
 
 
@@ -117,6 +124,9 @@ def run_benchmark(model_path: str, devices: List[str], durations: List[float], i
             
             print(f"    Mean: {bench['mean_inference_s']:.3f}s ± {bench['std_inference_s']:.3f}s")
             print(f"    RTF:  {bench['mean_rtf']:.3f} | Throughput: {bench['throughput_x']:.1f}x real-time")
+            stages = " | ".join(f"{stage} {ms:.1f}" for stage, ms in bench["stage_ms"].items())
+            print(f"    Stages (ms): {stages} | Input: {bench['bucket']} samples, "
+                  f"{bench['padding_ratio']:.0%} padding")
         
         # Cleanup
         del transcriber
@@ -155,6 +165,18 @@ def print_comparison_table(results: Dict):
             row += f" | {bench['mean_inference_s']:>12.3f} | {bench['mean_rtf']:>10.3f}"
         print(row)
     
+    # Where the time goes
+    print("\n## Stage Breakdown (mean ms)")
+    print("-" * 80)
+    stages = list(results[devices[0]]["benchmarks"][durations[0]]["stage_ms"])
+    print(f"{'Duration':>10s} | {'Device':>6s} | " + " | ".join(f"{stage:>10s}" for stage in stages)
+          + f" | {'Padding':>7s}")
+    for dur in durations:
+        for device in devices:
+            bench = results[device]["benchmarks"][dur]
+            print(f"{dur:>10s} | {device:>6s} | " + " | ".join(f"{bench['stage_ms'][s]:>10.1f}" for s in stages)
+                  + f" | {bench['padding_ratio']:>7.0%}")
+    
     # Speedup comparison
     if len(devices) == 2:
         print("\n## Speedup Comparison (NPU vs CPU)")
@@ -177,8 +199,14 @@ def main():
                         help="Comma-separated audio durations to test (seconds)")
     parser.add_argument("--device", type=str, default="both",
                         help="Device to test: NPU, CPU, or both")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Benchmark a tiny synthetic model instead of --model (offline, no NPU needed)")
     args = parser.parse_args()
     
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"))
+    
     durations = [float(d) for d in args.durations.split(",")]
     
     if args.device.lower() == "both":
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Transcript cache replay benchmark.
+
+Replays an IVR-like workload (a pool of distinct prompts requested with a
+Zipf popularity, so a few prompts dominate) through a Transcriber with and
+without a TranscriptCache, and reports throughput and hit rates. With --db
+the run is repeated on a fresh process-local cache backed by the same SQLite
+file, simulating a restart.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.cache import TranscriptCache
+from stt_npu.core import Transcriber
+
+
+def build_workload(num_prompts: int, num_requests: int, zipf_s: float = 1.2, seed: int = 0):
+    """Distinct prompts of 1-6s and a request sequence drawn with Zipf popularity."""
+    rng = np.random.default_rng(seed)
+    prompts = [
+        (0.1 * rng.standard_normal(int(rng.uniform(1, 6) * 16000))).astype(np.float32)
+        for _ in range(num_prompts)
+    ]
+    weights = 1.0 / np.arange(1, num_prompts + 1) ** zipf_s
+    requests = rng.choice(num_prompts, size=num_requests, p=weights / weights.sum())
+    return prompts, requests
+
+
+def replay(transcriber: Transcriber, prompts, requests) -> float:
+    """Transcribe every request in order; returns wall seconds."""
+    start = time.perf_counter()
+    for idx in requests:
+        # A copy, as a new request would bring its own buffer
+        transcriber.transcribe(prompts[idx].copy())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcript cache replay benchmark")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to model")
+    parser.add_argument("--device", type=str, default="NPU", help="Device to use")
+    parser.add_argument("--prompts", type=int, default=50, help="Distinct prompts in the workload")
+    parser.add_argument("--requests", type=int, default=500, help="Requests replayed")
+    parser.add_argument("--zipf", type=float, default=1.2, help="Zipf exponent of prompt popularity")
+    parser.add_argument("--max-entries", type=int, default=32, help="In-memory LRU size")
+    parser.add_argument("--db", type=str, default=None, help="SQLite file for the disk tier")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use a synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"),
+                                            hidden_size=768, num_layers=6)
+
+    prompts, requests = build_workload(args.prompts, args.requests, args.zipf)
+    audio_seconds = sum(len(prompts[i]) for i in requests) / 16000
+    unique = len(set(requests.tolist()))
+
+    print("=" * 60)
+    print("TRANSCRIPT CACHE REPLAY BENCHMARK")
+    print("=" * 60)
+    print(f"Model:    {args.model}")
+    print(f"Workload: {args.requests} requests, {unique} distinct prompts, {audio_seconds:.0f}s audio")
+
+    transcriber = Transcriber(model_path=args.model, device=args.device)
+    transcriber.transcribe(prompts[0])  # Warmup
+    runs = [("no cache", replay(transcriber, prompts, requests), None)]
+
+    cache = TranscriptCache(max_entries=args.max_entries, db_path=args.db)
+    cache.clear()
+    transcriber.cache = cache
+    runs.append((f"LRU {args.max_entries}" + (" + disk" if args.db else ""),
+                 replay(transcriber, prompts, requests), cache.stats))
+    cache.close()
+
+    if args.db:
+        # Fresh memory tier, same file: what a restarted process sees
+        transcriber.cache = TranscriptCache(max_entries=args.max_entries, db_path=args.db)
+        runs.append(("restarted", replay(transcriber, prompts, requests), transcriber.cache.stats))
+
+    print("\n" + "-" * 78)
+    print(f"{'Run':>16s} | {'req/s':>8s} | {'speedup':>7s} | {'hits':>6s} | {'disk':>6s} | {'misses':>6s} | {'evicted':>7s}")
+    print("-" * 78)
+    baseline = runs[0][1]
+    for name, elapsed, stats in runs:
+        row = f"{name:>16s} | {args.requests / elapsed:>8.1f} | {baseline / elapsed:>6.2f}x"
+        if stats is not None:
+            row += f" | {stats['hits']:>6d} | {stats['disk_hits']:>6d} | {stats['misses']:>6d} | {stats['evictions']:>7d}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
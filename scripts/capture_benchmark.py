@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Capture path cost over a simulated hour of microphone input.
+
+Replays the same block sequence through:
+1. The old path: float32 blocks, ``indata.flatten().copy()`` into a
+   queue.Queue, utterances rebuilt with np.concatenate
+2. CaptureRing with int16 (and float32) capture: blocks copied into a
+   preallocated ring, converted to float32 on read, utterances fetched with
+   one vectorized conversion
+
+and reports callback time (mean / p99 / max), total CPU seconds per hour on
+both sides, garbage collector runs and bytes per captured block. No audio device is
+needed: callbacks are driven back to back.
+"""
+
+import gc
+import os
+import sys
+import time
+import queue
+import argparse
+import numpy as np
+from typing import Dict
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.capture import CaptureRing
+from stt_npu.utils import BLOCK_SIZE, SAMPLE_RATE
+
+
+class GCCounter:
+    """Counts collector runs per generation via gc.callbacks."""
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self.collections[info["generation"]] += 1
+
+    def __enter__(self):
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+
+def make_blocks(dtype: str, num_distinct: int = 64, seed: int = 0):
+    """A few distinct device blocks, cycled (sounddevice also hands over its own buffer)."""
+    rng = np.random.default_rng(seed)
+    audio = 0.1 * rng.standard_normal((num_distinct, BLOCK_SIZE, 1))
+    if dtype == "int16":
+        return (audio * 32767).astype(np.int16)
+    return audio.astype(np.float32)
+
+
+def run_queue_path(blocks: np.ndarray, num_blocks: int, utterance_blocks: int, gap_blocks: int) -> Dict:
+    """The original capture loop: per-block copies into a queue, utterances concatenated."""
+    audio_queue = queue.Queue()
+
+    def audio_callback(indata, frames, time_info, status):
+        audio_queue.put(indata.flatten().copy())
+
+    callback_ns = np.empty(num_blocks, dtype=np.int64)
+    speech_buffer = []
+    consumer_ns = 0
+    period = utterance_blocks + gap_blocks
+    for i in range(num_blocks):
+        start = time.perf_counter_ns()
+        audio_callback(blocks[i % len(blocks)], BLOCK_SIZE, None, None)
+        callback_ns[i] = time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        chunk = audio_queue.get()
+        if i % period < utterance_blocks:
+            speech_buffer.append(chunk)
+        elif speech_buffer:
+            full_audio = np.concatenate(speech_buffer)
+            speech_buffer = []
+        consumer_ns += time.perf_counter_ns() - start
+    return {"callback_ns": callback_ns, "consumer_s": consumer_ns / 1e9}
+
+
+def run_ring_path(blocks: np.ndarray, num_blocks: int, utterance_blocks: int, gap_blocks: int, dtype: str) -> Dict:
+    """CaptureRing: copy into the ring, convert on read, one conversion per utterance."""
+    ring = CaptureRing(seconds=60, dtype=dtype, block_size=BLOCK_SIZE)
+    utterance = np.empty(utterance_blocks * BLOCK_SIZE, dtype=np.float32)
+
+    callback_ns = np.empty(num_blocks, dtype=np.int64)
+    speech_start = None
+    consumer_ns = 0
+    period = utterance_blocks + gap_blocks
+    for i in range(num_blocks):
+        start = time.perf_counter_ns()
+        ring.callback(blocks[i % len(blocks)], BLOCK_SIZE, None, None)
+        callback_ns[i] = time.perf_counter_ns() - start
+
+        start = time.perf_counter_ns()
+        block_start = ring.read_position
+        chunk = ring.read()
+        if i % period < utterance_blocks:
+            if speech_start is None:
+                speech_start = block_start
+        elif speech_start is not None:
+            full_audio = ring.get_range(speech_start, block_start, out=utterance)
+            speech_start = None
+        consumer_ns += time.perf_counter_ns() - start
+    return {"callback_ns": callback_ns, "consumer_s": consumer_ns / 1e9}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Capture callback CPU and GC over a simulated run")
+    parser.add_argument("--hours", type=float, default=1.0, help="Simulated capture length")
+    parser.add_argument("--utterance-s", type=float, default=4.0, help="Speech length per utterance")
+    parser.add_argument("--gap-s", type=float, default=2.0, help="Silence between utterances")
+    args = parser.parse_args()
+
+    num_blocks = int(args.hours * 3600 * SAMPLE_RATE / BLOCK_SIZE)
+    utterance_blocks = int(args.utterance_s * SAMPLE_RATE / BLOCK_SIZE)
+    gap_blocks = int(args.gap_s * SAMPLE_RATE / BLOCK_SIZE)
+
+    print("=" * 60)
+    print("CAPTURE PATH BENCHMARK")
+    print("=" * 60)
+    print(f"Simulated: {args.hours:.1f}h = {num_blocks} callbacks of {BLOCK_SIZE} samples")
+
+    runs = {}
+    for name, dtype in (("queue float32", "float32"), ("ring float32", "float32"), ("ring int16", "int16")):
+        blocks = make_blocks(dtype)
+        gc.collect()
+        with GCCounter() as counter:
+            wall_start = time.perf_counter()
+            if name.startswith("queue"):
+                result = run_queue_path(blocks, num_blocks, utterance_blocks, gap_blocks)
+            else:
+                result = run_ring_path(blocks, num_blocks, utterance_blocks, gap_blocks, dtype)
+            result["wall_s"] = time.perf_counter() - wall_start
+        result["gc"] = counter.collections
+        result["bytes_per_block"] = blocks[0].nbytes
+        runs[name] = result
+
+    scale = 1.0 / args.hours
+    print("\n" + "-" * 96)
+    print(f"{'Path':>14s} | {'cb mean us':>10s} | {'cb p99 us':>9s} | {'cb max us':>9s} | "
+          f"{'cb s/h':>7s} | {'reader s/h':>10s} | {'B/block':>7s} | {'GC g0/g1/g2':>12s}")
+    print("-" * 96)
+    for name, r in runs.items():
+        cb_us = r["callback_ns"] / 1000
+        print(f"{name:>14s} | {cb_us.mean():>10.2f} | {np.percentile(cb_us, 99):>9.2f} | {cb_us.max():>9.1f} | "
+              f"{cb_us.sum() / 1e6 * scale:>7.2f} | {r['consumer_s'] * scale:>10.2f} | {r['bytes_per_block']:>7d} | "
+              f"{'/'.join(str(c) for c in r['gc']):>12s}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+"""
+Run the local transcription daemon.
+
+Loads one Transcriber and serves co-located processes over shared memory
+plus a Unix control socket (see stt_npu.ipc). Clients:
+
+    from stt_npu.ipc import TranscriptionClient
+    with TranscriptionClient() as client:
+        text = client.submit(audio).result()
+        client.reload("models/wav2vec2-base-960h").result()  # Hot-swap, needs --model-root models
+
+With ``--snapshot`` the daemon starts from a warm-start snapshot (see
+scripts/export_snapshot.py) without importing torch or transformers;
+reloads then take snapshot files too.
+"""
+
+import os
+import sys
+import argparse
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.hotswap import HotSwapTranscriber
+from stt_npu.ipc import TranscriptionDaemon, default_address
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local STT daemon")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to OpenVINO IR model")
+    parser.add_argument("--device", type=str, default="NPU", help="Device to use for transcription (NPU, CPU)")
+    parser.add_argument("--socket", type=str, default=None,
+                        help=f"Control socket path (default: {default_address()})")
+    parser.add_argument("--snapshot", type=str, default=None,
+                        help="Start from a warm-start snapshot file instead of --model (see scripts/export_snapshot.py)")
+    parser.add_argument("--trim-silence", action="store_true", help="Trim non-speech edges before transcription")
+    parser.add_argument("--model-root", type=str, default=None,
+                        help="Directory clients may reload other models from (default: only the current model reloads)")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        from stt_npu.snapshot import load_snapshot
+        print(f"Loading snapshot {args.snapshot}...")
+        transcriber = load_snapshot(args.snapshot, trim_silence=args.trim_silence)
+        factory = lambda model_path, **kwargs: load_snapshot(model_path, trim_silence=args.trim_silence, **kwargs)
+    else:
+        from stt_npu.core import Transcriber
+        print(f"Initializing Transcriber on {args.device}...")
+        transcriber = Transcriber(model_path=args.model, device=args.device, trim_silence=args.trim_silence)
+        factory = lambda **kwargs: Transcriber(trim_silence=args.trim_silence, **kwargs)
+    # Clients can swap the model in place; replacements keep the same settings
+    engine = HotSwapTranscriber(transcriber, factory=factory)
+    TranscriptionDaemon(engine, args.socket, model_root=args.model_root).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+CTC decode latency: greedy vs prefix beam search.
+
+By default decodes synthetic "peaky" logits shaped like Wav2Vec2 output
+(mostly confident blank frames, one spike per character, some spikes with a
+close competitor). With --model, logits come from a real Transcriber run on
+synthetic audio instead.
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from typing import Callable, Dict, List
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.decoding import CTCBeamSearchDecoder, greedy_decode, load_vocab
+from stt_npu.synthetic import WAV2VEC2_VOCAB, num_output_frames
+
+SAMPLE_TEXT = "THE DOG WAS LYING ON THE GRASS IN THE MIDDLE OF THE LAWN "
+
+
+def generate_peaky_logits(duration: float, vocab: List[str], chars_per_second: float = 12.0,
+                          ambiguity: float = 0.2, seed: int = 0) -> np.ndarray:
+    """Synthetic CTC logits: confident blanks with one spike per character."""
+    rng = np.random.default_rng(seed)
+    num_frames = num_output_frames(int(duration * 16000))
+    num_chars = max(1, int(duration * chars_per_second))
+    text = (SAMPLE_TEXT * (num_chars // len(SAMPLE_TEXT) + 1))[:num_chars]
+
+    logits = rng.standard_normal((num_frames, len(vocab))).astype(np.float32)
+    logits[:, vocab.index("<pad>")] += 14.0
+    positions = np.linspace(1, num_frames - 2, num_chars).astype(int)
+    for pos, char in zip(positions, text):
+        token = vocab.index("|" if char == " " else char)
+        logits[pos, vocab.index("<pad>")] -= 14.0
+        logits[pos, token] += 14.0
+        if rng.random() < ambiguity:
+            logits[pos, rng.integers(5, len(vocab))] += 12.5
+    return logits
+
+
+def time_decode(fn: Callable, iterations: int) -> Dict:
+    """Time a zero-argument decode callable, after one warmup call."""
+    fn()
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    times_ms = np.array(times) * 1000
+    return {"p50_ms": float(np.percentile(times_ms, 50)), "p95_ms": float(np.percentile(times_ms, 95))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Greedy vs beam search CTC decode latency")
+    parser.add_argument("--model", type=str, default=None,
+                        help="Take logits from this model (default: synthetic peaky logits)")
+    parser.add_argument("--device", type=str, default="CPU",
+                        help="Device for --model")
+    parser.add_argument("--durations", type=str, default="5,10,30",
+                        help="Comma-separated window durations (seconds)")
+    parser.add_argument("--beams", type=str, default="8,16",
+                        help="Comma-separated beam widths")
+    parser.add_argument("--iterations", type=int, default=20,
+                        help="Timed decodes per configuration")
+    args = parser.parse_args()
+
+    durations = [float(d) for d in args.durations.split(",")]
+    beams = [int(b) for b in args.beams.split(",")]
+
+    transcriber = None
+    vocab = WAV2VEC2_VOCAB
+    if args.model is not None:
+        from stt_npu.core import Transcriber
+        transcriber = Transcriber(model_path=args.model, device=args.device)
+        vocab = load_vocab(args.model)
+
+    decoders = {b: CTCBeamSearchDecoder(vocab, beam_width=b) for b in beams}
+
+    print("\n" + "=" * 70)
+    print("CTC DECODE LATENCY (p50 / p95 ms)")
+    print("=" * 70)
+    header = f"{'Window':>8s} | {'greedy':>15s}" + "".join(f" | {'beam ' + str(b):>15s}" for b in beams)
+    print(header)
+    print("-" * len(header))
+
+    for duration in durations:
+        if transcriber is not None:
+            rng = np.random.default_rng(0)
+            audio = (0.1 * rng.standard_normal(int(duration * 16000))).astype(np.float32)
+            padded, _ = transcriber._pad(audio)
+            logits = transcriber._infer(transcriber._preprocess(padded))[0].numpy()
+        else:
+            logits = generate_peaky_logits(duration, vocab)
+
+        results = [time_decode(lambda: greedy_decode(logits, vocab), args.iterations)]
+        for b in beams:
+            results.append(time_decode(lambda: decoders[b].decode(logits), args.iterations))
+
+        row = f"{duration:>7.0f}s"
+        for r in results:
+            row += f" | {r['p50_ms']:>6.2f} / {r['p95_ms']:>6.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Export a warm-start snapshot of a model.
+
+Compiles the model once for a device and input shape and writes one file
+with the compiled blob, the vocab, the normalization settings and metadata.
+Load it with ``stt_npu.snapshot.load_snapshot`` (or ``--snapshot`` in
+scripts/test_npu.py and scripts/daemon.py) to skip the processor, the IR
+and the compile at startup. Re-export after changing the model, the
+OpenVINO version or the NPU driver.
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.snapshot import export_snapshot, load_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a compiled warm-start snapshot of a model")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to OpenVINO IR model")
+    parser.add_argument("--device", type=str, default="NPU", help="Device to compile for (NPU, CPU)")
+    parser.add_argument("--duration", type=float, default=None,
+                        help="Static input length in seconds (default: 30 on NPU, dynamic elsewhere)")
+    parser.add_argument("--batch-size", type=int, default=1, help="Static batch dimension")
+    parser.add_argument("--output", type=str, default=None, help="Snapshot file (default: inside the model directory)")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Snapshot a tiny synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"))
+
+    input_length = int(args.duration * 16000) if args.duration else None
+    print(f"Compiling {args.model} for {args.device.upper()}...")
+    path = export_snapshot(args.model, args.output, device=args.device, input_length=input_length,
+                           batch_size=args.batch_size)
+    snapshot = load_snapshot(path)
+    metadata = snapshot.metadata
+    print(f"Wrote {path} ({os.path.getsize(path) / 1e6:.1f} MB)")
+    print(f"  Shape:   [{metadata['batch_size']}, {metadata['input_length'] or 'dynamic'}] on {metadata['device']}")
+    print(f"  Compile: {metadata['compile_s']:.2f}s at export, import: {snapshot.import_s:.2f}s at load")
+    print(f"  OpenVINO {metadata['openvino_version']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Service latency while the model is replaced.
+
+A client thread sends requests at a steady rate to a HotSwapTranscriber.
+Partway through, a reload to another model is started: the replacement is
+loaded, compiled and warmed up in the background, then swapped in.
+Reports latency (p50 / p95 / max) before, during and after the swap, and
+failed requests. For comparison, a stop-and-reload restart leaves
+requests waiting for the full load time.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import threading
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.hotswap import HotSwapTranscriber
+from stt_npu.utils import SAMPLE_RATE
+
+
+def summarize(latencies_ms):
+    if not latencies_ms:
+        return f"{'-':>24s}"
+    values = np.array(latencies_ms)
+    return f"{np.percentile(values, 50):>6.1f} / {np.percentile(values, 95):>6.1f} / {values.max():>6.1f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency during a background model hot-swap")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-base-960h", help="Initial model")
+    parser.add_argument("--new-model", type=str, default="models/wav2vec2-large-960h", help="Model swapped in")
+    parser.add_argument("--device", type=str, default="CPU", help="Device to use")
+    parser.add_argument("--duration", type=float, default=2.0, help="Audio per request (seconds)")
+    parser.add_argument("--interval-ms", type=float, default=100.0, help="Time between requests")
+    parser.add_argument("--settle-s", type=float, default=3.0, help="Steady-state time before and after the swap")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Swap between two synthetic models (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        root = tempfile.mkdtemp()
+        # Same size with new weights (a re-export); wide enough that loading overlaps with traffic
+        args.model = export_synthetic_model(os.path.join(root, "synthetic-a"), hidden_size=2048, num_layers=8)
+        args.new_model = export_synthetic_model(os.path.join(root, "synthetic-b"), hidden_size=2048, num_layers=8, seed=1)
+
+    engine = HotSwapTranscriber(Transcriber(model_path=args.model, device=args.device))
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal(int(args.duration * SAMPLE_RATE))).astype(np.float32)
+    engine.transcribe(audio)  # Warmup
+
+    records = []  # (sent, latency_ms, model_path or None on failure)
+    stop = threading.Event()
+
+    def client():
+        next_send = time.perf_counter()
+        while not stop.is_set():
+            sent = time.perf_counter()
+            try:
+                engine.transcribe(audio)
+                model = engine.current.model_path
+            except Exception:
+                model = None
+            records.append((sent, (time.perf_counter() - sent) * 1000, model))
+            next_send += args.interval_ms / 1000
+            time.sleep(max(0.0, next_send - time.perf_counter()))
+
+    thread = threading.Thread(target=client, daemon=True)
+    thread.start()
+    time.sleep(args.settle_s)
+    swap_start = time.perf_counter()
+    engine.reload(args.new_model).result()
+    swap_end = time.perf_counter()
+    time.sleep(args.settle_s)
+    stop.set()
+    thread.join()
+
+    phases = {
+        "before": [r for r in records if r[0] < swap_start],
+        "during swap": [r for r in records if swap_start <= r[0] < swap_end],
+        "after": [r for r in records if r[0] >= swap_end],
+    }
+
+    print("=" * 60)
+    print("HOT-SWAP LATENCY")
+    print("=" * 60)
+    print(f"{args.model} -> {args.new_model} ({args.device}), {args.duration:.0f}s requests every {args.interval_ms:.0f}ms")
+    print(f"Swap: {swap_end - swap_start:.2f}s (load {engine.last_load_s:.2f}s + warmup {engine.last_warmup_s:.2f}s)")
+    print(f"\n{'Phase':>12s} | {'requests':>8s} | {'failed':>6s} | {'p50 / p95 / max ms':>24s}")
+    print("-" * 60)
+    for name, phase in phases.items():
+        failed = sum(1 for r in phase if r[2] is None)
+        print(f"{name:>12s} | {len(phase):>8d} | {failed:>6d} | {summarize([r[1] for r in phase])}")
+    normal = [r[1] for r in phases["before"]]
+    print(f"\nStop-and-reload instead: requests arriving during the load wait up to "
+          f"{engine.last_load_s * 1000 + np.median(normal):.0f} ms (load + one request), "
+          f"and audio captured meanwhile is lost in the live loop.")
+
+
+if __name__ == "__main__":
+    main()
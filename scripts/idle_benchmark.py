@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+"""
+CPU cost of the live loop while nobody is speaking.
+
+Feeds a CaptureRing with quiet room noise at real time (one 32ms block per
+callback, from a feeder thread) and runs the consumer side of
+scripts/test_npu.py:
+1. Always-on: wait for each block and run Silero VAD on it
+2. IdleMonitor: the same until ``--idle-after-s`` of quiet, then one
+   energy check over the captured blocks every ``check_interval_s``, no VAD
+
+Every mode first runs for ``--idle-after-s`` (plus a short margin) so the
+IdleMonitor run has gone idle. Process CPU time is then measured over the
+same ``--seconds`` span in every mode, minus a feeder-only run, and scaled to
+CPU-seconds per idle hour. Finally a loud burst is injected while
+idle to check the wake path: detection delay and whether the pre-roll
+reaches back before the onset.
+"""
+
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.capture import CaptureRing
+from stt_npu.idle import IdleMonitor
+from stt_npu.utils import BLOCK_SIZE, SAMPLE_RATE
+
+LEAD_IN_MARGIN_S = 0.5 # Past idle_after_s, so the monitor is idle when measuring starts
+
+
+class Feeder:
+    """Writes int16 blocks into the ring at the audio callback rate."""
+
+    def __init__(self, ring: CaptureRing, noise_db: float, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        amplitude = 32768 * 10 ** (noise_db / 20)
+        self.blocks = (amplitude * rng.standard_normal((64, BLOCK_SIZE, 1))).astype(np.int16)
+        self.burst = (8000 * rng.standard_normal((BLOCK_SIZE, 1))).astype(np.int16)
+        self.ring = ring
+        self.burst_at = None  # Ring position of the injected onset
+        self._inject = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def inject_burst(self):
+        self._inject.set()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        period = BLOCK_SIZE / SAMPLE_RATE
+        next_time = time.perf_counter()
+        i = 0
+        while not self._stop.is_set():
+            if self._inject.is_set() and self.burst_at is None:
+                self.burst_at = self.ring.write_position
+            block = self.burst if self.burst_at is not None else self.blocks[i % len(self.blocks)]
+            self.ring.write(block)
+            i += 1
+            next_time += period
+            time.sleep(max(0.0, next_time - time.perf_counter()))
+
+
+def run(mode: str, args, vad=None):
+    """Run one consumer mode; returns (cpu_s over the args.seconds after the lead-in, monitor)."""
+    ring = CaptureRing(seconds=60, block_size=BLOCK_SIZE)
+    feeder = Feeder(ring, args.noise_db)
+    monitor = IdleMonitor(idle_after_s=args.idle_after_s) if mode == "idle" else None
+    measure_from = time.perf_counter() + args.idle_after_s + LEAD_IN_MARGIN_S
+    end = measure_from + args.seconds
+    cpu_start = None
+    feeder.start()
+    while time.perf_counter() < end:
+        if cpu_start is None and time.perf_counter() >= measure_from:
+            cpu_start = time.process_time()
+            wall_start = time.perf_counter()
+            if monitor is not None and not monitor.is_idle:
+                print("Warning: IdleMonitor was not idle when measuring started")
+        if mode == "feeder":
+            time.sleep(0.1)
+            ring.seek(ring.write_position)
+            continue
+        if monitor is not None and monitor.is_idle:
+            time.sleep(monitor.check_interval_s)
+            monitor.poll(ring)
+            continue
+        if not ring.wait(timeout=0.1):
+            continue
+        chunk = ring.read()
+        speech = vad.speech_probability(chunk, SAMPLE_RATE) > vad.threshold
+        if monitor is not None:
+            monitor.observe(speech, BLOCK_SIZE)
+    # A poll may start or end the span a little off the mark; normalize it to args.seconds
+    cpu_s = (time.process_time() - cpu_start) * args.seconds / (time.perf_counter() - wall_start)
+    feeder.stop()
+    return cpu_s, monitor
+
+
+def check_wake(args):
+    """Inject a burst while idle; returns (detection delay s, pre-roll s before onset)."""
+    ring = CaptureRing(seconds=60, block_size=BLOCK_SIZE)
+    feeder = Feeder(ring, args.noise_db, seed=1)
+    monitor = IdleMonitor(idle_after_s=0.0)
+    monitor.observe(False, BLOCK_SIZE)
+    feeder.start()
+    time.sleep(1.0)
+    monitor.poll(ring)
+    feeder.inject_burst()
+    injected = time.perf_counter()
+    resume = None
+    while resume is None and time.perf_counter() - injected < 5:
+        time.sleep(monitor.check_interval_s)
+        resume = monitor.poll(ring)
+    delay = time.perf_counter() - injected
+    feeder.stop()
+    if resume is None:
+        return None, None
+    return delay, (feeder.burst_at - resume) / SAMPLE_RATE
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Idle CPU: always-on VAD vs IdleMonitor")
+    parser.add_argument("--seconds", type=float, default=30.0,
+                        help="Real-time seconds measured per mode, after the --idle-after-s lead-in")
+    parser.add_argument("--idle-after-s", type=float, default=5.0, help="Quiet time before going idle")
+    parser.add_argument("--noise-db", type=float, default=-65.0, help="Room noise level (dBFS)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("IDLE MODE BENCHMARK")
+    print("=" * 60)
+    from stt_npu.vad import VoiceActivityDetector
+    vad = VoiceActivityDetector(threshold=0.5)
+    print(f"{args.seconds:.0f}s of {args.noise_db:.0f} dBFS noise measured per mode at real time, "
+          f"after a {args.idle_after_s + LEAD_IN_MARGIN_S:.1f}s lead-in (idle after {args.idle_after_s:.0f}s)")
+
+    feeder_cpu, _ = run("feeder", args)
+    always_cpu, _ = run("always", args, vad)
+    idle_cpu, monitor = run("idle", args, vad)
+    # All three were measured over the same idle-only span of args.seconds
+    always_loop = max(always_cpu - feeder_cpu, 0.0)
+    idle_loop = max(idle_cpu - feeder_cpu, 0.0)
+
+    print(f"\n{'Mode':>16s} | {'CPU s (loop)':>12s} | {'CPU s per idle hour':>19s}")
+    print("-" * 55)
+    print(f"{'always-on VAD':>16s} | {always_loop:>12.2f} | {always_loop / args.seconds * 3600:>19.1f}")
+    print(f"{'IdleMonitor':>16s} | {idle_loop:>12.2f} | {idle_loop / args.seconds * 3600:>19.1f}")
+    stats = monitor.stats()
+    print(f"\nIdleMonitor: {stats['checks']} energy checks over {stats['idle_s']:.1f}s, "
+          f"noise floor {stats['noise_floor_db']:.1f} dBFS, wake level {stats['wake_level_db']:.1f} dBFS")
+    print(f"Feeder thread alone: {feeder_cpu:.2f} CPU s (subtracted)")
+
+    delay, preroll = check_wake(args)
+    if delay is None:
+        print("\nWake: burst NOT detected")
+    else:
+        print(f"\nWake: detected {delay * 1000:.0f}ms after the onset; VAD resumes {preroll * 1000:.0f}ms before it")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+"""
+Per-request overhead of sharing one engine across processes.
+
+Compares, for the same model and audio:
+1. In-process Transcriber.transcribe calls
+2. TranscriptionClient -> TranscriptionDaemon (shared memory + Unix socket)
+3. An HTTP round trip (raw float32 POST to a local http.server)
+
+The daemon and HTTP server each run in their own process, like a real
+co-located deployment. Overhead = latency minus the in-process latency.
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import tempfile
+import subprocess
+import http.client
+import multiprocessing as mp
+import numpy as np
+from typing import Callable, Dict
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.ipc import TranscriptionClient
+
+HTTP_PORT = 47601
+
+
+def run_http_server(model_path: str, device: str, port: int):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    transcriber = Transcriber(model_path=model_path, device=device)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Headers and body are separate writes; without this, Nagle + delayed ACK add ~40ms
+        disable_nagle_algorithm = True
+
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+            text = transcriber.transcribe(np.frombuffer(body, dtype=np.float32))
+            payload = json.dumps({"text": text}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    ThreadingHTTPServer(("127.0.0.1", port), Handler).serve_forever()
+
+
+def wait_for(connect: Callable, timeout: float = 120.0):
+    """Retry ``connect`` until the server process is up."""
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return connect()
+        except (OSError, ConnectionError):
+            if time.time() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def time_calls(fn: Callable, audio: np.ndarray, iterations: int) -> Dict:
+    fn(audio)  # Warmup
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn(audio)
+        times.append(time.perf_counter() - start)
+    times_ms = np.array(times) * 1000
+    return {"p50_ms": float(np.percentile(times_ms, 50)), "p95_ms": float(np.percentile(times_ms, 95))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="In-process vs shared-memory IPC vs HTTP overhead")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to model")
+    parser.add_argument("--device", type=str, default="CPU",
+                        help="Device (each server process loads its own copy, so NPU runs them one at a time)")
+    parser.add_argument("--durations", type=str, default="1,5,10", help="Comma-separated audio durations (seconds)")
+    parser.add_argument("--iterations", type=int, default=30, help="Timed requests per configuration")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use a tiny synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"))
+    durations = [float(d) for d in args.durations.split(",")]
+
+    # The daemon runs as its own program, exactly as deployed
+    address = os.path.join(tempfile.mkdtemp(), "stt.sock")
+    daemon = subprocess.Popen([
+        sys.executable, os.path.join(os.path.dirname(__file__), "daemon.py"),
+        "--model", args.model, "--device", args.device, "--socket", address,
+    ])
+    http_server = mp.get_context("spawn").Process(
+        target=run_http_server, args=(args.model, args.device, HTTP_PORT), daemon=True
+    )
+    http_server.start()
+
+    transcriber = Transcriber(model_path=args.model, device=args.device)
+    client = wait_for(lambda: TranscriptionClient(address))
+    conn = http.client.HTTPConnection("127.0.0.1", HTTP_PORT)
+    wait_for(lambda: conn.connect())
+    conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def http_transcribe(audio):
+        body = audio.tobytes()
+        conn.request("POST", "/transcribe", body=body, headers={"Content-Length": str(len(body))})
+        return json.loads(conn.getresponse().read())["text"]
+
+    print("\n" + "=" * 78)
+    print(f"PER-REQUEST LATENCY ({args.device}, p50 / p95 ms; overhead vs in-process p50)")
+    print("=" * 78)
+    print(f"{'Audio':>6s} | {'in-process':>15s} | {'shm IPC':>15s} | {'+ovh':>6s} | {'HTTP':>15s} | {'+ovh':>6s}")
+    print("-" * 78)
+    try:
+        for duration in durations:
+            rng = np.random.default_rng(0)
+            audio = (0.1 * rng.standard_normal(int(duration * 16000))).astype(np.float32)
+            local = time_calls(transcriber.transcribe, audio, args.iterations)
+            ipc = time_calls(client.transcribe, audio, args.iterations)
+            over_http = time_calls(http_transcribe, audio, args.iterations)
+            row = f"{duration:>5.0f}s"
+            for r in (local, ipc, over_http):
+                row += f" | {r['p50_ms']:>6.2f} / {r['p95_ms']:>6.2f}"
+                if r is not local:
+                    row += f" | {r['p50_ms'] - local['p50_ms']:>6.2f}"
+            print(row)
+    finally:
+        client.close()
+        conn.close()
+        daemon.terminate()
+        http_server.terminate()
+
+
+if __name__ == "__main__":
+    main()
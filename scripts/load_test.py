@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Bursty load test: fixed model vs adaptive degradation.
+
+Replays the same arrival schedule (steady Poisson traffic with periodic
+bursts) against:
+1. The large model only
+2. AdaptiveTranscriber with large -> base fallback
+
+and reports end-to-end latency percentiles against the SLO, plus how many
+results were degraded.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+from typing import List
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.adaptive import AdaptiveTranscriber, latency_percentiles
+from stt_npu.core import Transcriber
+
+
+def arrival_schedule(duration_s: float, rate: float, burst_every_s: float, burst_size: int, seed: int = 0) -> List[float]:
+    """Poisson arrivals at ``rate``/s plus ``burst_size`` simultaneous requests every ``burst_every_s``."""
+    rng = np.random.default_rng(seed)
+    arrivals = []
+    t = rng.exponential(1 / rate)
+    while t < duration_s:
+        arrivals.append(t)
+        t += rng.exponential(1 / rate)
+    burst = burst_every_s
+    while burst < duration_s:
+        arrivals += [burst] * burst_size
+        burst += burst_every_s
+    return sorted(arrivals)
+
+
+def run_load(server: AdaptiveTranscriber, arrivals: List[float], audio: np.ndarray):
+    """Submit requests on schedule and collect results."""
+    futures = []
+    start = time.perf_counter()
+    for arrival in arrivals:
+        delay = arrival - (time.perf_counter() - start)
+        if delay > 0:
+            time.sleep(delay)
+        futures.append(server.submit(audio))
+    return [f.result() for f in futures]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bursty load test for adaptive degradation")
+    parser.add_argument("--large", type=str, default="models/wav2vec2-large-960h", help="Preferred model")
+    parser.add_argument("--base", type=str, default="models/wav2vec2-base-960h", help="Fallback model")
+    parser.add_argument("--device", type=str, default="NPU", help="Device for both models")
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="End-to-end latency budget")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test length (seconds)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Steady arrivals per second")
+    parser.add_argument("--burst-every", type=float, default=10.0, help="Seconds between bursts")
+    parser.add_argument("--burst-size", type=int, default=6, help="Requests per burst")
+    parser.add_argument("--audio-seconds", type=float, default=3.0, help="Audio length per request")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use two synthetic models of different sizes (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        root = tempfile.mkdtemp()
+        args.large = export_synthetic_model(os.path.join(root, "synthetic-large"), hidden_size=1536, num_layers=8)
+        args.base = export_synthetic_model(os.path.join(root, "synthetic-base"), hidden_size=256, num_layers=4)
+
+    large = Transcriber(model_path=args.large, device=args.device)
+    base = Transcriber(model_path=args.base, device=args.device)
+
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal(int(args.audio_seconds * 16000))).astype(np.float32)
+    arrivals = arrival_schedule(args.duration, args.rate, args.burst_every, args.burst_size)
+
+    print("=" * 60)
+    print("ADAPTIVE DEGRADATION LOAD TEST")
+    print("=" * 60)
+    print(f"Large:    {args.large}")
+    print(f"Base:     {args.base}")
+    print(f"Requests: {len(arrivals)} over {args.duration:.0f}s (bursts of {args.burst_size} every {args.burst_every:.0f}s)")
+    print(f"SLO:      {args.slo_ms:.0f} ms")
+
+    rows = []
+    for name, tiers in (("large only", [large]), ("adaptive", [large, base])):
+        with AdaptiveTranscriber(tiers, latency_slo_ms=args.slo_ms) as server:
+            results = run_load(server, arrivals, audio)
+            stats = server.stats
+        pct = latency_percentiles(results)
+        within = np.mean([r.latency_ms <= args.slo_ms for r in results]) * 100
+        rows.append((name, pct, within, stats["degraded"], stats["switches"]))
+        print(f"\n[{name}] service time per tier: "
+              + ", ".join(f"{ms:.0f} ms" for ms in stats["service_time_ms"]))
+
+    print("\n" + "-" * 78)
+    print(f"{'Mode':>12s} | {'p50 ms':>8s} | {'p95 ms':>8s} | {'p99 ms':>8s} | {'in SLO':>7s} | {'degraded':>8s} | {'switches':>8s}")
+    print("-" * 78)
+    for name, pct, within, degraded, switches in rows:
+        print(f"{name:>12s} | {pct['p50_ms']:>8.1f} | {pct['p95_ms']:>8.1f} | {pct['p99_ms']:>8.1f} | "
+              f"{within:>6.1f}% | {degraded:>8d} | {switches:>8d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Per-stage micro-benchmarks for the Transcriber pipeline.
+
+Times each stage of Transcriber.transcribe in isolation:
+1. pad        - static-shape padding/truncation
+2. preprocess - feature extractor (normalization)
+3. infer      - OpenVINO CTC model
+4. decode     - greedy argmax + tokenizer collapse
+
+Runs offline against a tiny synthetic Wav2Vec2-shaped model by default,
+so no Hub download or NPU is required.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+from typing import Callable, Dict, List
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.synthetic import export_synthetic_model
+
+
+def time_stage(fn: Callable, iterations: int) -> Dict:
+    """Time a zero-argument callable, after one warmup call."""
+    fn()
+    times = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+
+    times_ms = np.array(times) * 1000
+    return {
+        "mean_ms": float(np.mean(times_ms)),
+        "p50_ms": float(np.percentile(times_ms, 50)),
+        "p95_ms": float(np.percentile(times_ms, 95)),
+    }
+
+
+def benchmark_stages(transcriber: Transcriber, duration: float, iterations: int) -> Dict[str, Dict]:
+    """Benchmark each transcribe stage for one audio duration."""
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal(int(duration * Transcriber.SAMPLE_RATE))).astype(np.float32)
+
+    padded, _ = transcriber._pad(audio)
+    input_values = transcriber._preprocess(padded)
+    logits = transcriber._infer(input_values)
+
+    return {
+        "pad": time_stage(lambda: transcriber._pad(audio), iterations),
+        "preprocess": time_stage(lambda: transcriber._preprocess(padded), iterations),
+        "infer": time_stage(lambda: transcriber._infer(input_values), iterations),
+        "decode": time_stage(lambda: transcriber._decode(logits), iterations),
+        "total": time_stage(lambda: transcriber.transcribe(audio), iterations),
+    }
+
+
+def print_results(results: Dict[float, Dict[str, Dict]]):
+    """Print a per-stage table for every duration."""
+    stages = ["pad", "preprocess", "infer", "decode", "total"]
+
+    print("\n" + "=" * 80)
+    print("MICRO-BENCHMARK RESULTS (mean / p95 ms)")
+    print("=" * 80)
+    header = f"{'Duration':>10s}" + "".join(f" | {stage:>14s}" for stage in stages)
+    print(header)
+    print("-" * len(header))
+    for duration, stage_results in results.items():
+        row = f"{duration:>9.1f}s"
+        for stage in stages:
+            r = stage_results[stage]
+            row += f" | {r['mean_ms']:>6.2f} / {r['p95_ms']:>5.2f}"
+        print(row)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage Transcriber micro-benchmarks")
+    parser.add_argument("--model", type=str, default=None,
+                        help="Path to model (default: export a synthetic model to a temp dir)")
+    parser.add_argument("--device", type=str, default="CPU",
+                        help="Device to test: NPU, CPU or GPU")
+    parser.add_argument("--iterations", type=int, default=20,
+                        help="Number of iterations per stage")
+    parser.add_argument("--durations", type=str, default="2,5,10,30",
+                        help="Comma-separated audio durations to test (seconds)")
+    args = parser.parse_args()
+
+    durations: List[float] = [float(d) for d in args.durations.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        model_path = args.model
+        if model_path is None:
+            print("No --model given, exporting synthetic model...")
+            model_path = export_synthetic_model(tmp_dir)
+
+        transcriber = Transcriber(model_path=model_path, device=args.device)
+
+        results = {}
+        for duration in durations:
+            print(f"Benchmarking {duration}s audio...")
+            results[duration] = benchmark_stages(transcriber, duration, args.iterations)
+
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Multichannel transcription: one VAD per channel, batched inference.
+
+Modes:
+1. Live capture from a multichannel device (--channels N)
+2. A multichannel WAV file (--file)
+3. Throughput benchmark (--benchmark): one batched Transcriber vs one
+   Transcriber per channel
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import queue
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.multichannel import MultichannelTranscriber
+from stt_npu.utils import BLOCK_SIZE, SAMPLE_RATE
+
+
+def print_transcripts(transcripts):
+    for t in transcripts:
+        print(f"[ch{t.channel} {t.start_time:7.2f}s - {t.end_time:7.2f}s] {t.text}")
+
+
+def run_file(pipeline: MultichannelTranscriber, path: str):
+    """Transcribe a multichannel WAV file block by block."""
+    import librosa
+    audio, _ = librosa.load(path, sr=SAMPLE_RATE, mono=False)
+    audio = np.atleast_2d(audio).T.astype(np.float32)  # [frames, channels]
+    if audio.shape[1] != pipeline.num_channels:
+        raise ValueError(f"{path} has {audio.shape[1]} channels, expected {pipeline.num_channels}")
+
+    for start in range(0, len(audio) - BLOCK_SIZE + 1, BLOCK_SIZE):
+        print_transcripts(pipeline.process_block(audio[start:start + BLOCK_SIZE]))
+    print_transcripts(pipeline.flush())
+
+
+def run_live(pipeline: MultichannelTranscriber):
+    """Transcribe live multichannel input until Ctrl+C."""
+    import sounddevice as sd
+    audio_queue = queue.Queue()
+
+    def audio_callback(indata, frames, time_info, status):
+        if status:
+            print(status, file=sys.stderr)
+        audio_queue.put(indata.copy())
+
+    print("\nListening... (Press Ctrl+C to stop)")
+    try:
+        with sd.InputStream(samplerate=SAMPLE_RATE, channels=pipeline.num_channels,
+                            callback=audio_callback, blocksize=BLOCK_SIZE):
+            while True:
+                try:
+                    block = audio_queue.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+                print_transcripts(pipeline.process_block(block))
+    except KeyboardInterrupt:
+        print("\nStopping...")
+        print_transcripts(pipeline.flush())
+
+
+def run_benchmark(model_path: str, device: str, channels: int, duration: float, iterations: int):
+    """Audio seconds transcribed per wall second, per channel: batched vs separate engines."""
+    rng = np.random.default_rng(0)
+    chunks = [(0.1 * rng.standard_normal(int(duration * SAMPLE_RATE))).astype(np.float32) for _ in range(channels)]
+
+    batched = Transcriber(model_path=model_path, device=device, batch_size=channels)
+    separate = [Transcriber(model_path=model_path, device=device) for _ in range(channels)]
+
+    def run_batched():
+        batched.transcribe_batch(chunks)
+
+    def run_separate():
+        for transcriber, chunk in zip(separate, chunks):
+            transcriber.transcribe(chunk)
+
+    results = {}
+    for name, fn in (("separate", run_separate), ("batched", run_batched)):
+        fn()  # Warmup
+        start = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        elapsed = (time.perf_counter() - start) / iterations
+        results[name] = elapsed
+
+    print("\n" + "=" * 60)
+    print(f"MULTICHANNEL THROUGHPUT ({channels} x {duration:.0f}s on {device})")
+    print("=" * 60)
+    for name, elapsed in results.items():
+        per_channel = duration / elapsed
+        print(f"  {name:>8s}: {elapsed * 1000:8.1f} ms/round | {per_channel:6.1f}x real-time per channel")
+    print(f"  Speedup: {results['separate'] / results['batched']:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multichannel STT with per-channel VAD")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to OpenVINO IR model")
+    parser.add_argument("--device", type=str, default="NPU", help="Device to use for transcription (NPU, CPU)")
+    parser.add_argument("--channels", type=int, default=2, help="Number of input channels")
+    parser.add_argument("--file", type=str, default=None, help="Multichannel WAV file instead of live capture")
+    parser.add_argument("--batch-window-ms", type=int, default=0,
+                        help="How long a finished utterance waits for other channels to share its batch")
+    parser.add_argument("--trim-silence", action="store_true", help="Trim non-speech edges before transcription")
+    parser.add_argument("--benchmark", action="store_true", help="Compare batched vs per-channel throughput")
+    parser.add_argument("--duration", type=float, default=5.0, help="Utterance length for --benchmark (seconds)")
+    parser.add_argument("--iterations", type=int, default=5, help="Timed rounds for --benchmark")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use a tiny synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"))
+
+    if args.benchmark:
+        run_benchmark(args.model, args.device, args.channels, args.duration, args.iterations)
+        return
+
+    print(f"Initializing Transcriber on {args.device} (batch size {args.channels})...")
+    transcriber = Transcriber(model_path=args.model, device=args.device,
+                              trim_silence=args.trim_silence, batch_size=args.channels)
+    print(f"Initializing {args.channels} VADs...")
+    pipeline = MultichannelTranscriber(transcriber, args.channels, batch_window_ms=args.batch_window_ms)
+
+    if args.file:
+        run_file(pipeline, args.file)
+    else:
+        run_live(pipeline)
+
+    print(f"\n[Stats] {pipeline.segments_transcribed} utterances in {pipeline.inference_calls} inference calls")
+
+
+if __name__ == "__main__":
+    main()
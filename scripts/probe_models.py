@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+"""
+Probe exported model variants and record what each device can run.
+
+For every variant under --models-root (or each --model) and every device,
+loads the model in an isolated child process and times inference at each
+duration. Latency percentiles, RTF and memory growth are stored in
+``stt_npu_variant.json`` next to the IR. Variants that fail to compile, run
+out of memory, crash the process or hang are recorded with that status.
+Transcriber.from_budget selects from these measurements.
+
+Prints the resulting capability map as a markdown table.
+"""
+
+import os
+import sys
+import argparse
+import tempfile
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.registry import discover_variants, load_metadata, probe_variant, save_metadata
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure model variants per device and store the results next to each IR")
+    parser.add_argument("--models-root", type=str, default="models", help="Directory of exported variants")
+    parser.add_argument("--model", type=str, action="append", default=None,
+                        help="Probe only this model directory (repeatable)")
+    parser.add_argument("--devices", type=str, default="CPU,NPU", help="Comma-separated devices")
+    parser.add_argument("--durations", type=str, default="5,10,30", help="Comma-separated audio durations (seconds)")
+    parser.add_argument("--iterations", type=int, default=10, help="Timed inferences per duration")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds before a probe is declared hung")
+    parser.add_argument("--wer", type=str, action="append", default=[],
+                        help="Record a known WER as NAME=VALUE (ranks variants by accuracy instead of size)")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Probe two synthetic variants of different sizes (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.models_root = tempfile.mkdtemp()
+        export_synthetic_model(os.path.join(args.models_root, "synthetic-small"))
+        export_synthetic_model(os.path.join(args.models_root, "synthetic-large"), hidden_size=1024, num_layers=8)
+    model_dirs = args.model or discover_variants(args.models_root)
+    if not model_dirs:
+        parser.error(f"No exported models (openvino_model.xml) found under {args.models_root}")
+    devices = [d.strip().upper() for d in args.devices.split(",")]
+    durations = [float(d) for d in args.durations.split(",")]
+
+    known_wer = dict(item.split("=", 1) for item in args.wer)
+    for model_dir in model_dirs:
+        metadata = load_metadata(model_dir)
+        if metadata["name"] in known_wer:
+            metadata["wer"] = float(known_wer[metadata["name"]])
+            save_metadata(model_dir, metadata)
+
+    print("=" * 60)
+    print("MODEL VARIANT PROBE")
+    print("=" * 60)
+    for model_dir in model_dirs:
+        for device in devices:
+            print(f"\nProbing {model_dir} on {device}...")
+            results = probe_variant(model_dir, device, durations, args.iterations, timeout=args.timeout)
+            for duration, r in results.items():
+                detail = f"p95 {r['p95_ms']:.1f} ms" if r["status"] == "ok" else r.get("error", "").strip().split("\n")[0]
+                print(f"  {duration:>4s}s: {r['status']} {detail}")
+
+    print("\n## Capability Map\n")
+    print("| Variant | Parameters | Precision | Device | Audio | p50 ms | p95 ms | RTF | Memory MB | Status |")
+    print("| :--- | ---: | :--- | :--- | ---: | ---: | ---: | ---: | ---: | :--- |")
+    for model_dir in model_dirs:
+        metadata = load_metadata(model_dir)
+        for device in devices:
+            for duration, r in metadata["measurements"].get(device, {}).items():
+                if r["status"] == "ok":
+                    memory = f"{r['memory_mb']:.0f}" if r.get("memory_mb") is not None else "-"
+                    numbers = f"{r['p50_ms']:.1f} | {r['p95_ms']:.1f} | {r['rtf']:.3f} | {memory}"
+                else:
+                    numbers = "- | - | - | -"
+                print(f"| {metadata['name']} | {metadata['parameters'] / 1e6:.1f}M | {metadata['precision']} | "
+                      f"{device} | {duration}s | {numbers} | {r['status']} |")
+
+
+if __name__ == "__main__":
+    main()
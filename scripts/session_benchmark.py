@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+Memory per live session: one VAD per stream vs SessionManager.
+
+Opens many concurrent sessions and drives every one of them with audio,
+round-robin, like a server hosting many mostly idle streams:
+1. Per-stream path: a ChannelSegmenter with its own VoiceActivityDetector
+   per session (lists of blocks, one Silero JIT model each)
+2. SessionManager: one shared Silero model with per-session state swapped
+   in and out, one engine, int16 slots in preallocated arrays
+
+Reports RSS growth per session after opening and after each round of
+audio (flat = no per-session growth), and SessionManager.memory_report().
+Idle audio is low-level noise; pass --audio to give some sessions speech.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.multichannel import ChannelSegmenter
+from stt_npu.sessions import SessionManager
+from stt_npu.utils import BLOCK_SIZE, SAMPLE_RATE
+from stt_npu.vad import VoiceActivityDetector
+
+
+def rss_mb() -> float:
+    """Current resident set size (Linux), else peak RSS."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def make_streams(num_sessions: int, seconds: float, speech: np.ndarray = None, speech_every: int = 0):
+    """Per-session int16 audio: quiet noise, with the speech clip mixed into every Nth session."""
+    rng = np.random.default_rng(0)
+    samples = int(seconds * SAMPLE_RATE) // BLOCK_SIZE * BLOCK_SIZE
+    idle = (rng.standard_normal(samples) * 30).astype(np.int16)
+    streams = []
+    for i in range(num_sessions):
+        if speech is not None and speech_every and i % speech_every == 0:
+            stream = idle.copy()
+            n = min(len(speech), samples)
+            stream[:n] = speech[:n]
+            streams.append(stream)
+        else:
+            streams.append(idle)
+    return streams
+
+
+def drive(process, handles, streams, rounds: int, label: str, start_mb: float, num_sessions: int):
+    """Feed every session one round of blocks at a time, printing RSS per session after each round."""
+    blocks_per_round = len(streams[0]) // BLOCK_SIZE // rounds
+    transcripts = 0
+    for r in range(rounds):
+        t0 = time.perf_counter()
+        for b in range(r * blocks_per_round, (r + 1) * blocks_per_round):
+            for handle, stream in zip(handles, streams):
+                if process(handle, stream[b * BLOCK_SIZE:(b + 1) * BLOCK_SIZE]) is not None:
+                    transcripts += 1
+        elapsed = time.perf_counter() - t0
+        audio_s = blocks_per_round * BLOCK_SIZE / SAMPLE_RATE
+        print(f"{label:>14s} | after {(r + 1) * audio_s:>5.1f}s audio | "
+              f"{(rss_mb() - start_mb) / num_sessions * 1024:>8.1f} KB/session | "
+              f"{elapsed / (blocks_per_round * num_sessions) * 1e6:>6.0f} us/block | {transcripts} transcripts")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-session memory: VAD per stream vs shared SessionManager")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-base-960h", help="Path to model")
+    parser.add_argument("--device", type=str, default="CPU", help="Device to use")
+    parser.add_argument("--sessions", type=int, default=300, help="Concurrent sessions on SessionManager")
+    parser.add_argument("--baseline-sessions", type=int, default=30, help="Sessions on the per-stream VAD path")
+    parser.add_argument("--seconds", type=float, default=6.0, help="Audio fed to every session")
+    parser.add_argument("--rounds", type=int, default=3, help="RSS samples while feeding")
+    parser.add_argument("--audio", type=str, default=None, help="Speech WAV mixed into every --speech-every-th session")
+    parser.add_argument("--speech-every", type=int, default=10, help="Which sessions get --audio")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use a tiny synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"))
+    speech = None
+    if args.audio:
+        import librosa
+        clip, _ = librosa.load(args.audio, sr=SAMPLE_RATE)
+        speech = (np.clip(clip, -1, 32767 / 32768) * 32768).astype(np.int16)
+
+    transcriber = Transcriber(model_path=args.model, device=args.device)
+    shared_vad = VoiceActivityDetector()
+
+    print("=" * 60)
+    print("PER-SESSION MEMORY")
+    print("=" * 60)
+
+    # 1. One VAD and one list-of-blocks segmenter per stream
+    streams = make_streams(args.baseline_sessions, args.seconds, speech, args.speech_every)
+    start_mb = rss_mb()
+    segmenters = [ChannelSegmenter(i, VoiceActivityDetector()) for i in range(args.baseline_sessions)]
+    open_mb = rss_mb()
+
+    def process_segmenter(segmenter, block):
+        segment = segmenter.process(block.astype(np.float32) / 32768, 0.0)
+        if segment is not None:
+            transcriber.transcribe(segment.audio, speech_probs=segment.speech_probs)
+        return segment
+
+    print(f"\n{'per-stream VAD':>14s} | opened {args.baseline_sessions} sessions | "
+          f"{(open_mb - start_mb) / args.baseline_sessions * 1024:>8.1f} KB/session")
+    drive(process_segmenter, segmenters, streams, args.rounds, "per-stream VAD", start_mb, args.baseline_sessions)
+    del segmenters
+
+    # 2. SessionManager: shared VAD + engine, compact per-session state
+    streams = make_streams(args.sessions, args.seconds, speech, args.speech_every)
+    start_mb = rss_mb()
+    manager = SessionManager(transcriber, vad=shared_vad, max_sessions=args.sessions)
+    sessions = [manager.open() for _ in range(args.sessions)]
+    open_mb = rss_mb()
+    print(f"\n{'SessionManager':>14s} | opened {args.sessions} sessions | "
+          f"{(open_mb - start_mb) / args.sessions * 1024:>8.1f} KB/session")
+    drive(manager.process, sessions, streams, args.rounds, "SessionManager", start_mb, args.sessions)
+
+    report = manager.memory_report()
+    print(f"\nmemory_report(): state {report['state_bytes']:.0f} B/session | "
+          f"slot reserved {report['slot_bytes_reserved'] / 1024:.0f} KB (virtual) | "
+          f"slot resident ~{report['slot_bytes_resident'] / 1024:.1f} KB/session | "
+          f"shared buffers {report['shared_bytes'] / 1024:.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Cost of writing transcripts from the processing loop.
+
+Emits transcripts at a fixed rate to a stdout-style sink whose reader is
+slow (a child process that sleeps per line, behind a real OS pipe), plus
+a JSONL file. Compares:
+1. Synchronous writes, like ``print`` in scripts/test_npu.py: the loop
+   blocks whenever the pipe is full
+2. TranscriptOutput: the loop only enqueues; a background writer per sink
+   batches writes and flushes
+
+Reports how long each emit stalls the loop (p50 / p99 / max), total stall,
+and the sink backlog metric.
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.sinks import JSONLSink, StdoutSink, TranscriptEvent, TranscriptOutput
+
+SLOW_READER = "import sys, time\nfor line in sys.stdin:\n    time.sleep({delay})\n"
+
+
+def run(mode: str, args, text: str):
+    reader = subprocess.Popen([sys.executable, "-c", SLOW_READER.format(delay=args.reader_delay_ms / 1000)],
+                              stdin=subprocess.PIPE, text=True)
+    jsonl_path = os.path.join(tempfile.mkdtemp(), "transcripts.jsonl")
+    sinks = [StdoutSink(reader.stdin), JSONLSink(jsonl_path)]
+    output = TranscriptOutput(sinks, max_queue=args.max_queue) if mode == "background" else None
+
+    stalls = []
+    peak_backlog = 0
+    for i in range(args.transcripts):
+        event = TranscriptEvent(text, i * 2.0, i * 2.0 + 1.5, inference_ms=40.0, wall_time=time.time())
+        start = time.perf_counter()
+        if output is not None:
+            output.emit(event)
+        else:
+            for sink in sinks:
+                sink.write([event])
+                sink.flush()
+        stalls.append(time.perf_counter() - start)
+        if output is not None:
+            peak_backlog = max(peak_backlog, output.backlog)
+        time.sleep(args.interval_ms / 1000)
+
+    stats = None
+    start = time.perf_counter()
+    if output is not None:
+        stats = output.stats()
+        output.close()
+    else:
+        for sink in sinks:
+            sink.close()
+    drain_s = time.perf_counter() - start
+    reader.stdin.close()
+    reader.wait()
+    return np.array(stalls) * 1000, peak_backlog, stats, drain_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Loop stall from transcript output: synchronous vs background sinks")
+    parser.add_argument("--transcripts", type=int, default=300, help="Transcripts to emit")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Time between transcripts")
+    parser.add_argument("--reader-delay-ms", type=float, default=20.0, help="Slow reader's time per line")
+    parser.add_argument("--text-chars", type=int, default=2000, help="Characters per transcript")
+    parser.add_argument("--max-queue", type=int, default=1000, help="Sink queue bound")
+    args = parser.parse_args()
+    text = ("HELLO WORLD " * (args.text_chars // 12 + 1))[:args.text_chars]
+
+    print("=" * 60)
+    print("TRANSCRIPT OUTPUT BENCHMARK")
+    print("=" * 60)
+    print(f"{args.transcripts} transcripts of {args.text_chars} chars every {args.interval_ms:.0f}ms; "
+          f"reader sleeps {args.reader_delay_ms:.0f}ms per line")
+    print(f"\n{'Mode':>12s} | {'emit p50 ms':>11s} | {'p99 ms':>8s} | {'max ms':>8s} | {'total stall s':>13s} | "
+          f"{'peak backlog':>12s} | {'drain s':>7s}")
+    print("-" * 92)
+    for mode in ("synchronous", "background"):
+        stalls, peak_backlog, stats, drain_s = run(mode, args, text)
+        print(f"{mode:>12s} | {np.percentile(stalls, 50):>11.3f} | {np.percentile(stalls, 99):>8.2f} | "
+              f"{stalls.max():>8.2f} | {stalls.sum() / 1000:>13.2f} | {peak_backlog:>12d} | {drain_s:>7.2f}")
+        if stats:
+            for name, s in stats.items():
+                print(f"{'':>12s}   {name}: {s['batches']} batches, {s['flushes']} flushes, "
+                      f"max backlog {s['max_backlog']}, dropped {s['dropped']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Process launch to first transcript: Transcriber vs warm-start snapshot.
+
+Each run is a fresh Python process that imports the engine, loads the
+model and transcribes 1s of audio; the parent measures wall time from
+launch until the transcript is printed. Paths compared:
+1. Transcriber: optimum/transformers imports, AutoProcessor, IR read, compile
+2. Transcriber with an OpenVINO CACHE_DIR (warmed by one unmeasured run)
+3. SnapshotTranscriber: numpy + openvino imports, Core.import_model of the
+   blob written by scripts/export_snapshot.py
+
+Reports the median of ``--runs`` launches, split into import, load and
+first transcript as timed inside the child.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+
+CHILD = """
+import sys, time, json
+start = time.perf_counter()
+sys.path.insert(0, {src!r})
+import numpy as np
+{imports}
+imported = time.perf_counter()
+{load}
+loaded = time.perf_counter()
+text = engine.transcribe((0.1 * np.random.default_rng(0).standard_normal(16000)).astype(np.float32))
+done = time.perf_counter()
+print(json.dumps({{"import_s": imported - start, "load_s": loaded - imported, "first_s": done - loaded,
+                  "text": text}}), flush=True)
+"""
+
+MODES = {
+    "transcriber": ("from stt_npu.core import Transcriber",
+                    "engine = Transcriber(model_path={model!r}, device={device!r})"),
+    "transcriber+cache": ("from stt_npu.core import Transcriber",
+                          "engine = Transcriber(model_path={model!r}, device={device!r}, "
+                          "ov_config={{'CACHE_DIR': {cache_dir!r}}})"),
+    "snapshot": ("from stt_npu.snapshot import load_snapshot",
+                 "engine = load_snapshot({snapshot!r})"),
+}
+
+
+def launch(mode: str, settings: dict):
+    """Run one child process; returns (wall seconds to first transcript, child timings)."""
+    imports, load = MODES[mode]
+    code = CHILD.format(src=SRC_DIR, imports=imports, load=load.format(**settings))
+    start = time.perf_counter()
+    child = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    if child.returncode != 0:
+        raise RuntimeError(f"{mode} failed:\n{child.stderr[-2000:]}")
+    return wall, json.loads(child.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time: Transcriber vs warm-start snapshot")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to OpenVINO IR model")
+    parser.add_argument("--device", type=str, default="NPU", help="Device (NPU, CPU)")
+    parser.add_argument("--runs", type=int, default=5, help="Launches per path")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Benchmark a tiny synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    from stt_npu.snapshot import export_snapshot
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"))
+    device = args.device.upper()
+    # Same shape as Transcriber compiles: 30s static on NPU, dynamic elsewhere
+    snapshot = export_snapshot(args.model, os.path.join(tempfile.mkdtemp(), "model.sttsnap"), device=device)
+    settings = {"model": os.path.abspath(args.model), "device": device, "snapshot": snapshot,
+                "cache_dir": tempfile.mkdtemp()}
+
+    print("=" * 60)
+    print("STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"Model:    {args.model} on {device}")
+    print(f"Snapshot: {snapshot} ({os.path.getsize(snapshot) / 1e6:.1f} MB)")
+
+    launch("transcriber+cache", settings)  # Populate the compile cache
+    texts = {}
+    print(f"\n{'Path':>18s} | {'launch->text s':>14s} | {'import s':>8s} | {'load s':>6s} | {'first s':>7s}")
+    print("-" * 66)
+    for mode in MODES:
+        walls, timings = [], []
+        for _ in range(args.runs):
+            wall, child = launch(mode, settings)
+            walls.append(wall)
+            timings.append(child)
+        texts[mode] = timings[0]["text"]
+        median = {key: float(np.median([t[key] for t in timings])) for key in ("import_s", "load_s", "first_s")}
+        print(f"{mode:>18s} | {np.median(walls):>14.2f} | {median['import_s']:>8.2f} | {median['load_s']:>6.2f} | "
+              f"{median['first_s']:>7.2f}")
+
+    same = len(set(texts.values())) == 1
+    print(f"\nSame first transcript on every path: {'yes' if same else 'NO'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+"""
+Chunked streaming vs whole-utterance decoding on the same audio.
+
+For each (chunk, left context, right context) setting, reports:
+- WER / CER of the streamed transcript against whole-utterance greedy
+  decoding (and against --reference when given)
+- Encoder time per chunk (mean / p95), which stays flat with utterance length
+- First-text latency: audio needed before the first commit plus its compute,
+  vs waiting for the whole utterance and decoding it
+- End-of-speech latency: the final flush vs a full re-encode
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.decoding import greedy_decode, load_vocab
+from stt_npu.streaming import StreamingTranscriber, window_length
+from stt_npu.utils import BLOCK_SIZE, SAMPLE_RATE, error_rate
+
+
+def stream(streamer: StreamingTranscriber, audio: np.ndarray):
+    """Feed audio block by block; returns (text, per-chunk seconds, first commit latency, flush seconds)."""
+    streamer.reset()
+    chunk_times = []
+    first_commit = None
+    for start in range(0, len(audio), BLOCK_SIZE):
+        before = streamer.chunks_encoded
+        t0 = time.perf_counter()
+        streamer.feed(audio[start:start + BLOCK_SIZE])
+        elapsed = time.perf_counter() - t0
+        if streamer.chunks_encoded > before:
+            chunk_times.append(elapsed / (streamer.chunks_encoded - before))
+            if first_commit is None:
+                # Audio up to the end of this block, plus the compute
+                first_commit = min(start + BLOCK_SIZE, len(audio)) / SAMPLE_RATE + elapsed
+    t0 = time.perf_counter()
+    streamer.flush()
+    flush_s = time.perf_counter() - t0
+    if first_commit is None:
+        first_commit = len(audio) / SAMPLE_RATE + flush_s
+    return streamer.text, chunk_times, first_commit, flush_s
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming vs whole-utterance accuracy and latency")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h", help="Path to model")
+    parser.add_argument("--device", type=str, default="CPU", help="Device to use")
+    parser.add_argument("--audio", type=str, default=None, help="WAV file (default: synthetic noise)")
+    parser.add_argument("--reference", type=str, default=None, help="Reference transcript of --audio")
+    parser.add_argument("--duration", type=float, default=20.0, help="Synthetic audio length (seconds)")
+    parser.add_argument("--configs", type=str, default="1.0:0.5:0.25,2.0:1.0:0.5,4.0:1.0:0.5",
+                        help="Comma-separated chunk:left:right settings (seconds)")
+    parser.add_argument("--synthetic", action="store_true",
+                        help="Use a tiny synthetic model instead of --model (offline, no NPU needed)")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        from stt_npu.synthetic import export_synthetic_model
+        args.model = export_synthetic_model(os.path.join(tempfile.mkdtemp(), "synthetic-wav2vec2"),
+                                            hidden_size=768, num_layers=6)
+
+    if args.audio:
+        import librosa
+        audio, _ = librosa.load(args.audio, sr=SAMPLE_RATE)
+        audio = audio.astype(np.float32)
+    else:
+        rng = np.random.default_rng(0)
+        audio = (0.1 * rng.standard_normal(int(args.duration * SAMPLE_RATE))).astype(np.float32)
+    duration = len(audio) / SAMPLE_RATE
+    vocab = load_vocab(args.model)
+
+    transcriber = Transcriber(model_path=args.model, device=args.device)
+    transcriber.get_logits(audio)  # Warmup
+    t0 = time.perf_counter()
+    whole_text = greedy_decode(transcriber.get_logits(audio)[0].numpy(), vocab)
+    whole_s = time.perf_counter() - t0
+
+    print("=" * 60)
+    print("STREAMING VS WHOLE-UTTERANCE")
+    print("=" * 60)
+    print(f"Model: {args.model} ({args.device})")
+    print(f"Audio: {duration:.1f}s | whole-utterance encode + decode: {whole_s * 1000:.1f} ms")
+
+    header = (f"{'chunk:left:right':>16s} | {'WER':>6s} | {'CER':>6s} | {'chunk ms':>15s} | "
+              f"{'first text s':>12s} | {'final ms':>8s}")
+    if args.reference:
+        header += f" | {'ref WER':>7s}"
+    print("\n" + header)
+    print("-" * len(header))
+    if args.reference:
+        print(f"{'whole':>16s} | {0:>6.3f} | {0:>6.3f} | {'-':>15s} | {duration + whole_s:>12.2f} | "
+              f"{whole_s * 1000:>8.1f} | {error_rate(args.reference.upper(), whole_text):>7.3f}")
+
+    for config in args.configs.split(","):
+        chunk_s, left_s, right_s = (float(v) for v in config.split(":"))
+        if args.device.upper() == "NPU":
+            # Compile the window shape so each chunk does constant work
+            engine = Transcriber(model_path=args.model, device=args.device,
+                                 static_input_length=window_length(chunk_s, left_s, right_s))
+        else:
+            engine = transcriber
+        streamer = StreamingTranscriber(engine, chunk_s, left_s, right_s, vocab=vocab)
+        stream(streamer, audio[:SAMPLE_RATE * 3])  # Warmup
+        text, chunk_times, first_commit, flush_s = stream(streamer, audio)
+        chunk_ms = np.array(chunk_times) * 1000 if chunk_times else np.zeros(1)
+
+        row = (f"{config:>16s} | {error_rate(whole_text, text):>6.3f} | {error_rate(whole_text, text, 'char'):>6.3f} | "
+               f"{chunk_ms.mean():>6.1f} / {np.percentile(chunk_ms, 95):>6.1f} | {first_commit:>12.2f} | {flush_s * 1000:>8.1f}")
+        if args.reference:
+            row += f" | {error_rate(args.reference.upper(), text):>7.3f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
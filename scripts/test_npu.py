@@ -1,101 +1,295 @@
-
 import os
 import sys
 import argparse
 import time
 import numpy as np
 import sounddevice as sd
-import queue
 
 # Add src to path to allow imports if running from root
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+from stt_npu.capture import CaptureRing
 from stt_npu.core import Transcriber
+from stt_npu.decoding import CTCBeamSearchDecoder
+from stt_npu.hotswap import HotSwapTranscriber
+from stt_npu.idle import IdleMonitor
+from stt_npu.kws import KeywordSpotter
+from stt_npu.registry import parse_budget, select_variant
+from stt_npu.sinks import JSONLSink, SocketSink, StdoutSink, SubtitleSink, TranscriptEvent, TranscriptOutput
+from stt_npu.snapshot import load_snapshot
+from stt_npu.streaming import StreamingTranscriber, window_length
+from stt_npu.utils import BLOCK_SIZE, SAMPLE_RATE  # 16kHz, 32ms blocks
 from stt_npu.vad import VoiceActivityDetector
 
 # Audio constants
-SAMPLE_RATE = 16000
-BLOCK_SIZE = 512 # 32ms chunks
 SILENCE_DURATION_MS = 500 # Trigger transcription after 500ms silence
+MAX_SPEECH_SAMPLES = SAMPLE_RATE * 30 # Force transcription at the model window
+RING_SECONDS = 60 # Capture history; must exceed the longest utterance
+MODEL_CHECK_S = 2.0 # How often --watch-model looks at the IR file
+KWS_WINDOW = 2 * SAMPLE_RATE # Keyword spotting window; the spotter's static input length on NPU
 
 def main():
     parser = argparse.ArgumentParser(description="NPU STT Test Module")
     parser.add_argument("--device", type=str, default="NPU", help="Device to use for transcription (NPU, CPU)")
     parser.add_argument("--model", type=str, default="models/whisper-tiny-fp16", help="Path to OpenVINO IR model")
+    parser.add_argument("--budget", type=str, default=None,
+                        help='Pick the model from probed variants, e.g. "p95 < 300 ms for 10 s audio on NPU" '
+                             '(overrides --model and --device; see scripts/probe_models.py)')
+    parser.add_argument("--snapshot", type=str, default=None,
+                        help="Load a warm-start snapshot file instead of compiling --model (see scripts/export_snapshot.py; "
+                             "for --streaming, export it with the window length)")
+    parser.add_argument("--models-root", type=str, default="models", help="Variants searched by --budget")
     parser.add_argument("--benchmark", action="store_true", help="Run comparison with CPU")
+    parser.add_argument("--trim-silence", action="store_true", help="Trim non-speech edges before transcription")
+    parser.add_argument("--beam-width", type=int, default=0, help="CTC prefix beam search width (0 = greedy)")
+    parser.add_argument("--lm", type=str, default=None, help="Path to an ARPA word n-gram LM for beam search")
+    parser.add_argument("--hotwords", type=str, default=None, help="Comma-separated words to boost in beam search")
+    parser.add_argument("--hotword-boost", type=float, default=5.0, help="Log-score boost per hotword")
+    parser.add_argument("--keywords", type=str, default=None, help="Comma-separated command phrases to spot during speech")
+    parser.add_argument("--kws-threshold", type=float, default=0.5, help="Keyword confidence threshold")
+    parser.add_argument("--capture-dtype", type=str, default="int16", choices=["int16", "float32"],
+                        help="Microphone sample format (int16 halves capture bandwidth and memory)")
+    parser.add_argument("--streaming", action="store_true",
+                        help="Commit text every --chunk-s while speaking instead of at end of speech")
+    parser.add_argument("--chunk-s", type=float, default=2.0, help="Streaming chunk length (seconds)")
+    parser.add_argument("--watch-model", action="store_true",
+                        help="Hot-swap the model in the background when its IR file changes (no restart, no lost audio)")
+    parser.add_argument("--kws-only", action="store_true", help="Only spot --keywords, skip full transcription")
+    parser.add_argument("--idle-after-s", type=float, default=30.0,
+                        help="Park the VAD and engine after this much silence, waking on energy (0 = never)")
+    parser.add_argument("--jsonl", type=str, default=None, help="Also append transcripts to this JSONL file")
+    parser.add_argument("--srt", type=str, default=None, help="Also write transcripts as SRT subtitles")
+    parser.add_argument("--vtt", type=str, default=None, help="Also write transcripts as WebVTT subtitles")
+    parser.add_argument("--subtitle-cues", type=int, default=None,
+                        help="Keep only the last N subtitle cues (rolling file for overlays)")
+    parser.add_argument("--socket-out", type=str, default=None,
+                        help="Stream transcripts as JSON lines to processes connected to this Unix socket")
     args = parser.parse_args()
+    if args.kws_only and not args.keywords:
+        parser.error("--kws-only requires --keywords")
 
-    print(f"Initializing Transcriber on {args.device}...")
+    print(f"Initializing Transcriber on {args.budget or args.device}...")
     try:
-        transcriber = Transcriber(model_path=args.model, device=args.device)
+        if args.budget:
+            budget = parse_budget(args.budget)
+            args.model, measurement = select_variant(budget, args.models_root)
+            args.device = budget.device
+            print(f"Selected {args.model} for '{budget}' (measured p{budget.percentile}: "
+                  f"{measurement[f'p{budget.percentile}_ms']:.0f} ms)")
+        decoder = None
+        if args.beam_width > 0 or args.lm or args.hotwords:
+            hotwords = None
+            if args.hotwords:
+                hotwords = {word: args.hotword_boost for word in args.hotwords.split(",")}
+            decoder = CTCBeamSearchDecoder.from_pretrained(
+                args.model, lm_path=args.lm, beam_width=args.beam_width or 8, hotwords=hotwords
+            )
+        static_input_length = None
+        if args.streaming and args.device.upper() == "NPU":
+            # Compile the streaming window instead of the 30s shape
+            static_input_length = window_length(args.chunk_s)
+        elif args.kws_only and args.device.upper() == "NPU":
+            # Only the spotter runs: compile its window
+            static_input_length = KWS_WINDOW
+        if args.snapshot:
+            transcriber = load_snapshot(args.snapshot, trim_silence=args.trim_silence, decoder=decoder)
+            print(f"Loaded snapshot for {transcriber.device} in {transcriber.import_s:.2f}s")
+        else:
+            transcriber = Transcriber(model_path=args.model, device=args.device, trim_silence=args.trim_silence,
+                                      decoder=decoder, static_input_length=static_input_length)
+        if args.watch_model:
+            # Replacements are built with the same settings while this one keeps serving
+            if args.snapshot:
+                factory = lambda model_path, **kwargs: load_snapshot(model_path, trim_silence=args.trim_silence,
+                                                                     decoder=decoder, **kwargs)
+            else:
+                settings = dict(trim_silence=args.trim_silence, decoder=decoder, static_input_length=static_input_length)
+                factory = lambda **kwargs: Transcriber(**settings, **kwargs)
+            transcriber = HotSwapTranscriber(transcriber, factory=factory)
     except Exception as e:
         print(f"Failed to initialize Transcriber: {e}")
         print("Ensure you have the model converted and OpenVINO installed.")
         return
 
+    spotter = None
+    if args.keywords:
+        kws_transcriber = transcriber
+        if not args.snapshot and args.device.upper() == "NPU" and static_input_length != KWS_WINDOW:
+            # Windows would pad to the transcription shape; compile a second model at the window length
+            kws_transcriber = Transcriber(model_path=args.model, device=args.device, static_input_length=KWS_WINDOW)
+        spotter = KeywordSpotter(kws_transcriber, args.keywords.split(","), threshold=args.kws_threshold,
+                                 window_s=KWS_WINDOW / SAMPLE_RATE)
+
+    streamer = None
+    if args.streaming and not args.kws_only:
+        streamer = StreamingTranscriber(transcriber, chunk_s=args.chunk_s)
+
     print("Initializing VAD...")
     vad = VoiceActivityDetector(threshold=0.5)
 
-    audio_queue = queue.Queue()
+    # Transcripts and status text are written by background threads, so a slow terminal, disk or reader
+    # never stalls capture; nothing below prints directly
+    sinks = [StdoutSink()]
+    if args.jsonl:
+        sinks.append(JSONLSink(args.jsonl))
+    for path, fmt in ((args.srt, "srt"), (args.vtt, "vtt")):
+        if path:
+            sinks.append(SubtitleSink(path, fmt=fmt, max_cues=args.subtitle_cues))
+    if args.socket_out:
+        sinks.append(SocketSink(args.socket_out))
+    output = TranscriptOutput(sinks)
+
+    idle = None
+    if args.idle_after_s > 0:
+        # Pre-warm on wake: the first inference after a long pause pays the engine's cold start
+        warmup_audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+        idle = IdleMonitor(idle_after_s=args.idle_after_s, on_wake=lambda: transcriber.get_logits(warmup_audio))
+
+    # Capture straight into a preallocated ring; blocks are converted to float32 on read
+    ring = CaptureRing(seconds=RING_SECONDS, dtype=args.capture_dtype, block_size=BLOCK_SIZE)
 
     def audio_callback(indata, frames, time_info, status):
         if status:
-            print(status, file=sys.stderr)
-        # Flatten and copy
-        audio_queue.put(indata.flatten().copy())
+            output.status(str(status))
+        ring.write(indata)
 
-    print("\nListening... (Press Ctrl+C to stop)")
+    output.status("\nListening... (Press Ctrl+C to stop)")
     
     # State
-    speech_buffer = []
+    speech_start = 0  # Ring position of the utterance's first sample
+    clipped = 0  # Utterance samples overwritten before they could be transcribed
+    speech_probs = []
     silence_counter = 0
     is_speaking = False
+    model_file = args.snapshot or os.path.join(args.model, "openvino_model.xml")
+    model_mtime = os.path.getmtime(model_file) if args.watch_model else None
+    next_model_check = time.time() + MODEL_CHECK_S
     
     try:
-        with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, callback=audio_callback, blocksize=BLOCK_SIZE):
+        with sd.InputStream(samplerate=SAMPLE_RATE, channels=1, dtype=args.capture_dtype,
+                            callback=audio_callback, blocksize=BLOCK_SIZE):
             while True:
-                try:
-                    chunk = audio_queue.get(timeout=0.1)
-                except queue.Empty:
+                if args.watch_model and time.time() >= next_model_check:
+                    next_model_check = time.time() + MODEL_CHECK_S
+                    try:
+                        mtime = os.path.getmtime(model_file)
+                    except OSError:
+                        mtime = model_mtime  # Mid-export; look again next time
+                    if mtime != model_mtime and not transcriber.reloading:
+                        model_mtime = mtime
+                        output.status("\n[Model changed, reloading in the background]")
+                        transcriber.reload()
+                
+                if idle is not None and idle.is_idle:
+                    # No VAD while idle: one energy check over the captured blocks per interval
+                    time.sleep(idle.check_interval_s)
+                    if idle.poll(ring) is not None:
+                        vad.set_state(None)  # The VAD resumes at the pre-roll with fresh state
+                        output.status(f"[Wake] Level above {idle.wake_level_db:.0f} dBFS, "
+                              f"pre-warm {idle.last_prewarm_s * 1000:.0f}ms")
+                    continue
+
+                if not ring.wait(timeout=0.1):
                     continue
+                block_start = ring.read_position
+                chunk = ring.read()  # Reused float32 buffer, valid until the next read
 
                 # Check VAD
                 # VAD expects float32
-                if vad.is_speech(chunk, SAMPLE_RATE):
+                speech_prob = vad.speech_probability(chunk, SAMPLE_RATE)
+                if speech_prob > vad.threshold:
                     if not is_speaking:
-                        print("\n[Speech Detected]", end="", flush=True)
+                        output.status("\n[Speech Detected]", end="")
                         is_speaking = True
+                        speech_start = block_start
                     
-                    speech_buffer.append(chunk)
+                    speech_probs.append(speech_prob)
                     silence_counter = 0
-                    print(".", end="", flush=True)
+                    output.status(".", end="")
+                    
+                    if streamer is not None:
+                        committed = streamer.feed(chunk)
+                        if committed:
+                            output.status(committed, end="")
+                elif is_speaking:
+                    # We were speaking, now silence; keep trailing silence context
+                    speech_probs.append(speech_prob)
+                    silence_counter += (BLOCK_SIZE / SAMPLE_RATE) * 1000
+                    if streamer is not None:
+                        streamer.feed(chunk)
+                
+                if spotter is not None and is_speaking:
+                    # Pauses included, so a phrase spanning one is scored as spoken; times are ring positions
+                    for hit in spotter.feed(chunk, position=block_start):
+                        output.status(f"\n[Keyword] {hit.keyword} ({hit.confidence:.2f}) at {hit.start_time:.2f}s")
+                
+                if idle is not None and idle.observe(is_speaking, BLOCK_SIZE):
+                    output.status(f"\n[Idle] No speech for {args.idle_after_s:.0f}s, energy detector only")
+
+                # End the utterance after enough silence, or at the 30s model window (streaming has no cap)
+                speech_samples = ring.read_position - speech_start
+                if not is_speaking or (silence_counter < SILENCE_DURATION_MS
+                                       and (streamer is not None or speech_samples < MAX_SPEECH_SAMPLES)):
+                    continue
+                
+                if streamer is not None:
+                    start_time = time.time()
+                    streamer.flush()  # Commits the tail; the full text is printed by the stdout sink
+                    output.status("")  # End the progress line
+                    output.emit(TranscriptEvent(streamer.text, speech_start / SAMPLE_RATE,
+                                                ring.read_position / SAMPLE_RATE,
+                                                inference_ms=(time.time() - start_time) * 1000))
+                    output.status(f"[Stats] {streamer.chunks_encoded} chunks for {speech_samples / SAMPLE_RATE:.1f}s")
+                    streamer.reset()
+                    if spotter is not None:
+                        spotter.reset()
+                    output.status("Listening...")
+                elif args.kws_only:
+                    # Keyword-only channel: the spotter already ran during speech
+                    spotter.reset()
                 else:
-                    if is_speaking:
-                        # We were speaking, now silence
-                        speech_buffer.append(chunk) # Include trailing silence context
-                        silence_counter += (BLOCK_SIZE / SAMPLE_RATE) * 1000
-                        
-                        if silence_counter >= SILENCE_DURATION_MS:
-                            print(f"\n[Processing {len(speech_buffer) * BLOCK_SIZE / SAMPLE_RATE:.1f}s audio]...")
-                            
-                            # Concatenate buffer
-                            full_audio = np.concatenate(speech_buffer)
-                            
-                            # Transcribe
-                            start_time = time.time()
-                            text = transcriber.transcribe(full_audio)
-                            inference_time = time.time() - start_time
-                            
-                            print(f"> {text}")
-                            print(f"[Stats] {inference_time:.2f}s | RTF: {inference_time / (len(full_audio)/SAMPLE_RATE):.2f}")
-                            
-                            # Reset
-                            speech_buffer = []
-                            is_speaking = False
-                            silence_counter = 0
-                            print("Listening...")
+                    output.status(f"\n[Processing {speech_samples / SAMPLE_RATE:.1f}s audio]...")
+                    
+                    oldest = ring.oldest_position
+                    if speech_start < oldest:
+                        # The reader fell a whole ring behind and the start was overwritten: keep the rest
+                        clipped += oldest - speech_start
+                        speech_start = oldest
+                        kept_blocks = (ring.read_position - speech_start) // BLOCK_SIZE
+                        speech_probs = speech_probs[max(0, len(speech_probs) - kept_blocks):]
+                    
+                    # One vectorized int16 -> float32 conversion for the whole utterance
+                    full_audio = ring.get_range(speech_start, ring.read_position)
+                    
+                    # Transcribe; the result carries per-stage timings and padding
+                    result = transcriber.transcribe(full_audio, speech_probs=np.array(speech_probs), return_result=True)
+                    
+                    # Printed with inference time and RTF by the stdout sink
+                    output.emit(TranscriptEvent(result.text, speech_start / SAMPLE_RATE,
+                                                ring.read_position / SAMPLE_RATE, inference_ms=result.total_ms))
+                    stats = [" ".join(f"{stage} {ms:.0f}ms" for stage, ms in result.timings.items() if ms >= 0.5)
+                             + f" | Padding: {result.padding_ratio:.0%} of {result.bucket / SAMPLE_RATE:.1f}s"]
+                    if args.trim_silence:
+                        stats.append(f"Trimmed: {transcriber.last_trimmed_samples / SAMPLE_RATE:.2f}s")
+                    if ring.overruns or clipped:
+                        stats.append(f"Dropped: {(ring.overruns + clipped) / SAMPLE_RATE:.2f}s")
+                    if output.backlog:
+                        stats.append(f"Sink backlog: {output.backlog}")
+                    output.status("[Stats] " + " | ".join(stats))
+                    
+                    if spotter is not None:
+                        spotter.reset()
+                    output.status("Listening...")
+                
+                # Reset
+                speech_probs = []
+                is_speaking = False
+                silence_counter = 0
     except KeyboardInterrupt:
-        print("\nStopping...")
+        output.status("\nStopping...")
+    finally:
+        # Write out whatever the sinks still have queued
+        output.close()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+OpenVINO performance auto-tuner.
+
+Sweeps performance hints, streams, inference threads, CPU pinning and
+inference precision for a model/device/shape, measures latency and
+throughput for each, and saves the winner to this host's tuning profile.
+Transcriber applies the saved profile automatically at startup.
+"""
+
+import os
+import sys
+import argparse
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from stt_npu.core import Transcriber
+from stt_npu.tuning import OBJECTIVES, save_profile, tune
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune OpenVINO compile properties and save the best per host")
+    parser.add_argument("--model", type=str, default="models/wav2vec2-large-960h",
+                        help="Path to model")
+    parser.add_argument("--device", type=str, default="NPU",
+                        help="Device to tune: NPU, CPU or GPU")
+    parser.add_argument("--duration", type=float, default=Transcriber.STATIC_INPUT_LENGTH / Transcriber.SAMPLE_RATE,
+                        help="Input length to tune for (seconds). Defaults to the Transcriber window")
+    parser.add_argument("--objective", type=str, default="latency", choices=OBJECTIVES,
+                        help="Pick the config with the lowest latency or the highest throughput")
+    parser.add_argument("--iterations", type=int, default=10,
+                        help="Timed inferences per config")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the winner without saving it")
+    args = parser.parse_args()
+
+    input_length = int(args.duration * Transcriber.SAMPLE_RATE)
+
+    print("=" * 60)
+    print("OPENVINO AUTO-TUNER")
+    print("=" * 60)
+    print(f"Model:     {args.model}")
+    print(f"Device:    {args.device.upper()}")
+    print(f"Shape:     [1, {input_length}] ({args.duration}s)")
+    print(f"Objective: {args.objective}")
+    print()
+
+    profile = tune(args.model, args.device, input_length, args.objective, args.iterations)
+
+    print("\n## Best Config")
+    print("-" * 40)
+    for key, value in profile["config"].items():
+        print(f"  {key}: {value}")
+    print(f"  Latency p50: {profile['latency_p50_ms']:.1f}ms | p95: {profile['latency_p95_ms']:.1f}ms")
+    print(f"  Throughput:  {profile['throughput_ips']:.1f} inferences/s")
+
+    if not args.dry_run:
+        path = save_profile(profile)
+        print(f"\nSaved profile to {path}")
+
+
+if __name__ == "__main__":
+    main()
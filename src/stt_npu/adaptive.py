@@ -0,0 +1,211 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .utils import SAMPLE_RATE
+
+
+class AdaptiveResult(NamedTuple):
+    """A transcript plus which tier produced it and how long it took."""
+    text: str
+    tier: int
+    model_path: str
+    degraded: bool
+    queue_ms: float
+    inference_ms: float
+
+    @property
+    def latency_ms(self) -> float:
+        """End-to-end latency: time queued plus inference."""
+        return self.queue_ms + self.inference_ms
+
+
+class AdaptiveTranscriber:
+    """
+    Serves requests from a ladder of Transcribers, degrading under load.
+
+    ``tiers`` are ordered from preferred (e.g. wav2vec2-large) to cheapest
+    (e.g. wav2vec2-base); all stay loaded. Requests are queued and served by
+    one worker. For each request the worker predicts its completion time on
+    every tier: the time it has already waited plus the queue behind it
+    drained at that tier's recent service time. It picks the best tier that
+    still meets the latency SLO. Moving back up to a better tier requires
+    headroom (``recover_ratio``), so the level does not flap at the boundary.
+    Results from a different model than the first tier's are marked ``degraded``.
+
+    Tiers may also differ only in input shape: on NPU the same model compiled
+    with a short ``static_input_length`` (e.g. 5s) serves short VAD segments
+    far cheaper than the 30s shape. A tier never serves audio longer than its
+    static length, so list the short-shape tier first; longer requests skip it.
+    """
+
+    def __init__(self, tiers: Sequence, latency_slo_ms: float = 1000.0, max_queue_depth: int = 8,
+                 recover_ratio: float = 0.5, ewma_alpha: float = 0.2, warmup: bool = True,
+                 warmup_s: float = 4.0):
+        """
+        Args:
+            tiers (list): Transcribers, best first.
+            latency_slo_ms (float): Target end-to-end latency per request.
+            max_queue_depth (int): Queue depth at which the cheapest tier is used unconditionally.
+            recover_ratio (float): Fraction of the SLO a better tier must fit within to move back up.
+            ewma_alpha (float): Smoothing of per-tier service time estimates.
+            warmup (bool): Time an inference per tier to seed the estimates.
+            warmup_s (float): Audio per warm-up inference; a typical VAD segment, since the
+                estimate is per request and dynamic shapes cost more on longer audio.
+        """
+        if not tiers:
+            raise ValueError("At least one tier is required")
+        self.tiers = list(tiers)
+        self.slo_s = latency_slo_ms / 1000
+        self.max_queue_depth = max_queue_depth
+        self.recover_ratio = recover_ratio
+        self.ewma_alpha = ewma_alpha
+        # Longest input each tier serves without truncating; None for dynamic shapes
+        self.input_lengths = []
+        for transcriber in self.tiers:
+            length = getattr(transcriber, "static_length", None)
+            self.input_lengths.append(length if isinstance(length, int) else None)
+
+        # Smoothed seconds of inference per request, per tier
+        self.service_time = [0.0] * len(self.tiers)
+        self.level = 0
+        self.served = [0] * len(self.tiers)
+        self.degraded = 0
+        self.switches = 0
+
+        if warmup:
+            # get_logits always runs the model: transcribe() would skip inference on silence when the
+            # tier trims it, or return a cached transcript, and seed a near-zero estimate
+            for tier, transcriber in enumerate(self.tiers):
+                length = int(warmup_s * SAMPLE_RATE)
+                if self.input_lengths[tier] is not None:
+                    length = min(length, self.input_lengths[tier])
+                audio = np.zeros(length, dtype=np.float32)
+                # The first call pays one-off allocation costs; time the second
+                transcriber.get_logits(audio)
+                start = time.perf_counter()
+                transcriber.get_logits(audio)
+                self.service_time[tier] = time.perf_counter() - start
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def stats(self) -> Dict:
+        """Requests served per tier, degraded count and level switches."""
+        return {
+            "served": list(self.served),
+            "degraded": self.degraded,
+            "switches": self.switches,
+            "level": self.level,
+            "service_time_ms": [s * 1000 for s in self.service_time],
+        }
+
+    def submit(self, audio_chunk: np.ndarray) -> Future:
+        """
+        Queue audio for transcription.
+
+        Args:
+            audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+
+        Returns:
+            Future: Resolves to an AdaptiveResult.
+        """
+        future = Future()
+        self._queue.put((audio_chunk, time.perf_counter(), future))
+        return future
+
+    def transcribe(self, audio_chunk: np.ndarray) -> AdaptiveResult:
+        """Submit and wait for the result."""
+        return self.submit(audio_chunk).result()
+
+    def close(self):
+        """Finish queued requests and stop the worker."""
+        if self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+
+    def choose_tier(self, waited_s: float, depth: int, num_samples: Optional[int] = None) -> int:
+        """
+        Pick the tier for the request at the head of the queue.
+
+        Args:
+            waited_s (float): How long the request has been queued.
+            depth (int): Requests queued behind it.
+            num_samples (int, optional): Request length; tiers with a shorter static input are skipped.
+
+        Returns:
+            int: Tier index.
+        """
+        eligible = [
+            tier for tier, length in enumerate(self.input_lengths)
+            if num_samples is None or length is None or num_samples <= length
+        ] or list(range(len(self.tiers)))
+        cheapest = eligible[-1]
+        if depth >= self.max_queue_depth:
+            return cheapest
+        for tier in eligible[:-1]:
+            predicted = waited_s + (depth + 1) * self.service_time[tier]
+            budget = self.slo_s if tier >= self.level else self.slo_s * self.recover_ratio
+            if predicted <= budget:
+                return tier
+        return cheapest
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            audio_chunk, submitted, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            dequeued = time.perf_counter()
+            tier = self.choose_tier(dequeued - submitted, self._queue.qsize(), len(audio_chunk))
+            if tier != self.level:
+                self.switches += 1
+                self.level = tier
+
+            transcriber = self.tiers[tier]
+            try:
+                text = transcriber.transcribe(audio_chunk)
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - dequeued
+
+            self.service_time[tier] += self.ewma_alpha * (elapsed - self.service_time[tier])
+            self.served[tier] += 1
+            degraded = transcriber.model_path != self.tiers[0].model_path
+            self.degraded += degraded
+            future.set_result(AdaptiveResult(
+                text,
+                tier,
+                transcriber.model_path,
+                degraded,
+                (dequeued - submitted) * 1000,
+                elapsed * 1000,
+            ))
+
+
+def latency_percentiles(results: List[AdaptiveResult], percentiles=(50, 95, 99)) -> Dict[str, Optional[float]]:
+    """End-to-end latency percentiles (ms) of a list of results."""
+    if not results:
+        return {f"p{p}_ms": None for p in percentiles}
+    latencies = np.array([r.latency_ms for r in results])
+    return {f"p{p}_ms": float(np.percentile(latencies, p)) for p in percentiles}
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import numpy as np
+
+
+def audio_key(audio: np.ndarray, identity: str, speech_probs: Optional[np.ndarray] = None) -> str:
+    """
+    Cache key for an audio clip under a given model and decode configuration.
+
+    The exact float32 samples the model would see are hashed, so audio that
+    differs below 16-bit resolution (e.g. float captures or resampled input)
+    never shares an entry, while float64 copies of the same audio still do.
+
+    Args:
+        audio (np.ndarray): Audio data (float32, range [-1, 1]).
+        identity (str): Model and settings identity (see ``Transcriber.cache_identity``).
+        speech_probs (np.ndarray, optional): VAD probabilities that steer silence trimming.
+
+    Returns:
+        str: Hex digest.
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(identity.encode("utf-8"))
+    h.update(np.ascontiguousarray(audio, dtype=np.float32).tobytes())
+    if speech_probs is not None:
+        h.update(np.round(np.asarray(speech_probs, dtype=np.float32), 3).tobytes())
+    return h.hexdigest()
+
+
+def model_identity(model_path: str) -> str:
+    """
+    Identify a model directory by path and weight file, so a re-export invalidates cached text.
+
+    Args:
+        model_path (str): Exported model directory (or hub id).
+
+    Returns:
+        str: Identity string.
+    """
+    identity = os.path.abspath(model_path) if os.path.exists(model_path) else model_path
+    weights = os.path.join(model_path, "openvino_model.bin")
+    if os.path.exists(weights):
+        stat = os.stat(weights)
+        identity += f":{stat.st_size}:{stat.st_mtime_ns}"
+    return identity
+
+
+class TranscriptCache:
+    """
+    Two-tier transcript cache: an in-memory LRU backed by an optional SQLite file.
+
+    Memory hits cost a dict lookup. Entries evicted from memory stay on disk
+    (when ``db_path`` is set), so repeated prompts and reprocessed files are
+    served from disk after a restart or after falling out of the LRU. The
+    cache is thread-safe, so one instance can sit behind a serving worker.
+    """
+
+    def __init__(self, max_entries: int = 1024, db_path: Optional[str] = None,
+                 max_disk_entries: Optional[int] = None):
+        """
+        Args:
+            max_entries (int): In-memory LRU size.
+            db_path (str, optional): SQLite file for the persistent tier.
+            max_disk_entries (int, optional): Bound on the disk tier (least recently used dropped first).
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        self._db = None
+        if db_path is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS transcripts (key TEXT PRIMARY KEY, text TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            self._db.commit()
+            self._disk_count = self._db.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    @property
+    def stats(self) -> Dict:
+        """Hit, miss and eviction counters."""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+        }
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a transcript, promoting disk hits into memory.
+
+        Args:
+            key (str): Key from ``audio_key``.
+
+        Returns:
+            str or None: The cached transcript.
+        """
+        with self._lock:
+            text = self._memory.get(key)
+            if text is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return text
+
+            if self._db is not None:
+                row = self._db.execute("SELECT text FROM transcripts WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    self._db.execute("UPDATE transcripts SET last_used = ? WHERE key = ?", (time.time(), key))
+                    self._db.commit()
+                    self._remember(key, row[0])
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, text: str):
+        """
+        Store a transcript in memory and, if configured, on disk.
+
+        Args:
+            key (str): Key from ``audio_key``.
+            text (str): Transcript.
+        """
+        with self._lock:
+            self._remember(key, text)
+            if self._db is None:
+                return
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO transcripts (key, text, last_used) VALUES (?, ?, ?)", (key, text, time.time())
+            ).rowcount
+            self._disk_count += inserted
+            if self.max_disk_entries is not None and self._disk_count > self.max_disk_entries:
+                excess = self._disk_count - self.max_disk_entries
+                self._db.execute(
+                    "DELETE FROM transcripts WHERE key IN (SELECT key FROM transcripts ORDER BY last_used, rowid LIMIT ?)",
+                    (excess,),
+                )
+                self._disk_count -= excess
+                self.disk_evictions += excess
+            self._db.commit()
+
+    def clear(self):
+        """Drop all entries from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM transcripts")
+                self._db.commit()
+                self._disk_count = 0
+
+    def close(self):
+        """Close the SQLite connection."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
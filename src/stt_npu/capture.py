@@ -0,0 +1,177 @@
+import threading
+from typing import Optional
+
+import numpy as np
+
+from .utils import BLOCK_SIZE, SAMPLE_RATE
+
+# float32, so int16 * scale runs as a single float32 loop
+INT16_SCALE = np.float32(1.0 / 32768)
+
+
+class CaptureRing:
+    """
+    Preallocated capture ring written directly by the audio callback.
+
+    The callback copies each block into a fixed ring (int16 by default, half
+    the bytes of float32) and bumps a counter: no queue entries, no per-block
+    arrays. The consumer converts to float32 only when it reads, in one
+    vectorized scale per read, into buffers it reuses. Past audio stays in
+    the ring, so a whole utterance can be fetched by sample position at once
+    instead of concatenating a list of blocks.
+
+    One writer (the callback thread) and one reader are supported.
+    """
+
+    def __init__(self, seconds: float = 60.0, channels: int = 1, dtype: str = "int16",
+                 block_size: int = BLOCK_SIZE, sample_rate: int = SAMPLE_RATE):
+        """
+        Args:
+            seconds (float): Ring capacity; bounds both reader lag and utterance length.
+            channels (int): Number of capture channels.
+            dtype (str): Capture sample format, ``int16`` or ``float32``.
+            block_size (int): Frames per read (the VAD window).
+            sample_rate (int): Sample rate of the stream.
+        """
+        if dtype not in ("int16", "float32"):
+            raise ValueError(f"dtype must be 'int16' or 'float32', got {dtype!r}")
+        self.capacity = int(seconds * sample_rate) // block_size * block_size
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.block_size = block_size
+        self._ring = np.zeros((self.capacity, channels), dtype=self.dtype)
+        # Reused float32 output for read(); [block, channels] and its mono view
+        self._block = np.zeros((block_size, channels), dtype=np.float32)
+        self._mono_block = self._block[:, 0] if channels == 1 else None
+
+        # Absolute sample positions (frames since start)
+        self.write_position = 0
+        self.read_position = 0
+        # Frames the reader lost because the writer lapped it
+        self.overruns = 0
+        self._ready = threading.Event()
+        self._waiting = False
+
+    @property
+    def available(self) -> int:
+        """Frames written but not read yet."""
+        return self.write_position - self.read_position
+
+    @property
+    def oldest_position(self) -> int:
+        """Earliest frame still safe to read, one block of margin ahead of the writer lapping it."""
+        return max(0, self.write_position - self.capacity + self.block_size)
+
+    def callback(self, indata, frames, time_info, status):
+        """``sounddevice.InputStream`` callback: copy the block into the ring."""
+        self.write(indata)
+
+    def write(self, indata: np.ndarray):
+        """
+        Append a block of shape [frames, channels] (or [frames] for mono).
+
+        Args:
+            indata (np.ndarray): Samples in the ring's dtype.
+        """
+        n = len(indata)
+        start = self.write_position % self.capacity
+        end = start + n
+        if end <= self.capacity:
+            # Fast path: capacity is a whole number of blocks, so callbacks never straddle the end
+            self._ring[start:end] = indata.reshape(n, self.channels)
+        else:
+            first = self.capacity - start
+            indata = indata.reshape(n, self.channels)
+            self._ring[start:] = indata[:first]
+            self._ring[:n - first] = indata[first:]
+        self.write_position += n
+        # Signalling takes a lock; skip it unless the reader is actually blocked
+        if self._waiting:
+            self._ready.set()
+
+    def wait(self, frames: Optional[int] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until at least ``frames`` (default: one block) are readable.
+
+        Returns:
+            bool: True if they are.
+        """
+        frames = frames or self.block_size
+        if self.available >= frames:
+            return True
+        self._waiting = True
+        try:
+            while self.available < frames:
+                self._ready.clear()
+                if self.available >= frames:
+                    break
+                if not self._ready.wait(timeout):
+                    return False
+        finally:
+            self._waiting = False
+        return True
+
+    def read(self) -> np.ndarray:
+        """
+        Consume the next block as float32.
+
+        Returns:
+            np.ndarray: [block_size] for mono, [block_size, channels] otherwise. This is a
+                reused buffer, valid until the next read; copy it to keep it.
+        """
+        lost = self.available - self.capacity + self.block_size
+        if lost > 0:
+            # The writer lapped us: skip ahead, keeping one block of margin from the writer
+            self.overruns += lost
+            self.read_position += lost
+        self._convert(self.read_position, self.read_position + self.block_size, self._block)
+        self.read_position += self.block_size
+        return self._mono_block if self._mono_block is not None else self._block
+
+    def seek(self, position: int):
+        """
+        Move the read position, forward to skip audio or back to re-read it.
+
+        Args:
+            position (int): Absolute frame; must still be in the ring, with one block of
+                margin from the writer.
+        """
+        if position > self.write_position or position < self.oldest_position:
+            raise ValueError(f"Frame {position} is not in the ring")
+        self.read_position = position
+
+    def get_range(self, start: int, end: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Past audio by absolute position, converted to float32 in one pass.
+
+        Args:
+            start (int): First frame (absolute position).
+            end (int): One past the last frame.
+            out (np.ndarray, optional): Float32 buffer of at least ``end - start`` frames.
+
+        Returns:
+            np.ndarray: [frames] for mono, [frames, channels] otherwise.
+        """
+        if end > self.write_position or start < self.write_position - self.capacity or start > end:
+            raise ValueError(f"Frames [{start}, {end}) are not in the ring")
+        n = end - start
+        if out is None:
+            out = np.empty((n, self.channels), dtype=np.float32)
+        else:
+            out = out[:n].reshape(n, self.channels)
+        self._convert(start, end, out)
+        return out[:, 0] if self.channels == 1 else out
+
+    def _convert(self, start: int, end: int, out: np.ndarray):
+        """Copy ring frames [start, end) into ``out``, scaling int16 to [-1, 1)."""
+        n = end - start
+        offset = start % self.capacity
+        first = min(n, self.capacity - offset)
+        if self.dtype == np.int16:
+            np.multiply(self._ring[offset:offset + first], INT16_SCALE, out=out[:first])
+            if first < n:
+                np.multiply(self._ring[:n - first], INT16_SCALE, out=out[first:n])
+        else:
+            out[:first] = self._ring[offset:offset + first]
+            if first < n:
+                out[first:n] = self._ring[:n - first]
@@ -1,9 +1,16 @@
+import time
 
 import numpy as np
 import torch
 from optimum.intel import OVModelForCTC
 from transformers import AutoProcessor
 
+from .cache import audio_key, model_identity
+from .results import DECODE, INFER, PAD, PREPROCESS, STAGES, TRIM, TranscriptionResult
+from .tuning import load_profile
+from .utils import FRAME_STRIDE, RECEPTIVE_FIELD, SAMPLE_RATE, find_speech_bounds, trim_silence
+
+
 class Transcriber:
     """
     A wrapper around Optimum Intel's OVModelForCTC for NPU-accelerated transcription.
@@ -11,35 +18,91 @@ class Transcriber:
     """
     
     # Wav2Vec2 expects 16kHz audio
-    SAMPLE_RATE = 16000
+    SAMPLE_RATE = SAMPLE_RATE
     # Fixed input length for NPU static shapes (30 seconds of audio)
-    STATIC_INPUT_LENGTH = 16000 * 30  # 480,000 samples
+    STATIC_INPUT_LENGTH = SAMPLE_RATE * 30  # 480,000 samples
     
-    def __init__(self, model_path: str, device: str = "NPU"):
+    def __init__(
+        self,
+        model_path: str,
+        device: str = "NPU",
+        ov_config: dict = None,
+        use_tuned_profile: bool = True,
+        trim_silence: bool = False,
+        trim_margin_ms: int = 200,
+        decoder=None,
+        batch_size: int = 1,
+        cache=None,
+        static_input_length: int = None,
+    ):
         """
         Initialize the Transcriber.
 
         Args:
             model_path (str): Path to the OpenVINO IR model directory.
             device (str): target device (NPU, CPU, GPU). Defaults to NPU.
+            ov_config (dict, optional): OpenVINO compile properties. Override the tuned profile.
+            use_tuned_profile (bool): Apply this host's saved tuning profile (see scripts/tune.py) if one exists.
+            trim_silence (bool): Drop leading/trailing non-speech before padding. Defaults to False.
+            trim_margin_ms (int): Audio kept on each side of detected speech when trimming.
+            decoder (CTCBeamSearchDecoder, optional): Beam search decoder (see decoding.py).
+                Defaults to greedy argmax decoding.
+            batch_size (int): Static batch dimension compiled for NPU, e.g. the channel count for
+                multichannel input. CPU/GPU accept any batch. Defaults to 1.
+            cache (TranscriptCache, optional): Transcript cache for repeated audio (see cache.py).
+            static_input_length (int, optional): Static input length in samples. On NPU it defaults
+                to 30s; streaming mode compiles its window length instead (see streaming.py). On
+                CPU/GPU, where shapes are dynamic by default, setting it pads every input to this
+                length as on NPU (e.g. to reproduce NPU padding without one).
         """
         self.model_path = model_path
         self.device = device.upper()
+        self.trim_silence = trim_silence
+        self.decoder = decoder
+        self.batch_size = batch_size
+        self.cache = cache
+        self._cache_identity = None
+        if static_input_length is not None:
+            self.STATIC_INPUT_LENGTH = static_input_length
+        # Length every input is padded to; None for dynamic shapes (CPU/GPU by default)
+        self.static_length = self.STATIC_INPUT_LENGTH if self.device == "NPU" or static_input_length else None
+        self._pad_buffer = None
+        # Nanoseconds per stage for the current request, reset by transcribe (see STAGES)
+        self._stage_ns = np.zeros(len(STAGES), dtype=np.int64)
+        self._last_bucket = 0
+        # Inference calls run so far (a batch split into several groups counts each)
+        self.inference_calls = 0
+        self.trim_margin_samples = self.SAMPLE_RATE * trim_margin_ms // 1000
+        # Samples dropped by silence trimming: last request and running total
+        self.last_trimmed_samples = 0
+        self.total_trimmed_samples = 0
         
         print(f"Loading Wav2Vec2 model from {model_path} to {self.device}...")
         
+        self.ov_config = {}
+        # Tuning profile applied at compile time, if any
+        self.tuned_profile = None
+        if use_tuned_profile:
+            self.tuned_profile = load_profile(model_path, self.device, self.STATIC_INPUT_LENGTH)
+            if self.tuned_profile is not None:
+                print(f"Using tuned profile ({self.tuned_profile['objective']}): {self.tuned_profile['config']}")
+                self.ov_config.update(self.tuned_profile["config"])
+        if ov_config:
+            self.ov_config.update(ov_config)
+        
         if self.device == "NPU":
             # For NPU: load without compiling, reshape to static, then compile
             print("Loading model with compile=False for NPU reshaping...")
             self.model = OVModelForCTC.from_pretrained(
                 model_path, 
-                compile=False
+                compile=False,
+                ov_config=self.ov_config
             )
             
             # Reshape for static input length (NPU requires this)
-            print(f"Reshaping model for static input length [{1}, {self.STATIC_INPUT_LENGTH}]...")
+            print(f"Reshaping model for static input length [{self.batch_size}, {self.STATIC_INPUT_LENGTH}]...")
             self.model.model.reshape({
-                "input_values": [1, self.STATIC_INPUT_LENGTH]
+                "input_values": [self.batch_size, self.STATIC_INPUT_LENGTH]
             })
             
             # Compile for NPU - set device then compile
@@ -49,7 +112,7 @@ class Transcriber:
             print("Model compiled and loaded on NPU successfully.")
         else:
             # For CPU/GPU: direct loading works fine
-            self.model = OVModelForCTC.from_pretrained(model_path, device=self.device)
+            self.model = OVModelForCTC.from_pretrained(model_path, device=self.device, ov_config=self.ov_config)
         # Load processor
         try:
             self.processor = AutoProcessor.from_pretrained(model_path)
@@ -58,54 +121,278 @@ class Transcriber:
             from transformers import Wav2Vec2Processor
             self.processor = Wav2Vec2Processor.from_pretrained(model_path)
 
-    def transcribe(self, audio_chunk: np.ndarray) -> str:
+    @classmethod
+    def from_budget(cls, budget, models_root: str = "models", **kwargs) -> "Transcriber":
+        """
+        Build a Transcriber on the most accurate exported variant that meets a budget.
+
+        Variants are chosen from the measurements ``scripts/probe_models.py``
+        stores next to each IR (see registry.py).
+
+        Args:
+            budget (Budget or str): e.g. ``"p95 < 300 ms for 10 s audio on CPU"``.
+            models_root (str): Directory of exported variants.
+            **kwargs: Passed to the constructor (the device comes from the budget).
+
+        Returns:
+            Transcriber: Loaded on the budget's device.
+        """
+        from .registry import parse_budget, select_variant
+        if isinstance(budget, str):
+            budget = parse_budget(budget)
+        model_path, measurement = select_variant(budget, models_root)
+        print(f"Selected {model_path} for '{budget}' "
+              f"(measured p{budget.percentile}: {measurement[f'p{budget.percentile}_ms']:.0f} ms)")
+        return cls(model_path=model_path, device=budget.device, **kwargs)
+
+    def transcribe(self, audio_chunk: np.ndarray, speech_probs: np.ndarray = None, return_result: bool = False):
         """
         Transcribe a chunk of audio using CTC decoding.
 
         Args:
             audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+            speech_probs (np.ndarray, optional): Per-512-sample VAD probabilities for the chunk,
+                used for silence trimming instead of frame energy.
+            return_result (bool): Return a TranscriptionResult (tokens, timestamps, per-stage
+                timings, padding) instead of the text.
 
         Returns:
-            str: Transcribed text.
+            str or TranscriptionResult: Transcribed text, or the full result.
+        """
+        start_ns = time.perf_counter_ns()
+        self._stage_ns[:] = 0
+        self._last_bucket = 0
+        key = None
+        if self.cache is not None:
+            key = self._cache_key(audio_chunk, speech_probs)
+            text = self.cache.get(key)
+            if text is not None:
+                self.last_trimmed_samples = 0
+                if return_result:
+                    return TranscriptionResult(text, self.device, real_samples=len(audio_chunk), cached=True,
+                                               total_ms=(time.perf_counter_ns() - start_ns) / 1e6)
+                return text
+        
+        offset = 0
+        if self.trim_silence:
+            t = time.perf_counter_ns()
+            offset, end = find_speech_bounds(audio_chunk, speech_probs, margin_samples=self.trim_margin_samples)
+            self.last_trimmed_samples = len(audio_chunk) - (end - offset)
+            self.total_trimmed_samples += self.last_trimmed_samples
+            audio_chunk = audio_chunk[offset:end]
+            self._stage_ns[TRIM] += time.perf_counter_ns() - t
+        
+        logits = self.get_logits(audio_chunk) if len(audio_chunk) > 0 else None
+        t = time.perf_counter_ns()
+        text = self._decode(logits) if logits is not None else ""
+        self._stage_ns[DECODE] += time.perf_counter_ns() - t
+        if key is not None:
+            self.cache.put(key, text)
+        if not return_result:
+            return text
+        
+        token_ids = token_times = None
+        if logits is not None and self.decoder is None:
+            token_ids, frames = self._token_path(logits)
+            token_times = (offset + frames * FRAME_STRIDE) / self.SAMPLE_RATE
+        return TranscriptionResult(text, self.device, real_samples=len(audio_chunk), bucket=self._last_bucket,
+                                   stage_ns=self._stage_ns, total_ms=(time.perf_counter_ns() - start_ns) / 1e6,
+                                   token_ids=token_ids, token_times=token_times)
+
+    def transcribe_batch(self, audio_chunks: list, speech_probs: list = None) -> list:
+        """
+        Transcribe several chunks (e.g. one per channel) with batched inference.
+
+        Args:
+            audio_chunks (list): Raw audio arrays (float32), 16kHz. Lengths may differ.
+            speech_probs (list, optional): Per-chunk VAD probabilities for silence trimming.
+
+        Returns:
+            list: Transcribed text per chunk, in input order.
+        """
+        if speech_probs is None:
+            speech_probs = [None] * len(audio_chunks)
+        
+        texts = [None] * len(audio_chunks)
+        keys = [None] * len(audio_chunks)
+        if self.cache is not None:
+            for i, (chunk, probs) in enumerate(zip(audio_chunks, speech_probs)):
+                keys[i] = self._cache_key(chunk, probs)
+                texts[i] = self.cache.get(keys[i])
+        todo = [i for i, text in enumerate(texts) if text is None]
+        
+        chunks = {i: audio_chunks[i] for i in todo}
+        if self.trim_silence:
+            self.last_trimmed_samples = 0
+            for i in todo:
+                chunks[i], removed = trim_silence(chunks[i], speech_probs[i], margin_samples=self.trim_margin_samples)
+                self.last_trimmed_samples += removed
+            self.total_trimmed_samples += self.last_trimmed_samples
+        
+        for i in todo:
+            texts[i] = ""
+        non_empty = [i for i in todo if len(chunks[i]) > 0]
+        if non_empty:
+            logits = self.get_logits_batch([chunks[i] for i in non_empty])
+            for i, chunk_logits in zip(non_empty, logits):
+                texts[i] = self._decode(chunk_logits)
+        
+        if self.cache is not None:
+            for i in todo:
+                self.cache.put(keys[i], texts[i])
+        return texts
+
+    def get_logits(self, audio_chunk: np.ndarray) -> torch.Tensor:
+        """
+        Run the acoustic model without decoding.
+
+        Args:
+            audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+
+        Returns:
+            torch.Tensor: CTC logits of shape [1, frames, vocab], limited to the real (unpadded) audio.
+        """
+        return self.get_logits_batch([audio_chunk])[0]
+
+    def get_logits_batch(self, audio_chunks: list) -> list:
+        """
+        Run the acoustic model on several chunks in as few inference calls as possible.
+
+        With a static length (NPU) chunks are grouped into the batch size (unused rows are zeros).
+        On CPU/GPU chunks of the same length share one call. Chunks are never
+        zero-padded to a longer neighbour: without an attention mask a real
+        Wav2Vec2 encoder's normalization and attention see the padding, so one
+        chunk's logits would depend on the others in the batch.
+
+        Args:
+            audio_chunks (list): Raw audio arrays (float32), 16kHz.
+
+        Returns:
+            list: Per-chunk logits of shape [1, frames, vocab], limited to the real audio.
+        """
+        rows = []
+        lengths = []
+        for chunk in audio_chunks:
+            t = time.perf_counter_ns()
+            chunk, original_length = self._pad(chunk)
+            self._stage_ns[PAD] += time.perf_counter_ns() - t
+            # Process audio through feature extractor
+            t = time.perf_counter_ns()
+            rows.append(self._preprocess(chunk)[0])
+            self._stage_ns[PREPROCESS] += time.perf_counter_ns() - t
+            lengths.append(original_length)
+        
+        if self.static_length:
+            groups = [list(range(start, min(start + self.batch_size, len(rows))))
+                      for start in range(0, len(rows), self.batch_size)]
+        else:
+            same_length = {}
+            for i, row in enumerate(rows):
+                same_length.setdefault(len(row), []).append(i)
+            groups = list(same_length.values())
+        
+        results = [None] * len(rows)
+        for group in groups:
+            group_size = self.batch_size if self.static_length else len(group)
+            batch = torch.zeros(group_size, len(rows[group[0]]))
+            for i, index in enumerate(group):
+                batch[i] = rows[index]
+            
+            # Run inference - CTC model outputs logits directly
+            t = time.perf_counter_ns()
+            logits = self._infer(batch)
+            self._stage_ns[INFER] += time.perf_counter_ns() - t
+            self._last_bucket = batch.shape[1]
+            self.inference_calls += 1
+            
+            for i, index in enumerate(group):
+                # Only take logits for actual audio portion
+                # Wav2Vec2 has a stride of FRAME_STRIDE samples per output frame
+                if self.static_length:
+                    frames = lengths[index] // FRAME_STRIDE
+                else:
+                    frames = max(0, (lengths[index] - RECEPTIVE_FIELD) // FRAME_STRIDE + 1)
+                results[index] = logits[i:i + 1, :frames, :]
+        return results
+
+    @property
+    def cache_identity(self) -> str:
+        """Model, device and every setting that changes the text; part of each cache key.
+
+        Compile properties (the tuned profile included) and the batch size are
+        part of it too: precision hints and batched kernels can change the logits.
+        """
+        if self._cache_identity is None:
+            decoding = self.decoder.fingerprint() if self.decoder is not None else "greedy"
+            trimming = f"trim:{self.trim_margin_samples}" if self.trim_silence else "notrim"
+            device = f"{self.device}:{self.static_length}" if self.static_length else self.device
+            profile = f"profile:{self.tuned_profile['objective']}" if self.tuned_profile is not None else "untuned"
+            compile_config = ",".join(f"{key}={value}" for key, value in sorted(self.ov_config.items()))
+            self._cache_identity = "|".join([
+                model_identity(self.model_path), device, f"batch:{self.batch_size}", profile, compile_config,
+                trimming, decoding,
+            ])
+        return self._cache_identity
+
+    def _cache_key(self, audio_chunk: np.ndarray, speech_probs: np.ndarray = None) -> str:
+        # VAD probabilities only matter when they steer trimming
+        return audio_key(audio_chunk, self.cache_identity, speech_probs if self.trim_silence else None)
+
+    def _pad(self, audio_chunk: np.ndarray):
+        """
+        Pad or truncate audio to the static input length (NPU, or ``static_input_length``).
+
+        Args:
+            audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+
+        Returns:
+            tuple: (audio ready for the processor, number of real samples in it).
         """
         original_length = len(audio_chunk)
         
-        # Pad or truncate to static length for NPU
-        if self.device == "NPU":
+        # Pad or truncate to the static length
+        if self.static_length:
             if len(audio_chunk) < self.STATIC_INPUT_LENGTH:
-                # Pad with zeros
-                padded = np.zeros(self.STATIC_INPUT_LENGTH, dtype=np.float32)
+                # Pad with zeros into one reused buffer (the processor copies it before the next call)
+                if self._pad_buffer is None:
+                    self._pad_buffer = np.zeros(self.STATIC_INPUT_LENGTH, dtype=np.float32)
+                padded = self._pad_buffer
                 padded[:len(audio_chunk)] = audio_chunk
+                padded[len(audio_chunk):] = 0.0
                 audio_chunk = padded
             elif len(audio_chunk) > self.STATIC_INPUT_LENGTH:
                 # Truncate (should rarely happen with 30s limit)
                 audio_chunk = audio_chunk[:self.STATIC_INPUT_LENGTH]
                 original_length = self.STATIC_INPUT_LENGTH
         
-        # Process audio through feature extractor
+        return audio_chunk, original_length
+
+    def _preprocess(self, audio_chunk: np.ndarray) -> torch.Tensor:
+        """Run the feature extractor (normalization) and return model input values."""
         inputs = self.processor(
             audio_chunk, 
             sampling_rate=self.SAMPLE_RATE, 
             return_tensors="pt",
             padding=False
         )
-        
-        # Run inference - CTC model outputs logits directly
+        return inputs.input_values
+
+    def _infer(self, input_values: torch.Tensor) -> torch.Tensor:
+        """Run the CTC model and return logits of shape [batch, frames, vocab]."""
         with torch.no_grad():
-            logits = self.model(inputs.input_values).logits
-        
-        # Calculate how many output frames correspond to actual audio
-        # Wav2Vec2 has a stride of 320 samples per output frame
-        output_frames_for_actual_audio = original_length // 320
-        
-        # Only take logits for actual audio portion
-        if self.device == "NPU" and output_frames_for_actual_audio < logits.shape[1]:
-            logits = logits[:, :output_frames_for_actual_audio, :]
-        
-        # CTC decode: take argmax and decode tokens
+            return self.model(input_values).logits
+
+    def _token_path(self, logits: torch.Tensor):
+        """Greedy CTC path: token ids with repeats and blanks removed, and the frame each starts at."""
+        ids = logits[0].argmax(dim=-1).numpy()
+        keep = ids != self.processor.tokenizer.pad_token_id
+        keep[1:] &= ids[1:] != ids[:-1]
+        frames = np.flatnonzero(keep)
+        return ids[frames], frames
+
+    def _decode(self, logits: torch.Tensor) -> str:
+        """CTC decode with the beam search decoder if set, else greedy argmax collapsed via the tokenizer."""
+        if self.decoder is not None:
+            return self.decoder.decode(logits[0].numpy())
         predicted_ids = torch.argmax(logits, dim=-1)
-        
-        # Decode to text
-        transcription = self.processor.batch_decode(predicted_ids)[0]
-        
-        return transcription
+        return self.processor.batch_decode(predicted_ids)[0]
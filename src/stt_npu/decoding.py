@@ -0,0 +1,570 @@
+import hashlib
+import heapq
+import json
+import math
+import os
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+NEG_INF = -float("inf")
+LOG10_TO_LN = math.log(10.0)
+
+# Wav2Vec2 CTC vocab conventions
+BLANK_TOKEN = "<pad>"
+WORD_DELIMITER = "|"
+
+
+def _logaddexp(a: float, b: float) -> float:
+    """Scalar log(exp(a) + exp(b)); much cheaper than np.logaddexp on Python floats."""
+    if a == NEG_INF:
+        return b
+    if b == NEG_INF:
+        return a
+    if a > b:
+        return a + math.log1p(math.exp(b - a))
+    return b + math.log1p(math.exp(a - b))
+
+
+def log_softmax(logits: np.ndarray) -> np.ndarray:
+    """Numerically stable log-softmax over the last axis."""
+    shifted = logits - logits.max(axis=-1, keepdims=True)
+    return shifted - np.log(np.exp(shifted).sum(axis=-1, keepdims=True))
+
+
+def load_vocab(model_path: str) -> List[str]:
+    """
+    Read a model's CTC vocabulary as a list indexed by token id.
+
+    Args:
+        model_path (str): Model directory containing ``vocab.json``, or a snapshot file
+            (see snapshot.py), which carries its own vocab.
+
+    Returns:
+        list: Token strings ordered by id.
+    """
+    if os.path.isfile(model_path):
+        from .snapshot import read_snapshot
+        return list(read_snapshot(model_path)[0]["vocab"])
+    with open(os.path.join(model_path, "vocab.json"), "r", encoding="utf-8") as f:
+        token_to_id = json.load(f)
+    vocab = [""] * len(token_to_id)
+    for token, idx in token_to_id.items():
+        vocab[idx] = token
+    return vocab
+
+
+def greedy_decode(logits: np.ndarray, vocab: Sequence[str]) -> str:
+    """
+    Greedy CTC decode with numpy: argmax, collapse repeats, drop blanks/specials.
+
+    Args:
+        logits (np.ndarray): Logits of shape [frames, vocab].
+        vocab (list): Token strings ordered by id.
+
+    Returns:
+        str: Decoded text.
+    """
+    ids = logits.argmax(axis=-1)
+    if len(ids) == 0:
+        return ""
+    keep = np.ones(len(ids), dtype=bool)
+    keep[1:] = ids[1:] != ids[:-1]
+    chars = []
+    for idx in ids[keep]:
+        token = vocab[idx]
+        if token == WORD_DELIMITER:
+            chars.append(" ")
+        elif not (token.startswith("<") and token.endswith(">")):
+            chars.append(token)
+    return " ".join("".join(chars).split())
+
+
+class NGramLM:
+    """
+    Back-off n-gram language model read from an ARPA file.
+
+    Works for word LMs and character LMs alike: for a character LM each ARPA
+    token is one character and the word delimiter is written as ``|``.
+    Scores are natural-log probabilities.
+    """
+
+    def __init__(self, ngrams: Dict[tuple, tuple], order: int):
+        """
+        Args:
+            ngrams (dict): Maps token tuples to (log10 prob, log10 backoff).
+            order (int): Highest n-gram order.
+        """
+        self.order = order
+        self._ngrams = ngrams
+        self._cache: Dict[tuple, float] = {}
+        unk = ngrams.get(("<unk>",))
+        self._unk_logp = unk[0] if unk is not None else -10.0
+
+    @classmethod
+    def from_arpa(cls, path: str) -> "NGramLM":
+        """
+        Load an ARPA-format n-gram model.
+
+        Args:
+            path (str): Path to the ``.arpa`` file.
+
+        Returns:
+            NGramLM: The loaded model.
+        """
+        ngrams = {}
+        order = 0
+        section = None
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("\\"):
+                    if line.endswith("-grams:"):
+                        section = int(line[1:line.index("-")])
+                        order = max(order, section)
+                    else:
+                        section = None
+                    continue
+                if section is None:
+                    continue
+                parts = line.split()
+                logp = float(parts[0])
+                if len(parts) == section + 2:
+                    words, backoff = parts[1:-1], float(parts[-1])
+                else:
+                    words, backoff = parts[1:], 0.0
+                ngrams[tuple(w.upper() if not w.startswith("<") else w for w in words)] = (logp, backoff)
+        if order == 0:
+            raise ValueError(f"No n-grams found in {path}")
+        return cls(ngrams, order)
+
+    def score(self, context: Sequence[str], token: str) -> float:
+        """
+        Natural-log probability of ``token`` following ``context``.
+
+        Args:
+            context (sequence): Preceding tokens (only the last order-1 are used).
+            token (str): Token to score.
+
+        Returns:
+            float: ln P(token | context).
+        """
+        key = tuple(context[len(context) - self.order + 1:]) if self.order > 1 else ()
+        key = key + (token,)
+        cached = self._cache.get(key)
+        if cached is None:
+            cached = self._score_log10(key[:-1], token) * LOG10_TO_LN
+            self._cache[key] = cached
+        return cached
+
+    def _score_log10(self, context: tuple, token: str) -> float:
+        entry = self._ngrams.get(context + (token,))
+        if entry is not None:
+            return entry[0]
+        if not context:
+            return self._unk_logp
+        context_entry = self._ngrams.get(context)
+        backoff = context_entry[1] if context_entry is not None else 0.0
+        return backoff + self._score_log10(context[1:], token)
+
+
+class Trie:
+    """Character trie used for lexicon constraints and hotword prefixes."""
+
+    __slots__ = ("children", "word", "weight", "step")
+
+    def __init__(self):
+        self.children: Dict[str, "Trie"] = {}
+        # Set on the node that ends a word
+        self.word: Optional[str] = None
+        self.weight = 0.0
+        # Largest per-character weight share of any word below this node
+        self.step = 0.0
+
+    @classmethod
+    def from_words(cls, words: Iterable[str], weights: Optional[Dict[str, float]] = None) -> "Trie":
+        """
+        Build a trie from words (upper-cased to match the Wav2Vec2 vocab).
+
+        Args:
+            words (iterable): Words to insert.
+            weights (dict, optional): Per-word weight (keyed by upper-cased word) stored on the word's end node.
+
+        Returns:
+            Trie: The root node.
+        """
+        root = cls()
+        for word in words:
+            word = word.strip().upper()
+            if not word:
+                continue
+            node = root
+            for char in word:
+                node = node.children.setdefault(char, cls())
+            node.word = word
+            if weights is not None:
+                node.weight = weights.get(word, 0.0)
+        root._set_steps()
+        return root
+
+    def _set_steps(self) -> float:
+        self.step = self.weight / len(self.word) if self.word else 0.0
+        for child in self.children.values():
+            self.step = max(self.step, child._set_steps())
+        return self.step
+
+
+class _Beam:
+    """Prefix beam search hypothesis."""
+
+    __slots__ = ("p_b", "p_nb", "text_score", "last", "words", "partial", "lex_node", "hot_node", "hot_bonus")
+
+    def __init__(self, text_score=0.0, last=-1, words=(), partial="", lex_node=None, hot_node=None, hot_bonus=0.0):
+        self.p_b = NEG_INF
+        self.p_nb = NEG_INF
+        # LM, word insertion and hotword score accumulated for this prefix
+        self.text_score = text_score
+        self.last = last
+        self.words = words
+        self.partial = partial
+        self.lex_node = lex_node
+        self.hot_node = hot_node
+        self.hot_bonus = hot_bonus
+
+    def total(self) -> float:
+        return _logaddexp(self.p_b, self.p_nb)
+
+
+class CTCBeamSearchDecoder:
+    """
+    CTC prefix beam search with optional n-gram LM, lexicon and hotword boosting.
+
+    Per-frame token candidates are pruned up front with vectorized numpy
+    (top-k plus a log-probability floor), and runs of frames where blank
+    dominates only advance existing prefixes, in closed form for long runs.
+    Python work is therefore proportional to emitted characters, not frames.
+    """
+
+    # Blank runs longer than this use the vectorized closed form instead of a frame loop
+    CLOSED_FORM_MIN_RUN = 8
+
+    def __init__(
+        self,
+        vocab: Sequence[str],
+        beam_width: int = 8,
+        top_k: int = 8,
+        token_min_logp: float = -5.0,
+        beam_prune_logp: float = -10.0,
+        blank_skip_threshold: float = 0.999,
+        lm: Optional[NGramLM] = None,
+        lm_unit: str = "word",
+        alpha: float = 0.5,
+        beta: float = 1.0,
+        lexicon: Optional[Iterable[str]] = None,
+        hotwords: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the decoder.
+
+        Args:
+            vocab (list): Token strings ordered by id (see ``load_vocab``).
+            beam_width (int): Number of prefixes kept per frame.
+            top_k (int): Max candidate tokens expanded per frame.
+            token_min_logp (float): Tokens with lower log-probability are never expanded.
+            beam_prune_logp (float): Prefixes scoring this far below the best one are dropped.
+            blank_skip_threshold (float): Blank probability above which a frame is not expanded.
+            lm (NGramLM, optional): Language model for shallow fusion.
+            lm_unit (str): ``word`` or ``char`` - the unit the LM was trained on.
+            alpha (float): LM weight.
+            beta (float): Word insertion bonus.
+            lexicon (iterable, optional): Allowed words; hypotheses leaving the lexicon are pruned.
+            hotwords (dict, optional): Word -> log-score boost for domain vocabulary.
+        """
+        if lm_unit not in ("word", "char"):
+            raise ValueError(f"lm_unit must be 'word' or 'char', got {lm_unit!r}")
+
+        self.vocab = list(vocab)
+        self.beam_width = beam_width
+        self.top_k = min(top_k, len(self.vocab))
+        self.token_min_logp = token_min_logp
+        self.beam_prune_logp = beam_prune_logp
+        self.blank_skip_logp = math.log(blank_skip_threshold)
+        self.lm = lm
+        self.lm_unit = lm_unit
+        self.alpha = alpha
+        self.beta = beta
+        self.lexicon = None
+        if lexicon is not None:
+            # Materialize once: the trie and fingerprint() both read it, and it may be a generator
+            lexicon = [word for word in (word.strip().upper() for word in lexicon) if word]
+            self.lexicon = Trie.from_words(lexicon)
+        self.hotwords = None
+        if hotwords:
+            hotwords = {word.strip().upper(): weight for word, weight in hotwords.items()}
+            self.hotwords = Trie.from_words(hotwords, hotwords)
+        # Raw settings behind the tries, for fingerprint()
+        self._lexicon_words = sorted(set(lexicon)) if lexicon is not None else None
+        self._hotword_weights = sorted(hotwords.items()) if hotwords else None
+        self._fingerprint: Optional[str] = None
+
+        self.blank_id = self.vocab.index(BLANK_TOKEN) if BLANK_TOKEN in self.vocab else 0
+        # Characters per token id; None for blank/special tokens that never enter the text
+        self._chars: List[Optional[str]] = []
+        for token in self.vocab:
+            if token == WORD_DELIMITER:
+                self._chars.append(" ")
+            elif token.startswith("<") and token.endswith(">"):
+                self._chars.append(None)
+            else:
+                self._chars.append(token)
+        self._skip = np.array([c is None for c in self._chars])
+
+    def fingerprint(self) -> str:
+        """
+        Stable digest of every setting that can change the decoded text.
+
+        Used to key cached transcripts; computed once (hashing a large LM is not free).
+
+        Returns:
+            str: Hex digest.
+        """
+        if self._fingerprint is None:
+            h = hashlib.blake2b(digest_size=16)
+            h.update(repr((
+                self.vocab, self.beam_width, self.top_k, self.token_min_logp, self.beam_prune_logp,
+                self.blank_skip_logp, self.lm_unit, self.alpha, self.beta,
+                self._lexicon_words, self._hotword_weights,
+            )).encode("utf-8"))
+            if self.lm is not None:
+                h.update(repr((self.lm.order, sorted(self.lm._ngrams.items()))).encode("utf-8"))
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    @classmethod
+    def from_pretrained(cls, model_path: str, lm_path: Optional[str] = None, **kwargs) -> "CTCBeamSearchDecoder":
+        """
+        Build a decoder for an exported model directory.
+
+        Args:
+            model_path (str): Model directory containing ``vocab.json``.
+            lm_path (str, optional): ARPA file to load as the LM.
+            **kwargs: Passed to the constructor.
+
+        Returns:
+            CTCBeamSearchDecoder: The decoder.
+        """
+        if lm_path is not None:
+            kwargs["lm"] = NGramLM.from_arpa(lm_path)
+        return cls(load_vocab(model_path), **kwargs)
+
+    def decode(self, logits: np.ndarray) -> str:
+        """
+        Decode one utterance.
+
+        Args:
+            logits (np.ndarray): Logits (or log-probs) of shape [frames, vocab].
+
+        Returns:
+            str: Best hypothesis.
+        """
+        log_probs = log_softmax(np.asarray(logits, dtype=np.float32))
+        num_frames = log_probs.shape[0]
+        if num_frames == 0:
+            return ""
+
+        # Vectorized candidate pruning: only frames where blank does not dominate
+        # are considered, then top-k plus a log-prob floor per frame
+        blank_logp = log_probs[:, self.blank_id]
+        open_frames = np.flatnonzero(blank_logp < self.blank_skip_logp)
+        pruned = log_probs[open_frames]
+        pruned[:, self._skip] = NEG_INF
+        if self.top_k < pruned.shape[1]:
+            candidates = np.argpartition(-pruned, self.top_k - 1, axis=1)[:, :self.top_k]
+        else:
+            candidates = np.broadcast_to(np.arange(pruned.shape[1]), pruned.shape)
+        candidate_logp = np.take_along_axis(pruned, candidates, axis=1)
+        keep_mask = candidate_logp > self.token_min_logp
+        viable = keep_mask.any(axis=1)
+
+        # Convert once up front: per-frame numpy indexing would dominate the Python loop
+        expand_frames = open_frames[viable]
+        expand_tokens = candidates[viable].tolist()
+        expand_logps = np.where(keep_mask[viable], candidate_logp[viable], NEG_INF).tolist()
+        rows = log_probs.tolist()
+        blanks = blank_logp.tolist()
+
+        root = _Beam(lex_node=self.lexicon, hot_node=self.hotwords)
+        root.p_b = 0.0
+        beams = {"": root}
+
+        t = 0
+        for i, next_expand in enumerate(expand_frames.tolist() + [num_frames]):
+            if next_expand - t > self.CLOSED_FORM_MIN_RUN:
+                # Long blank-dominated run: advance existing prefixes over all of it at once
+                self._advance_run(beams, log_probs[t:next_expand], blank_logp[t:next_expand])
+            else:
+                for frame, lp_blank in zip(rows[t:next_expand], blanks[t:next_expand]):
+                    for beam in beams.values():
+                        p_nb = beam.p_nb + frame[beam.last] if beam.last >= 0 else NEG_INF
+                        beam.p_b = _logaddexp(beam.p_b, beam.p_nb) + lp_blank
+                        beam.p_nb = p_nb
+            t = next_expand
+            if t == num_frames:
+                break
+
+            lp_blank = blanks[t]
+            frame = rows[t]
+            frame_candidates = [(token, lp) for token, lp in zip(expand_tokens[i], expand_logps[i]) if lp != NEG_INF]
+
+            next_beams: Dict[str, _Beam] = {}
+            for prefix, beam in beams.items():
+                p_b, p_nb, last = beam.p_b, beam.p_nb, beam.last
+                total = _logaddexp(p_b, p_nb)
+
+                # Blank or repeated last token keep the prefix unchanged
+                stay_b = total + lp_blank
+                stay_nb = p_nb + frame[last] if last >= 0 else NEG_INF
+                same = next_beams.get(prefix)
+                if same is None:
+                    # First to reach this prefix: reuse the hypothesis object in place
+                    beam.p_b, beam.p_nb = stay_b, stay_nb
+                    same = next_beams[prefix] = beam
+                else:
+                    same.p_b = _logaddexp(same.p_b, stay_b)
+                    same.p_nb = _logaddexp(same.p_nb, stay_nb)
+
+                for token, lp in frame_candidates:
+                    char = self._chars[token]
+                    # Repeat only extends after a blank
+                    source = (p_b if token == last else total) + lp
+
+                    if char == " " and (not prefix or prefix[-1] == " "):
+                        # Leading/double delimiters do not change the text
+                        same.p_b = _logaddexp(same.p_b, source)
+                        continue
+
+                    new_prefix = prefix + char
+                    extended = next_beams.get(new_prefix)
+                    if extended is None:
+                        extended = self._extend(beam, prefix, char, token)
+                        if extended is None:
+                            continue
+                        next_beams[new_prefix] = extended
+                    extended.p_nb = _logaddexp(extended.p_nb, source)
+
+            scored = [(_logaddexp(beam.p_b, beam.p_nb) + beam.text_score, prefix, beam)
+                      for prefix, beam in next_beams.items()]
+            if len(scored) > self.beam_width:
+                scored = heapq.nlargest(self.beam_width, scored, key=lambda item: item[0])
+            floor = max(item[0] for item in scored) + self.beam_prune_logp
+            beams = {prefix: beam for score, prefix, beam in scored if score >= floor}
+            t += 1
+
+        best_text, best_score = "", NEG_INF
+        for prefix, beam in beams.items():
+            final_score = self._finalize(beam)
+            if final_score is None:
+                continue
+            score = beam.total() + final_score
+            if score > best_score:
+                best_text, best_score = prefix, score
+        return best_text.strip()
+
+    @staticmethod
+    def _advance_run(beams: Dict[str, _Beam], run_log_probs: np.ndarray, run_blank: np.ndarray):
+        """
+        Apply a run of non-expanded frames to every prefix in closed form.
+
+        Within the run a prefix can only stay put: via blank (into p_b) or by
+        repeating its last token (p_nb). In the linear domain
+        ``P_b[K] = P_b[0] * prod(B) + sum_j P_nb[j-1] * prod(B[j:])`` and
+        ``P_nb[K] = P_nb[0] * prod(R)``, which is evaluated for all prefixes
+        and frames with a few cumulative sums instead of a Python loop per frame.
+        """
+        beam_list = list(beams.values())
+        lasts = np.array([beam.last for beam in beam_list])
+        p_b = np.array([beam.p_b for beam in beam_list])
+        p_nb = np.array([beam.p_nb for beam in beam_list])
+
+        # Log-prob of repeating each prefix's last token, -inf for the empty prefix
+        repeat = run_log_probs[:, np.maximum(lasts, 0)].T
+        repeat[lasts < 0] = NEG_INF
+        cum_repeat = np.cumsum(repeat, axis=1)
+        cum_blank = np.cumsum(run_blank)
+
+        # p_nb just before frame j, and total blank log-prob from frame j to the end
+        nb_before = p_nb[:, None] + np.concatenate([np.zeros((len(beam_list), 1)), cum_repeat[:, :-1]], axis=1)
+        blank_suffix = cum_blank[-1] - np.concatenate([[0.0], cum_blank[:-1]])
+
+        new_p_b = np.logaddexp(p_b + cum_blank[-1], np.logaddexp.reduce(nb_before + blank_suffix, axis=1))
+        new_p_nb = p_nb + cum_repeat[:, -1]
+        for beam, b, nb in zip(beam_list, new_p_b.tolist(), new_p_nb.tolist()):
+            beam.p_b = b
+            beam.p_nb = nb
+
+    def _extend(self, beam: _Beam, prefix: str, char: str, token: int) -> Optional[_Beam]:
+        """Create the hypothesis for ``beam`` + ``char``; None if the lexicon forbids it."""
+        text_score = beam.text_score
+        words, partial = beam.words, beam.partial
+        lex_node, hot_node, hot_bonus = beam.lex_node, beam.hot_node, beam.hot_bonus
+
+        if char == " ":
+            word_score = self._word_end_score(beam)
+            if word_score is None:
+                return None
+            text_score += word_score
+            words = words + (partial,)
+            partial = ""
+            lex_node, hot_node, hot_bonus = self.lexicon, self.hotwords, 0.0
+        else:
+            if lex_node is not None:
+                lex_node = lex_node.children.get(char)
+                if lex_node is None:
+                    return None
+            # Hotword prefixes earn their boost progressively so the beam keeps them alive
+            if hot_node is not None:
+                hot_node = hot_node.children.get(char)
+                if hot_node is None:
+                    text_score -= hot_bonus
+                    hot_bonus = 0.0
+                else:
+                    text_score += hot_node.step
+                    hot_bonus += hot_node.step
+            partial = partial + char
+
+        if self.lm is not None and self.lm_unit == "char":
+            history = prefix[len(prefix) - self.lm.order + 1:] if self.lm.order > 1 else ""
+            text_score += self.alpha * self.lm.score(
+                [WORD_DELIMITER if c == " " else c for c in history], WORD_DELIMITER if char == " " else char
+            )
+
+        return _Beam(text_score, token, words, partial, lex_node, hot_node, hot_bonus)
+
+    def _word_end_score(self, beam: _Beam) -> Optional[float]:
+        """Score for completing ``beam.partial`` as a word; None if the lexicon rejects it."""
+        if not beam.partial:
+            return 0.0
+        if self.lexicon is not None and (beam.lex_node is None or beam.lex_node.word is None):
+            return None
+        score = self.beta
+        if self.lm is not None and self.lm_unit == "word":
+            score += self.alpha * self.lm.score(("<s>",) + beam.words, beam.partial)
+        if beam.hot_node is None or beam.hot_node.word is None:
+            # Prefix matched a hotword but the word did not complete it
+            score -= beam.hot_bonus
+        else:
+            score += beam.hot_node.weight - beam.hot_bonus
+        return score
+
+    def _finalize(self, beam: _Beam) -> Optional[float]:
+        """Close the trailing partial word and add the end-of-sentence LM score."""
+        word_score = self._word_end_score(beam)
+        if word_score is None:
+            return None
+        score = beam.text_score + word_score
+        if self.lm is not None and self.lm_unit == "word":
+            words = beam.words + ((beam.partial,) if beam.partial else ())
+            score += self.alpha * self.lm.score(("<s>",) + words, "</s>")
+        return score
@@ -0,0 +1,177 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .utils import SAMPLE_RATE
+
+
+class _Engine:
+    """A loaded Transcriber plus the requests currently running on it."""
+    __slots__ = ("transcriber", "in_flight", "retired", "released")
+
+    def __init__(self, transcriber):
+        self.transcriber = transcriber
+        self.in_flight = 0
+        self.retired = False
+        self.released = threading.Event()
+
+
+class HotSwapTranscriber:
+    """
+    A Transcriber whose model can be replaced while it keeps serving.
+
+    ``reload`` builds the replacement in a background thread (load, reshape
+    and compile all happen there) and warms it up while the current engine
+    keeps answering. Then new requests are switched over in one step under
+    a lock. Requests already running finish on the old engine, which is
+    released when the last of them returns. A failed reload leaves the
+    current engine in place.
+
+    Everything else (``model_path``, ``device``, ``get_logits`` ...) is
+    forwarded to the current engine, so it can stand in for a Transcriber
+    in StreamingTranscriber, SessionManager or TranscriptionDaemon.
+    """
+
+    def __init__(self, transcriber, factory: Optional[Callable] = None):
+        """
+        Args:
+            transcriber (Transcriber): The engine to serve with initially.
+            factory (callable, optional): Builds a replacement from ``reload``'s
+                arguments. Defaults to ``Transcriber``.
+        """
+        if factory is None:
+            from .core import Transcriber
+            factory = Transcriber
+        self.factory = factory
+        self._engine = _Engine(transcriber)
+        self._lock = threading.Lock()
+        self._reloading: Optional[Future] = None
+        # Retired engines still finishing requests
+        self._draining = set()
+        self.swaps = 0
+        # Seconds spent building and warming up the last replacement
+        self.last_load_s = 0.0
+        self.last_warmup_s = 0.0
+
+    @property
+    def current(self):
+        """The Transcriber new requests go to."""
+        return self._engine.transcriber
+
+    @property
+    def reloading(self) -> bool:
+        return self._reloading is not None and not self._reloading.done()
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined here
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.current, name)
+
+    def transcribe(self, audio_chunk: np.ndarray, speech_probs: np.ndarray = None, return_result: bool = False):
+        """Transcribe on the current engine (see Transcriber.transcribe)."""
+        if return_result:
+            return self._call("transcribe", audio_chunk, speech_probs, return_result=True)
+        return self._call("transcribe", audio_chunk, speech_probs)
+
+    def transcribe_batch(self, audio_chunks: list, speech_probs: list = None) -> list:
+        """Batched transcription on the current engine (see Transcriber.transcribe_batch)."""
+        return self._call("transcribe_batch", audio_chunks, speech_probs)
+
+    def get_logits(self, audio_chunk: np.ndarray):
+        """Acoustic model only, on the current engine (see Transcriber.get_logits)."""
+        return self._call("get_logits", audio_chunk)
+
+    def get_logits_batch(self, audio_chunks: list) -> list:
+        """Batched acoustic model, on the current engine (see Transcriber.get_logits_batch)."""
+        return self._call("get_logits_batch", audio_chunks)
+
+    def reload(self, model_path: Optional[str] = None, warmup: bool = True, **kwargs) -> Future:
+        """
+        Build a replacement engine in the background and switch to it when ready.
+
+        Args:
+            model_path (str, optional): Model to load. Defaults to the current model
+                (e.g. to pick up a re-exported IR).
+            warmup (bool): Run two 1s inferences on the new engine before switching,
+                so the first real request does not pay one-off costs.
+            **kwargs: Passed to the factory. ``device`` defaults to the current device.
+
+        Returns:
+            Future: Resolves to the new Transcriber once requests go to it, or to the
+                load error (the current engine keeps serving).
+        """
+        with self._lock:
+            if self.reloading:
+                raise RuntimeError("A reload is already in progress")
+            future = Future()
+            self._reloading = future
+        kwargs.setdefault("device", self.current.device)
+        model_path = model_path or self.current.model_path
+        threading.Thread(target=self._build, args=(future, model_path, warmup, kwargs), daemon=True).start()
+        return future
+
+    def stats(self) -> Dict:
+        """Swaps done, whether one is in progress, and the last load/warmup times."""
+        return {
+            "swaps": self.swaps,
+            "reloading": self.reloading,
+            "model_path": self.current.model_path,
+            "in_flight": self._engine.in_flight,
+            "draining": len(self._draining),
+            "last_load_s": self.last_load_s,
+            "last_warmup_s": self.last_warmup_s,
+        }
+
+    def _call(self, method: str, *args, **kwargs):
+        with self._lock:
+            engine = self._engine
+            engine.in_flight += 1
+        try:
+            return getattr(engine.transcriber, method)(*args, **kwargs)
+        finally:
+            with self._lock:
+                engine.in_flight -= 1
+                drained = engine.retired and engine.in_flight == 0
+            if drained:
+                self._release(engine)
+
+    def _build(self, future: Future, model_path: str, warmup: bool, kwargs: Dict):
+        try:
+            start = time.perf_counter()
+            transcriber = self.factory(model_path=model_path, **kwargs)
+            self.last_load_s = time.perf_counter() - start
+            if warmup:
+                start = time.perf_counter()
+                # get_logits always reaches the model; transcribe() returns early on silence when trimming
+                audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+                transcriber.get_logits(audio)
+                transcriber.get_logits(audio)
+                self.last_warmup_s = time.perf_counter() - start
+        except Exception as e:
+            print(f"Reload of {model_path} failed, keeping {self.current.model_path}: {e}")
+            future.set_exception(e)
+            return
+
+        with self._lock:
+            old = self._engine
+            self._engine = _Engine(transcriber)
+            old.retired = True
+            drained = old.in_flight == 0
+            if not drained:
+                self._draining.add(old)
+            self.swaps += 1
+        print(f"Switched to {model_path} (load {self.last_load_s:.1f}s, warmup {self.last_warmup_s:.2f}s)")
+        if drained:
+            self._release(old)
+        future.set_result(transcriber)
+
+    def _release(self, engine: _Engine):
+        """Drop the last reference to a drained engine so its compiled model is freed."""
+        with self._lock:
+            self._draining.discard(engine)
+        engine.transcriber = None
+        engine.released.set()
@@ -0,0 +1,173 @@
+import time
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from .utils import BLOCK_SIZE, SAMPLE_RATE
+
+IDLE_AFTER_S = 30.0  # Quiet time before parking the VAD
+CHECK_INTERVAL_S = 0.25  # Energy check period while idle
+THRESHOLD_DB = -50.0  # Lowest wake level (dBFS)
+MARGIN_DB = 10.0  # Wake level above the tracked noise floor
+PREROLL_S = 0.5  # Audio before the energy onset handed back to the VAD
+
+
+def block_levels_db(audio: np.ndarray, block_size: int = BLOCK_SIZE) -> np.ndarray:
+    """
+    RMS level of each block in dBFS.
+
+    Args:
+        audio (np.ndarray): Float32 mono samples, a whole number of blocks.
+        block_size (int): Samples per block.
+
+    Returns:
+        np.ndarray: One level per block (-100 dB for digital silence).
+    """
+    blocks = audio.reshape(-1, block_size)
+    mean_square = np.einsum("ij,ij->i", blocks, blocks) / block_size
+    return 10 * np.log10(mean_square + 1e-10)
+
+
+class IdleMonitor:
+    """
+    Parks the neural VAD and the inference engine during long quiet periods.
+
+    While active, the caller runs the VAD per block as usual and reports each
+    block to ``observe``. After ``idle_after_s`` without speech the monitor
+    goes idle. The caller then stops running the VAD and instead calls
+    ``poll`` every ``check_interval_s``. ``poll`` measures the RMS level of
+    each block captured since the last poll (one vectorized pass, no model)
+    and skips the ring past them. When a block rises above the wake level, the
+    ring is moved back to ``preroll_s`` before it. The VAD then re-reads the
+    onset, and nothing said while idle is lost. ``on_wake`` runs at that
+    point, to pre-warm the engine before the utterance needs it.
+
+    The wake level is the higher of ``threshold_db`` and the noise floor
+    (measured at the first check, then tracked from quiet checks) plus
+    ``margin_db``.
+    """
+    ACTIVE = "active"
+    IDLE = "idle"
+
+    def __init__(self, idle_after_s: float = IDLE_AFTER_S, check_interval_s: float = CHECK_INTERVAL_S,
+                 threshold_db: float = THRESHOLD_DB, margin_db: float = MARGIN_DB, preroll_s: float = PREROLL_S,
+                 on_wake: Optional[Callable] = None, sample_rate: int = SAMPLE_RATE, block_size: int = BLOCK_SIZE):
+        """
+        Args:
+            idle_after_s (float): Seconds without speech before going idle.
+            check_interval_s (float): How often ``poll`` should be called while idle.
+            threshold_db (float): Lowest level (dBFS) that wakes the monitor.
+            margin_db (float): Wake level above the noise floor.
+            preroll_s (float): Audio before the onset that the VAD re-reads on wake.
+            on_wake (callable, optional): Called with no arguments on wake (e.g. an engine warm-up).
+            sample_rate (int): Sample rate of the audio.
+            block_size (int): Samples per VAD block.
+        """
+        self.idle_after_s = idle_after_s
+        self.check_interval_s = check_interval_s
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.on_wake = on_wake
+        self.sample_rate = sample_rate
+        self.block_size = block_size
+        self.preroll_samples = int(preroll_s * sample_rate) // block_size * block_size
+        self.idle_after_samples = int(idle_after_s * sample_rate)
+
+        self.state = self.ACTIVE
+        self.noise_floor_db: Optional[float] = None
+        self._quiet_samples = 0
+        self._buffer = np.empty(0, dtype=np.float32)
+        # Counters
+        self.idle_periods = 0
+        self.wakeups = 0
+        self.checks = 0
+        self.idle_samples = 0
+        self.last_prewarm_s = 0.0
+
+    @property
+    def is_idle(self) -> bool:
+        return self.state == self.IDLE
+
+    @property
+    def wake_level_db(self) -> float:
+        if self.noise_floor_db is None:
+            return self.threshold_db
+        return max(self.threshold_db, self.noise_floor_db + self.margin_db)
+
+    def observe(self, speech: bool, num_samples: int = BLOCK_SIZE) -> bool:
+        """
+        Record one VAD decision while active.
+
+        Args:
+            speech (bool): Whether the block was speech (or part of an open utterance).
+            num_samples (int): Samples the decision covered.
+
+        Returns:
+            bool: True if this block completed the quiet period and the monitor went idle.
+        """
+        if speech:
+            self._quiet_samples = 0
+            return False
+        self._quiet_samples += num_samples
+        if self.state == self.ACTIVE and self._quiet_samples >= self.idle_after_samples:
+            self.state = self.IDLE
+            self.idle_periods += 1
+            return True
+        return False
+
+    def poll(self, ring) -> Optional[int]:
+        """
+        Energy check over the blocks captured since the last call, while idle.
+
+        Args:
+            ring (CaptureRing): Mono capture ring. Its read position is moved past the
+                checked audio, or back to the pre-roll on wake.
+
+        Returns:
+            int or None: On wake, the ring position the VAD resumes from; otherwise None.
+        """
+        start = max(ring.read_position, ring.oldest_position)
+        num_samples = (ring.write_position - start) // self.block_size * self.block_size
+        if num_samples == 0:
+            return None
+        if len(self._buffer) < num_samples:
+            self._buffer = np.empty(num_samples, dtype=np.float32)
+        audio = ring.get_range(start, start + num_samples, out=self._buffer)
+        levels = block_levels_db(audio, self.block_size)
+        self.checks += 1
+        self.idle_samples += num_samples
+        if self.noise_floor_db is None:
+            # The first check follows a quiet period confirmed by the VAD: a fair floor estimate
+            self.noise_floor_db = float(np.median(levels))
+
+        loud = np.flatnonzero(levels > self.wake_level_db)
+        if len(loud) == 0:
+            # Track the floor slowly, so a gradual rise is not absorbed into it
+            self.noise_floor_db = 0.9 * self.noise_floor_db + 0.1 * float(np.median(levels))
+            ring.seek(start + num_samples)
+            return None
+
+        onset = start + int(loud[0]) * self.block_size
+        resume = max(onset - self.preroll_samples, ring.oldest_position)
+        ring.seek(resume)
+        self.state = self.ACTIVE
+        self._quiet_samples = 0
+        self.wakeups += 1
+        if self.on_wake is not None:
+            begin = time.perf_counter()
+            self.on_wake()
+            self.last_prewarm_s = time.perf_counter() - begin
+        return resume
+
+    def stats(self) -> Dict:
+        """State, idle periods, wakeups, energy checks, idle audio seconds and the wake level."""
+        return {
+            "state": self.state,
+            "idle_periods": self.idle_periods,
+            "wakeups": self.wakeups,
+            "checks": self.checks,
+            "idle_s": self.idle_samples / self.sample_rate,
+            "noise_floor_db": self.noise_floor_db,
+            "wake_level_db": self.wake_level_db,
+            "last_prewarm_s": self.last_prewarm_s,
+        }
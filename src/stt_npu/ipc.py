@@ -0,0 +1,455 @@
+import itertools
+import json
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from multiprocessing import shared_memory
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .utils import SAMPLE_RATE
+
+# Used where AF_UNIX is unavailable (older Windows builds of Python)
+DEFAULT_TCP_ADDRESS = ("127.0.0.1", 47600)
+
+Address = Union[str, Tuple[str, int]]
+
+
+def default_address() -> Address:
+    """
+    Control socket address shared by daemon and clients.
+
+    ``STT_NPU_SOCKET`` overrides the default Unix socket path,
+    ``~/.stt_npu/stt.sock``. Without AF_UNIX support, loopback TCP is used.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return DEFAULT_TCP_ADDRESS
+    return os.environ.get("STT_NPU_SOCKET") or os.path.join(os.path.expanduser("~"), ".stt_npu", "stt.sock")
+
+
+def _socket_for(address: Address) -> socket.socket:
+    if isinstance(address, str):
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    return sock
+
+
+def _send(sock: socket.socket, message: Dict, lock: Optional[threading.Lock] = None):
+    data = (json.dumps(message) + "\n").encode("utf-8")
+    if lock is None:
+        sock.sendall(data)
+    else:
+        with lock:
+            sock.sendall(data)
+
+
+def _attach_shm(name: str) -> shared_memory.SharedMemory:
+    """Attach to the daemon's segment without taking ownership of it."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        # On POSIX, attaching registers the segment with this process's resource
+        # tracker, which would unlink it when the client exits
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+    return shm
+
+
+class TranscriptionDaemon:
+    """
+    Local daemon that owns one Transcriber and serves co-located processes.
+
+    On connecting, each client is handed a shared-memory ring of float32
+    samples that the daemon creates for it, then sends small JSON control
+    messages over a Unix socket: where in its ring the audio is and how long
+    it is. The daemon reads the audio straight from shared memory, so audio
+    never crosses the socket, and it only ever reads the segment it handed
+    out. All requests go through a single engine thread, so clients never
+    contend for the NPU.
+
+    Protocol (newline-delimited JSON):
+        -> {"op": "hello", "samples": n}         <- {"op": "ready", "shm": name} or {"error": ...}
+        -> {"op": "transcribe", "id": n, "offset": o, "length": l}
+        <- {"id": n, "text": ..., "inference_ms": ...} or {"id": n, "error": ...}
+        -> {"op": "reload", "id": n, "model": path or null}
+        <- {"id": n, "op": "reloaded", "model": path} or {"id": n, "error": ...}
+
+    ``reload`` needs a HotSwapTranscriber; requests keep being served while
+    the new model loads, and the reply is sent once it has taken over. A
+    client may reload the current model; loading another one is allowed only
+    from under ``model_root``. The Unix socket is created owner-only (0600).
+    """
+
+    def __init__(self, transcriber, address: Optional[Address] = None, model_root: Optional[str] = None,
+                 max_ring_seconds: float = 600.0):
+        """
+        Args:
+            transcriber (Transcriber): The engine to share.
+            address (str or tuple, optional): Socket path, or (host, port). Defaults to ``default_address()``.
+            model_root (str, optional): Directory clients may reload models from. By default clients
+                can only reload the current model.
+            max_ring_seconds (float): Largest shared ring a client may ask for, in seconds of 16kHz audio.
+        """
+        self.transcriber = transcriber
+        self.address = address if address is not None else default_address()
+        self.model_root = os.path.realpath(model_root) if model_root is not None else None
+        self.max_ring_samples = int(max_ring_seconds * SAMPLE_RATE)
+        self.requests_served = 0
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._sock = None
+        self._running = False
+        self._engine = threading.Thread(target=self._run_engine, daemon=True)
+
+    def start(self):
+        """Bind the control socket and serve in background threads."""
+        if isinstance(self.address, str):
+            os.makedirs(os.path.dirname(os.path.abspath(self.address)), mode=0o700, exist_ok=True)
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+        self._sock = _socket_for(self.address)
+        if not isinstance(self.address, str):
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(self.address)
+        if isinstance(self.address, str):
+            # Owner only, before anyone can connect
+            os.chmod(self.address, 0o600)
+        self._sock.listen()
+        self._running = True
+        self._engine.start()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        print(f"Transcription daemon listening on {self.address}")
+
+    def serve_forever(self):
+        """Start and block until interrupted."""
+        self.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            print("\nStopping...")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop accepting clients and shut down the engine thread."""
+        self._running = False
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._engine.is_alive():
+            self._jobs.put(None)
+            self._engine.join()
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _accept_loop(self):
+        while self._running:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+
+    def _handle_client(self, conn: socket.socket):
+        send_lock = threading.Lock()
+        shm = None
+        capacity = 0
+        pending = []
+        try:
+            for line in conn.makefile("rb"):
+                message = json.loads(line)
+                if message["op"] == "hello":
+                    samples = message.get("samples")
+                    if shm is not None:
+                        _send(conn, {"error": "Ring already allocated"}, send_lock)
+                    elif not isinstance(samples, int) or not 0 < samples <= self.max_ring_samples:
+                        _send(conn, {"error": f"Ring must be 1 to {self.max_ring_samples} samples"}, send_lock)
+                    else:
+                        shm = shared_memory.SharedMemory(create=True, size=samples * 4)
+                        capacity = samples
+                        _send(conn, {"op": "ready", "shm": shm.name}, send_lock)
+                elif message["op"] == "transcribe":
+                    offset, length = message.get("offset"), message.get("length")
+                    if (shm is None or not isinstance(offset, int) or not isinstance(length, int)
+                            or offset < 0 or length < 0 or offset + length > capacity):
+                        _send(conn, {"id": message["id"], "error": "ValueError: Request outside the shared ring"},
+                              send_lock)
+                        continue
+                    done = threading.Event()
+                    pending = [event for event in pending if not event.is_set()]
+                    pending.append(done)
+                    self._jobs.put((conn, send_lock, shm, message, done))
+                elif message["op"] == "reload":
+                    self._reload(conn, send_lock, message)
+        except (OSError, ValueError):
+            pass
+        finally:
+            # Keep the segment mapped until the engine is done with this client's requests
+            for event in pending:
+                event.wait()
+            conn.close()
+            if shm is not None:
+                shm.unlink()
+                try:
+                    shm.close()
+                except BufferError:
+                    # A view is still referenced somewhere; the mapping goes away with it
+                    pass
+
+    def _reload(self, conn: socket.socket, send_lock: threading.Lock, message: Dict):
+        def reply(future):
+            try:
+                response = {"id": message["id"], "op": "reloaded", "model": future.result().model_path}
+            except Exception as e:
+                response = {"id": message["id"], "error": f"{type(e).__name__}: {e}"}
+            try:
+                _send(conn, response, send_lock)
+            except OSError:
+                pass
+
+        model = message.get("model")
+        error = None
+        if not hasattr(self.transcriber, "reload"):
+            error = RuntimeError("Daemon engine does not support reload")
+        elif model is not None and not self._reload_allowed(model):
+            error = PermissionError(f"Reloading {model!r} is not allowed: the daemon only loads models under "
+                                    f"its model root ({self.model_root or 'none set'})")
+        if error is not None:
+            reply_future = Future()
+            reply_future.set_exception(error)
+            reply(reply_future)
+            return
+        try:
+            future = self.transcriber.reload(model)
+        except RuntimeError as e:
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(reply)
+
+    def _reload_allowed(self, model: str) -> bool:
+        """Whether ``model`` resolves to a path under the model root."""
+        if self.model_root is None or not isinstance(model, str):
+            return False
+        path = os.path.realpath(model)
+        return os.path.commonpath([path, self.model_root]) == self.model_root
+
+    def _run_engine(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            conn, send_lock, shm, message, done = job
+            reply = {"id": message["id"]}
+            audio = None
+            try:
+                audio = np.ndarray((message["length"],), dtype=np.float32, buffer=shm.buf,
+                                   offset=message["offset"] * 4)
+                start = time.perf_counter()
+                reply["text"] = self.transcriber.transcribe(audio) if len(audio) > 0 else ""
+                reply["inference_ms"] = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                reply["error"] = f"{type(e).__name__}: {e}"
+            finally:
+                # Release the shared-memory view before the segment can be closed
+                del audio
+            self.requests_served += 1
+            try:
+                _send(conn, reply, send_lock)
+            except OSError:
+                pass
+            done.set()
+
+
+class TranscriptionClient:
+    """
+    Client for a TranscriptionDaemon: submit audio, get futures back.
+
+    Audio is copied once into a shared-memory ring the daemon created for
+    this connection; only offsets travel over the socket. Ring space is reused as replies
+    arrive, and ``submit`` blocks while the ring is full.
+    """
+
+    def __init__(self, address: Optional[Address] = None, ring_seconds: float = 120.0, timeout: float = 5.0):
+        """
+        Args:
+            address (str or tuple, optional): Daemon socket. Defaults to ``default_address()``.
+            ring_seconds (float): Shared ring capacity in seconds of 16kHz audio
+                (bounds the audio in flight; no single request may exceed it).
+            timeout (float): Seconds to wait for the daemon to accept the connection.
+        """
+        self.address = address if address is not None else default_address()
+        self.capacity = int(ring_seconds * SAMPLE_RATE)
+        self._shm = None
+        self._ring = None
+
+        self._ids = itertools.count()
+        self._futures: Dict[int, Future] = {}
+        # (id, start, end) of regions the daemon has not answered yet, oldest first
+        self._in_flight = deque()
+        self._answered = set()
+        # Requests (e.g. reload) that hold no ring space
+        self._control_ids = set()
+        self._head = 0
+        self._space = threading.Condition()
+        self._send_lock = threading.Lock()
+
+        self._sock = _socket_for(self.address)
+        self._sock.settimeout(timeout)
+        try:
+            self._sock.connect(self.address)
+            self._reader = self._sock.makefile("rb")
+            _send(self._sock, {"op": "hello", "samples": self.capacity})
+            reply = json.loads(self._reader.readline())
+            if reply.get("op") != "ready":
+                raise ConnectionError(f"Daemon did not allocate the shared-memory ring: {reply.get('error')}")
+            self._shm = _attach_shm(reply["shm"])
+            self._ring = np.ndarray((self.capacity,), dtype=np.float32, buffer=self._shm.buf)
+        except Exception:
+            self._sock.close()
+            self._release_shm()
+            raise
+        self._sock.settimeout(None)
+        self._closed = False
+        self._receiver = threading.Thread(target=self._receive_loop, daemon=True)
+        self._receiver.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def submit(self, audio_chunk: np.ndarray) -> Future:
+        """
+        Send audio for transcription.
+
+        Args:
+            audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+
+        Returns:
+            Future: Resolves to the transcribed text.
+        """
+        n = len(audio_chunk)
+        if n > self.capacity:
+            raise ValueError(f"Chunk of {n} samples exceeds the {self.capacity}-sample ring")
+        if self._closed:
+            raise RuntimeError("Client is closed")
+
+        future = Future()
+        with self._space:
+            start = self._reserve(n)
+            while start is None:
+                self._space.wait()
+                if self._closed:
+                    raise RuntimeError("Client is closed")
+                start = self._reserve(n)
+            request_id = next(self._ids)
+            self._ring[start:start + n] = audio_chunk
+            self._in_flight.append((request_id, start, start + n))
+            self._head = start + n
+            self._futures[request_id] = future
+        _send(self._sock, {"op": "transcribe", "id": request_id, "offset": start, "length": n}, self._send_lock)
+        return future
+
+    def transcribe(self, audio_chunk: np.ndarray) -> str:
+        """Submit and wait for the text."""
+        return self.submit(audio_chunk).result()
+
+    def reload(self, model_path: Optional[str] = None) -> Future:
+        """
+        Ask the daemon to hot-swap its model; requests keep being served meanwhile.
+
+        Args:
+            model_path (str, optional): Model directory on the daemon's machine.
+                Defaults to reloading the current one.
+
+        Returns:
+            Future: Resolves to the loaded model path once it serves new requests.
+        """
+        if self._closed:
+            raise RuntimeError("Client is closed")
+        future = Future()
+        with self._space:
+            request_id = next(self._ids)
+            self._futures[request_id] = future
+            self._control_ids.add(request_id)
+        _send(self._sock, {"op": "reload", "id": request_id, "model": model_path}, self._send_lock)
+        return future
+
+    def close(self):
+        """Disconnect and unmap the shared-memory ring."""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+        self._receiver.join()
+        with self._space:
+            self._space.notify_all()
+        for future in self._futures.values():
+            future.set_exception(ConnectionError("Client closed"))
+        self._futures.clear()
+        self._release_shm()
+
+    def _reserve(self, n: int) -> Optional[int]:
+        """Start of a free contiguous region of n samples, or None if the ring is full."""
+        if not self._in_flight:
+            return 0
+        tail = self._in_flight[0][1]
+        wrapped = self._in_flight[-1][1] < tail
+        if not wrapped:
+            # Occupied [tail, head): free space at the end, then at the start
+            if self._head + n <= self.capacity:
+                return self._head
+            return 0 if n <= tail else None
+        # Occupied [tail, capacity) and [0, head)
+        return self._head if self._head + n <= tail else None
+
+    def _receive_loop(self):
+        try:
+            for line in self._reader:
+                reply = json.loads(line)
+                if reply["id"] in self._control_ids:
+                    # Control replies hold no ring space
+                    with self._space:
+                        self._control_ids.discard(reply["id"])
+                        future = self._futures.pop(reply["id"])
+                    if "error" in reply:
+                        future.set_exception(RuntimeError(reply["error"]))
+                    else:
+                        future.set_result(reply["model"])
+                    continue
+                with self._space:
+                    future = self._futures.pop(reply["id"])
+                    self._answered.add(reply["id"])
+                    while self._in_flight and self._in_flight[0][0] in self._answered:
+                        self._answered.discard(self._in_flight.popleft()[0])
+                    self._space.notify_all()
+                if "error" in reply:
+                    future.set_exception(RuntimeError(reply["error"]))
+                else:
+                    future.set_result(reply["text"])
+        except (OSError, ValueError):
+            pass
+        with self._space:
+            for future in self._futures.values():
+                future.set_exception(ConnectionError("Daemon disconnected"))
+            self._futures.clear()
+            self._closed = True
+            self._space.notify_all()
+
+    def _release_shm(self):
+        # The daemon unlinks the segment when the connection closes
+        self._ring = None
+        if self._shm is not None:
+            self._shm.close()
@@ -0,0 +1,266 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+import numpy as np
+
+from .decoding import BLANK_TOKEN, NEG_INF, WORD_DELIMITER, load_vocab, log_softmax
+from .utils import FRAME_STRIDE, SAMPLE_RATE
+
+
+class KeywordHit(NamedTuple):
+    """A detected keyword phrase."""
+    keyword: str
+    start_time: float
+    end_time: float
+    confidence: float
+
+
+class KeywordScorer:
+    """
+    Scores a fixed phrase list directly on CTC log-probabilities.
+
+    All phrases are compiled into one concatenated CTC state graph
+    (blank, c1, blank, c2, ..., blank per phrase) and scored together with a
+    vectorized Viterbi forward pass that may start at any frame. For each end
+    frame this gives the best alignment of each phrase ending there; its
+    log-probability divided by the phrase's token count is the confidence.
+    Intervening frames where other characters dominate pull the score down,
+    so letters scattered across unrelated words do not fire.
+    """
+
+    def __init__(self, vocab: Sequence[str], keywords: Union[Iterable[str], Dict[str, float]], threshold: float = 0.5):
+        """
+        Args:
+            vocab (list): Token strings ordered by id.
+            keywords (iterable or dict): Phrases, or phrase -> confidence threshold.
+            threshold (float): Default confidence threshold (0.0 to 1.0).
+        """
+        if not isinstance(keywords, dict):
+            keywords = {keyword: threshold for keyword in keywords}
+        token_ids = {token: idx for idx, token in enumerate(vocab)}
+        self.blank_id = token_ids.get(BLANK_TOKEN, 0)
+
+        self.keywords: List[str] = []
+        thresholds = []
+        labels, keyword_of_state, first_states, final_states = [], [], [], []
+        for keyword, keyword_threshold in keywords.items():
+            phrase = " ".join(keyword.upper().split())
+            chars = [WORD_DELIMITER if c == " " else c for c in phrase]
+            missing = [c for c in chars if c not in token_ids]
+            if not chars or missing:
+                raise ValueError(f"Keyword {keyword!r} has characters outside the vocab: {missing}")
+
+            k = len(self.keywords)
+            offset = len(labels)
+            for char in chars:
+                labels += [self.blank_id, token_ids[char]]
+            labels.append(self.blank_id)
+            keyword_of_state += [k] * (2 * len(chars) + 1)
+            # A fresh alignment may begin in the leading blank or on the first character
+            first_states += [offset, offset + 1]
+            # ...and ends on the last character or the trailing blank
+            final_states.append((offset + 2 * len(chars) - 1, offset + 2 * len(chars)))
+            self.keywords.append(phrase)
+            thresholds.append(keyword_threshold)
+
+        self.labels = np.array(labels)
+        self.thresholds = np.array(thresholds)
+        self.num_tokens = np.array([len(k) for k in self.keywords], dtype=np.float32)
+        keyword_of_state = np.array(keyword_of_state)
+
+        num_states = len(labels)
+        self._can_advance = np.zeros(num_states, dtype=bool)
+        self._can_advance[1:] = keyword_of_state[1:] == keyword_of_state[:-1]
+        # Skipping the blank between two characters is allowed unless they repeat
+        self._can_skip = np.zeros(num_states, dtype=bool)
+        self._can_skip[2:] = (
+            (keyword_of_state[2:] == keyword_of_state[:-2])
+            & (self.labels[2:] != self.blank_id)
+            & (self.labels[2:] != self.labels[:-2])
+        )
+        self._fresh = np.full(num_states, NEG_INF, dtype=np.float32)
+        self._fresh[first_states] = 0.0
+        self._final_states = np.array(final_states)
+
+    @classmethod
+    def from_pretrained(cls, model_path: str, keywords, threshold: float = 0.5) -> "KeywordScorer":
+        """Build a scorer using the vocab of an exported model directory."""
+        return cls(load_vocab(model_path), keywords, threshold)
+
+    def score(self, logits: np.ndarray):
+        """
+        Best alignment score of every phrase ending at every frame.
+
+        Args:
+            logits (np.ndarray): CTC logits of shape [frames, vocab].
+
+        Returns:
+            tuple: (confidence [frames, keywords], start frame [frames, keywords]).
+        """
+        log_probs = log_softmax(np.asarray(logits, dtype=np.float32))
+        emissions = log_probs[:, self.labels]
+        num_frames, num_states = emissions.shape
+
+        confidence = np.zeros((num_frames, len(self.keywords)), dtype=np.float32)
+        starts = np.zeros((num_frames, len(self.keywords)), dtype=np.int64)
+
+        alpha = np.full(num_states, NEG_INF, dtype=np.float32)
+        start = np.zeros(num_states, dtype=np.int64)
+        candidates = np.empty((4, num_states), dtype=np.float32)
+        candidate_starts = np.empty((4, num_states), dtype=np.int64)
+        columns = np.arange(num_states)
+
+        for t in range(num_frames):
+            candidates[0] = alpha
+            candidates[1, 0] = NEG_INF
+            candidates[1, 1:] = alpha[:-1]
+            candidates[1, ~self._can_advance] = NEG_INF
+            candidates[2, :2] = NEG_INF
+            candidates[2, 2:] = alpha[:-2]
+            candidates[2, ~self._can_skip] = NEG_INF
+            candidates[3] = self._fresh
+
+            candidate_starts[0] = start
+            candidate_starts[1, 1:] = start[:-1]
+            candidate_starts[2, 2:] = start[:-2]
+            candidate_starts[3] = t
+
+            best = candidates.argmax(axis=0)
+            alpha = candidates[best, columns] + emissions[t]
+            start = candidate_starts[best, columns]
+
+            final_scores = alpha[self._final_states]
+            which = final_scores.argmax(axis=1)
+            rows = np.arange(len(self.keywords))
+            confidence[t] = final_scores[rows, which]
+            starts[t] = start[self._final_states[rows, which]]
+
+        confidence = np.exp(confidence / self.num_tokens)
+        return confidence, starts
+
+    def detect(self, logits: np.ndarray, time_offset: float = 0.0) -> List[KeywordHit]:
+        """
+        Detect phrases in a logit window: the best-scoring occurrence of each
+        phrase above its threshold.
+
+        Args:
+            logits (np.ndarray): CTC logits of shape [frames, vocab].
+            time_offset (float): Time of the first frame, added to hit times.
+
+        Returns:
+            list: KeywordHit per detected phrase, ordered by end time.
+        """
+        if len(logits) == 0:
+            return []
+        confidence, starts = self.score(logits)
+        frame_duration = FRAME_STRIDE / SAMPLE_RATE
+
+        hits = []
+        best_frames = confidence.argmax(axis=0)
+        for k, t in enumerate(best_frames):
+            conf = float(confidence[t, k])
+            if conf >= self.thresholds[k]:
+                hits.append(KeywordHit(
+                    self.keywords[k],
+                    time_offset + starts[t, k] * frame_duration,
+                    time_offset + (t + 1) * frame_duration,
+                    conf,
+                ))
+        return sorted(hits, key=lambda hit: hit.end_time)
+
+
+class KeywordSpotter:
+    """
+    Sliding-window keyword spotting on top of a Transcriber's CTC logits.
+
+    Audio is fed block by block; every ``hop_s`` seconds the last ``window_s``
+    seconds are run through the acoustic model (no decoding) and scored, so a
+    command fires while the speaker is still talking.
+
+    A transcriber with a static input length (NPU) pads every window to that
+    length, so give the spotter one compiled with ``static_input_length`` set
+    to the window length rather than the 30s transcription shape.
+    """
+
+    def __init__(self, transcriber, keywords, threshold: float = 0.5, window_s: float = 2.0,
+                 hop_s: float = 0.5, vocab: Optional[Sequence[str]] = None):
+        """
+        Args:
+            transcriber (Transcriber): Provides ``get_logits``.
+            keywords (iterable or dict): Phrases, or phrase -> confidence threshold.
+            threshold (float): Default confidence threshold.
+            window_s (float): Audio scored per evaluation (seconds).
+            hop_s (float): Audio between evaluations (seconds).
+            vocab (list, optional): Token strings; read from the transcriber's model dir by default.
+        """
+        self.transcriber = transcriber
+        self.scorer = KeywordScorer(vocab or load_vocab(transcriber.model_path), keywords, threshold)
+        self.window = int(window_s * SAMPLE_RATE)
+        self.hop = int(hop_s * SAMPLE_RATE)
+        static_length = getattr(transcriber, "static_length", None)
+        if isinstance(static_length, int) and static_length > 2 * self.window:
+            print(f"Warning: every {window_s:g}s keyword window is padded to {static_length / SAMPLE_RATE:g}s; "
+                  f"compile the spotter's transcriber with static_input_length={self.window}")
+
+        self._buffer = np.zeros(self.window, dtype=np.float32)
+        self._filled = 0
+        self._since_eval = 0
+        self._samples_seen = 0
+        # Last reported end time per phrase, so overlapping windows do not re-report a hit
+        self._last_hit_end: Dict[str, float] = {}
+
+    def reset(self):
+        """Forget buffered audio (e.g. at the end of an utterance)."""
+        self._filled = 0
+        self._since_eval = 0
+
+    def feed(self, audio_block: np.ndarray, position: Optional[int] = None) -> List[KeywordHit]:
+        """
+        Add audio and evaluate the window if a hop has elapsed.
+
+        Feed every block of an utterance, pauses included, so a phrase
+        spanning a pause is scored on the audio as spoken.
+
+        Args:
+            audio_block (np.ndarray): Audio data (float32), 16kHz.
+            position (int, optional): Stream sample index of the block's first sample (e.g. the
+                capture ring position). Hit times are measured from it, and a block that does not
+                follow on from the previous one starts a fresh window. Defaults to right after the
+                previous block.
+
+        Returns:
+            list: New KeywordHits, with times in seconds of stream time.
+        """
+        if position is not None and position != self._samples_seen:
+            # Gap in the stream: never score audio spliced across it
+            self.reset()
+            self._samples_seen = position
+        n = len(audio_block)
+        if n >= self.window:
+            self._buffer[:] = audio_block[-self.window:]
+        else:
+            self._buffer[:-n] = self._buffer[n:]
+            self._buffer[-n:] = audio_block
+        self._filled = min(self.window, self._filled + n)
+        self._samples_seen += n
+        self._since_eval += n
+
+        if self._since_eval < self.hop:
+            return []
+        self._since_eval = 0
+        return self.evaluate()
+
+    def evaluate(self) -> List[KeywordHit]:
+        """Score the buffered window now and return hits not reported before."""
+        if self._filled == 0:
+            return []
+        audio = self._buffer[self.window - self._filled:]
+        logits = np.asarray(self.transcriber.get_logits(audio)[0])  # torch or numpy (SnapshotTranscriber)
+        window_start = (self._samples_seen - self._filled) / SAMPLE_RATE
+
+        new_hits = []
+        for hit in self.scorer.detect(logits, time_offset=window_start):
+            if hit.start_time < self._last_hit_end.get(hit.keyword, -1.0):
+                continue
+            self._last_hit_end[hit.keyword] = hit.end_time
+            new_hits.append(hit)
+        return new_hits
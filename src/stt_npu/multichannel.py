@@ -0,0 +1,215 @@
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+
+from .utils import SAMPLE_RATE
+
+SILENCE_DURATION_MS = 500  # End an utterance after this much silence
+MAX_SEGMENT_SECONDS = 30  # Force transcription at the model window (ARCH: buffer overflow rule)
+
+
+class Segment(NamedTuple):
+    """A finished utterance from one channel."""
+    channel: int
+    start_time: float
+    end_time: float
+    audio: np.ndarray
+    speech_probs: np.ndarray
+
+
+class ChannelTranscript(NamedTuple):
+    """Transcript of one utterance, tagged by channel and stream time."""
+    channel: int
+    start_time: float
+    end_time: float
+    text: str
+
+
+class ChannelSegmenter:
+    """
+    VAD-driven utterance segmentation for a single channel.
+
+    Mirrors the live loop in scripts/test_npu.py: speech blocks are buffered,
+    trailing silence is kept until SILENCE_DURATION_MS has passed, and the
+    buffer is cut at MAX_SEGMENT_SECONDS. Each channel owns its VAD instance,
+    so Silero's streaming state never mixes between channels.
+    """
+
+    def __init__(self, channel: int, vad, sample_rate: int = SAMPLE_RATE,
+                 silence_duration_ms: int = SILENCE_DURATION_MS, max_segment_s: float = MAX_SEGMENT_SECONDS):
+        """
+        Args:
+            channel (int): Channel index reported on segments.
+            vad (VoiceActivityDetector): This channel's VAD.
+            sample_rate (int): Sample rate of the audio.
+            silence_duration_ms (int): Trailing silence that ends an utterance.
+            max_segment_s (float): Longest utterance before it is cut.
+        """
+        self.channel = channel
+        self.vad = vad
+        self.sample_rate = sample_rate
+        self.silence_duration_ms = silence_duration_ms
+        self.max_segment_samples = int(max_segment_s * sample_rate)
+
+        self.speech_buffer: List[np.ndarray] = []
+        self.speech_probs: List[float] = []
+        self.buffered_samples = 0
+        self.silence_ms = 0.0
+        self.start_time = 0.0
+
+    @property
+    def is_speaking(self) -> bool:
+        return bool(self.speech_buffer)
+
+    def process(self, block: np.ndarray, block_time: float) -> Optional[Segment]:
+        """
+        Feed one block of this channel's audio.
+
+        Args:
+            block (np.ndarray): Mono audio block (float32).
+            block_time (float): Stream time of the block's first sample (seconds).
+
+        Returns:
+            Segment or None: The utterance, once it has ended.
+        """
+        speech_prob = self.vad.speech_probability(block, self.sample_rate)
+        if speech_prob > self.vad.threshold:
+            if not self.is_speaking:
+                self.start_time = block_time
+            self._append(block, speech_prob)
+            self.silence_ms = 0.0
+        elif self.is_speaking:
+            # Include trailing silence context
+            self._append(block, speech_prob)
+            self.silence_ms += len(block) / self.sample_rate * 1000
+            if self.silence_ms >= self.silence_duration_ms:
+                return self.flush()
+
+        if self.buffered_samples >= self.max_segment_samples:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[Segment]:
+        """End the current utterance now (e.g. at end of stream)."""
+        if not self.is_speaking:
+            return None
+        audio = np.concatenate(self.speech_buffer)
+        segment = Segment(
+            self.channel,
+            self.start_time,
+            self.start_time + len(audio) / self.sample_rate,
+            audio,
+            np.array(self.speech_probs),
+        )
+        self.speech_buffer = []
+        self.speech_probs = []
+        self.buffered_samples = 0
+        self.silence_ms = 0.0
+        return segment
+
+    def _append(self, block: np.ndarray, speech_prob: float):
+        self.speech_buffer.append(block)
+        self.speech_probs.append(speech_prob)
+        self.buffered_samples += len(block)
+
+
+class MultichannelTranscriber:
+    """
+    Multichannel pipeline: per-channel VAD and buffers, shared batched inference.
+
+    Utterances that finish within ``batch_window_ms`` of each other (stream
+    time) are transcribed together with one ``Transcriber.transcribe_batch``
+    call, so a stereo call or a mic array costs one inference instead of one
+    per channel when speakers overlap.
+    """
+
+    def __init__(self, transcriber, num_channels: int, vad_factory: Optional[Callable] = None,
+                 batch_window_ms: int = 0, sample_rate: int = SAMPLE_RATE, **segmenter_kwargs):
+        """
+        Args:
+            transcriber (Transcriber): Shared engine (use batch_size=num_channels on NPU).
+            num_channels (int): Number of input channels.
+            vad_factory (callable, optional): Returns a new VAD per channel.
+                Defaults to ``VoiceActivityDetector``.
+            batch_window_ms (int): How long a finished utterance may wait for other
+                channels to join its batch. 0 batches only utterances ending in the same block.
+            sample_rate (int): Sample rate of the audio.
+            **segmenter_kwargs: Passed to each ChannelSegmenter.
+        """
+        if vad_factory is None:
+            from .vad import VoiceActivityDetector
+            vad_factory = VoiceActivityDetector
+
+        self.transcriber = transcriber
+        self.num_channels = num_channels
+        self.sample_rate = sample_rate
+        self.batch_window_s = batch_window_ms / 1000
+        self.segmenters = [
+            ChannelSegmenter(channel, vad_factory(), sample_rate=sample_rate, **segmenter_kwargs)
+            for channel in range(num_channels)
+        ]
+        self.pending: List[Segment] = []
+        self.samples_processed = 0
+        # Inference calls and utterances, to show how much batching saved
+        self.inference_calls = 0
+        self.segments_transcribed = 0
+
+    @property
+    def stream_time(self) -> float:
+        return self.samples_processed / self.sample_rate
+
+    def process_block(self, block: np.ndarray) -> List[ChannelTranscript]:
+        """
+        Feed one multichannel block.
+
+        Args:
+            block (np.ndarray): Audio of shape [frames, channels] (as delivered by sounddevice).
+
+        Returns:
+            list: ChannelTranscripts for utterances transcribed during this call.
+        """
+        if block.ndim != 2 or block.shape[1] != self.num_channels:
+            raise ValueError(f"Expected block of shape [frames, {self.num_channels}], got {block.shape}")
+
+        block_time = self.stream_time
+        for segmenter in self.segmenters:
+            # Contiguous copy: the VAD wants a dense 1-D array per channel
+            segment = segmenter.process(np.ascontiguousarray(block[:, segmenter.channel]), block_time)
+            if segment is not None:
+                self.pending.append(segment)
+        self.samples_processed += len(block)
+
+        if not self.pending:
+            return []
+        oldest_end = min(segment.end_time for segment in self.pending)
+        still_speaking = any(segmenter.is_speaking for segmenter in self.segmenters)
+        if self.stream_time - oldest_end >= self.batch_window_s or not still_speaking:
+            return self._transcribe_pending()
+        return []
+
+    def flush(self) -> List[ChannelTranscript]:
+        """End all open utterances and transcribe everything pending."""
+        for segmenter in self.segmenters:
+            segment = segmenter.flush()
+            if segment is not None:
+                self.pending.append(segment)
+        return self._transcribe_pending()
+
+    def _transcribe_pending(self) -> List[ChannelTranscript]:
+        if not self.pending:
+            return []
+        segments = sorted(self.pending, key=lambda segment: (segment.start_time, segment.channel))
+        self.pending = []
+
+        calls = getattr(self.transcriber, "inference_calls", None)
+        texts = self.transcriber.transcribe_batch(
+            [segment.audio for segment in segments],
+            [segment.speech_probs for segment in segments],
+        )
+        # The calls the engine actually ran: NPU splits by its batch size, CPU by chunk length
+        self.inference_calls += self.transcriber.inference_calls - calls if isinstance(calls, int) else 1
+        self.segments_transcribed += len(segments)
+        return [
+            ChannelTranscript(segment.channel, segment.start_time, segment.end_time, text)
+            for segment, text in zip(segments, texts)
+        ]
@@ -0,0 +1,379 @@
+import json
+import multiprocessing as mp
+import os
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from .utils import SAMPLE_RATE
+
+# Written next to openvino_model.xml in each exported model directory
+METADATA_FILE = "stt_npu_variant.json"
+IR_FILE = "openvino_model.xml"
+
+# Outcomes a probe can record for a (device, duration)
+STATUSES = ("ok", "compile_failed", "oom", "error", "crashed", "timeout")
+
+
+class Budget(NamedTuple):
+    """A latency (and optionally memory) budget for one device and audio length."""
+    latency_ms: float
+    duration_s: float = 10.0
+    device: str = "CPU"
+    percentile: int = 95
+    memory_mb: Optional[float] = None
+
+    def __str__(self):
+        text = f"p{self.percentile} < {self.latency_ms:g} ms for {self.duration_s:g} s audio on {self.device}"
+        if self.memory_mb is not None:
+            text += f", memory < {self.memory_mb:g} MB"
+        return text
+
+
+def parse_budget(text: str) -> Budget:
+    """
+    Parse a budget such as ``"p95 < 300 ms for 10 s audio on CPU"``.
+
+    Recognized parts (any order): ``pNN < X ms`` (required), ``for N s``,
+    ``on DEVICE`` and ``memory < N MB|GB``.
+
+    Args:
+        text (str): Budget description.
+
+    Returns:
+        Budget: The parsed budget (10s on CPU unless stated).
+    """
+    latency = re.search(r"p(\d+)\s*<\s*([\d.]+)\s*ms", text, re.IGNORECASE)
+    if latency is None:
+        raise ValueError(f"Budget needs a latency bound like 'p95 < 300 ms', got {text!r}")
+    duration = re.search(r"for\s+([\d.]+)\s*s\b", text, re.IGNORECASE)
+    device = re.search(r"\bon\s+([A-Za-z]+)", text)
+    memory = re.search(r"mem(?:ory)?\s*<\s*([\d.]+)\s*(mb|gb)", text, re.IGNORECASE)
+
+    memory_mb = None
+    if memory is not None:
+        memory_mb = float(memory.group(1)) * (1024 if memory.group(2).lower() == "gb" else 1)
+    return Budget(
+        latency_ms=float(latency.group(2)),
+        duration_s=float(duration.group(1)) if duration else 10.0,
+        device=device.group(1).upper() if device else "CPU",
+        percentile=int(latency.group(1)),
+        memory_mb=memory_mb,
+    )
+
+
+def discover_variants(models_root: str = "models") -> List[str]:
+    """
+    Model directories under ``models_root`` that contain an OpenVINO IR.
+
+    Args:
+        models_root (str): Directory holding one subdirectory per exported model.
+
+    Returns:
+        list: Sorted model directory paths.
+    """
+    if not os.path.isdir(models_root):
+        return []
+    return sorted(
+        os.path.join(models_root, name) for name in os.listdir(models_root)
+        if os.path.exists(os.path.join(models_root, name, IR_FILE))
+    )
+
+
+def describe_model(model_dir: str) -> Dict:
+    """
+    Static facts about an exported variant, read from its IR.
+
+    Args:
+        model_dir (str): Model directory.
+
+    Returns:
+        dict: ``name``, ``parameters`` (weight elements), ``precision`` (dominant
+        weight type, e.g. FP16) and ``size_mb`` (weights file).
+    """
+    import openvino as ov
+    model = ov.Core().read_model(os.path.join(model_dir, IR_FILE))
+    elements: Dict[str, int] = {}
+    for op in model.get_ops():
+        if op.get_type_name() != "Constant":
+            continue
+        shape = op.get_output_partial_shape(0)
+        if shape.rank.get_length() < 2:
+            # Scalars and 1-D shape/axis constants are not weights
+            continue
+        count = int(np.prod([dim.get_length() for dim in shape]))
+        element_type = op.get_output_element_type(0).get_type_name()
+        elements[element_type] = elements.get(element_type, 0) + count
+
+    names = {"f32": "FP32", "f16": "FP16", "bf16": "BF16", "i8": "INT8", "u8": "INT8", "i4": "INT4", "u4": "INT4"}
+    dominant = max(elements, key=elements.get) if elements else "f32"
+    weights = os.path.join(model_dir, IR_FILE.replace(".xml", ".bin"))
+    return {
+        "name": os.path.basename(os.path.normpath(model_dir)),
+        "parameters": sum(elements.values()),
+        "precision": names.get(dominant, dominant.upper()),
+        "size_mb": os.path.getsize(weights) / 2**20 if os.path.exists(weights) else 0.0,
+    }
+
+
+def load_metadata(model_dir: str) -> Dict:
+    """
+    A variant's metadata, with static facts filled in from the IR if missing.
+
+    Args:
+        model_dir (str): Model directory.
+
+    Returns:
+        dict: Metadata with ``measurements`` as {device: {duration: result}}.
+    """
+    path = os.path.join(model_dir, METADATA_FILE)
+    metadata = {}
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            metadata = json.load(f)
+    if "parameters" not in metadata:
+        try:
+            metadata.update(describe_model(model_dir))
+        except Exception as e:
+            # Still listable (and probe-able, to record the failure)
+            metadata.update(name=os.path.basename(os.path.normpath(model_dir)), parameters=0,
+                            precision="unknown", size_mb=0.0, ir_error=f"{type(e).__name__}: {e}")
+    metadata.setdefault("wer", None)
+    metadata.setdefault("measurements", {})
+    return metadata
+
+
+def save_metadata(model_dir: str, metadata: Dict) -> str:
+    """
+    Write a variant's metadata next to its IR (atomically).
+
+    Returns:
+        str: Path of the metadata file.
+    """
+    metadata["updated"] = datetime.now(timezone.utc).isoformat()
+    path = os.path.join(model_dir, METADATA_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process, or None where it cannot be read."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KiB, macOS bytes
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize / 2**20
+    except (AttributeError, OSError):
+        pass
+    return None
+
+
+def _classify(error: BaseException) -> str:
+    message = str(error).lower()
+    if isinstance(error, MemoryError) or "out of memory" in message or ("memory" in message and "alloc" in message):
+        return "oom"
+    return "error"
+
+
+def measure_variant(model_dir: str, device: str, durations: List[float], iterations: int = 10) -> Dict[str, Dict]:
+    """
+    Load a variant on a device and time inference at each audio duration, in this process.
+
+    Memory is the growth of peak resident memory from loading and running the
+    model (host memory; device-side allocations on NPU/GPU are not visible).
+
+    Args:
+        model_dir (str): Model directory.
+        device (str): Target device.
+        durations (list): Audio durations to time (seconds).
+        iterations (int): Timed inferences per duration.
+
+    Returns:
+        dict: {duration: result}; each result has ``status`` and, when ok,
+        ``p50_ms``/``p95_ms``/``p99_ms``, ``rtf``, ``memory_mb`` and ``input_length``.
+    """
+    from .core import Transcriber
+
+    baseline_mb = _peak_rss_mb()
+    try:
+        transcriber = Transcriber(model_path=model_dir, device=device)
+    except Exception as e:
+        status = _classify(e)
+        return {f"{d:g}": {"status": "compile_failed" if status == "error" else status,
+                           "error": f"{type(e).__name__}: {e}"} for d in durations}
+
+    rng = np.random.default_rng(0)
+    results = {}
+    for duration in durations:
+        audio = (0.1 * rng.standard_normal(int(duration * SAMPLE_RATE))).astype(np.float32)
+        try:
+            transcriber.transcribe(audio)  # Warmup
+            times = []
+            for _ in range(iterations):
+                start = time.perf_counter()
+                transcriber.transcribe(audio)
+                times.append(time.perf_counter() - start)
+        except Exception as e:
+            results[f"{duration:g}"] = {"status": _classify(e), "error": f"{type(e).__name__}: {e}"}
+            continue
+        times_ms = np.array(times) * 1000
+        peak_mb = _peak_rss_mb()
+        results[f"{duration:g}"] = {
+            "status": "ok",
+            "p50_ms": float(np.percentile(times_ms, 50)),
+            "p95_ms": float(np.percentile(times_ms, 95)),
+            "p99_ms": float(np.percentile(times_ms, 99)),
+            "rtf": float(np.median(times_ms)) / 1000 / duration,
+            "memory_mb": peak_mb - baseline_mb if peak_mb is not None and baseline_mb is not None else None,
+            "input_length": transcriber.static_length or len(audio),
+        }
+    return results
+
+
+def _probe_worker(conn, model_dir: str, device: str, durations: List[float], iterations: int):
+    conn.send(measure_variant(model_dir, device, durations, iterations))
+    conn.close()
+
+
+def probe_variant(model_dir: str, device: str, durations: List[float], iterations: int = 10,
+                  timeout: float = 600.0, save: bool = True) -> Dict[str, Dict]:
+    """
+    Measure a variant in a child process and record the results in its metadata.
+
+    Oversized models can abort the process or hang the driver rather than
+    raise, so each probe runs isolated: a child that dies is recorded as
+    ``crashed`` and one that exceeds ``timeout`` as ``timeout``.
+
+    Args:
+        model_dir (str): Model directory.
+        device (str): Target device.
+        durations (list): Audio durations to time (seconds).
+        iterations (int): Timed inferences per duration.
+        timeout (float): Seconds before the child is killed.
+        save (bool): Write the results to the variant's metadata.
+
+    Returns:
+        dict: {duration: result}, as from ``measure_variant``.
+    """
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=_probe_worker, args=(child, model_dir, device, durations, iterations), daemon=True)
+    process.start()
+    child.close()
+
+    results = None
+    timed_out = not parent.poll(timeout)
+    if not timed_out:
+        try:
+            results = parent.recv()
+        except EOFError:
+            # The child died before sending anything
+            pass
+    if results is None:
+        if timed_out:
+            process.kill()
+            failure = {"status": "timeout", "error": f"No result after {timeout:g}s"}
+        else:
+            process.join()
+            failure = {"status": "crashed", "error": f"Probe process exited with code {process.exitcode}"}
+        results = {f"{d:g}": dict(failure) for d in durations}
+    process.join()
+    parent.close()
+
+    if save:
+        metadata = load_metadata(model_dir)
+        metadata["measurements"].setdefault(device.upper(), {}).update(results)
+        save_metadata(model_dir, metadata)
+    return results
+
+
+def _measurement_for(metadata: Dict, budget: Budget) -> Optional[Dict]:
+    """The measurement at the shortest probed duration covering the budget's audio."""
+    by_duration = metadata["measurements"].get(budget.device.upper(), {})
+    covering = sorted((float(d), r) for d, r in by_duration.items() if float(d) >= budget.duration_s)
+    return covering[0][1] if covering else None
+
+
+def fits(metadata: Dict, budget: Budget) -> Tuple[bool, str]:
+    """
+    Whether a variant's measurements meet a budget.
+
+    Returns:
+        tuple: (fits, reason) where reason explains a rejection.
+    """
+    result = _measurement_for(metadata, budget)
+    if result is None:
+        return False, f"not probed on {budget.device} for >= {budget.duration_s:g}s"
+    if result["status"] != "ok":
+        return False, result["status"]
+    latency = result.get(f"p{budget.percentile}_ms")
+    if latency is None:
+        return False, f"no p{budget.percentile} measurement"
+    if latency >= budget.latency_ms:
+        return False, f"p{budget.percentile} {latency:.0f} ms"
+    if budget.memory_mb is not None and result.get("memory_mb") is not None and result["memory_mb"] >= budget.memory_mb:
+        return False, f"memory {result['memory_mb']:.0f} MB"
+    return True, f"p{budget.percentile} {latency:.0f} ms"
+
+
+def accuracy_order(variants: List[Dict]) -> List[Dict]:
+    """
+    Most accurate first: by measured WER when every variant has one, else by parameter count.
+    """
+    if variants and all(v.get("wer") is not None for v in variants):
+        return sorted(variants, key=lambda v: v["wer"])
+    return sorted(variants, key=lambda v: -v["parameters"])
+
+
+def select_variant(budget, models_root: str = "models") -> Tuple[str, Dict]:
+    """
+    Pick the most accurate probed variant that meets a budget.
+
+    Args:
+        budget (Budget or str): The budget, or text for ``parse_budget``.
+        models_root (str): Directory of exported variants.
+
+    Returns:
+        tuple: (model directory, the measurement it was selected on).
+    """
+    if isinstance(budget, str):
+        budget = parse_budget(budget)
+    candidates = []
+    for model_dir in discover_variants(models_root):
+        metadata = load_metadata(model_dir)
+        metadata["path"] = model_dir
+        candidates.append(metadata)
+
+    rejected = []
+    for metadata in accuracy_order(candidates):
+        ok, reason = fits(metadata, budget)
+        if ok:
+            return metadata["path"], _measurement_for(metadata, budget)
+        rejected.append(f"{metadata['name']} ({reason})")
+    raise ValueError(f"No variant in {models_root} meets '{budget}'"
+                     + (f": {', '.join(rejected)}" if rejected else ": no exported models found"))
@@ -0,0 +1,64 @@
+# Stages timed on every request, in pipeline order (indices into the engine's _stage_ns)
+STAGES = ("trim", "pad", "preprocess", "infer", "decode")
+TRIM, PAD, PREPROCESS, INFER, DECODE = range(len(STAGES))
+
+
+class TranscriptionResult:
+    """
+    Everything known about one ``transcribe`` call.
+
+    A ``__slots__`` record: no per-instance dict, and the stage timings are
+    copied out of the engine's preallocated counters, so building it costs
+    one small object per request. ``str(result)`` is the text. Kept free of
+    torch and transformers so light engines (see snapshot.py) can return it.
+
+    Attributes:
+        text (str): Transcript.
+        token_ids (np.ndarray or None): Greedy CTC tokens after collapsing repeats and
+            blanks; None with a beam search decoder, a cache hit or empty audio.
+        token_times (np.ndarray or None): Start time in seconds of each token, relative
+            to the audio passed in (20ms frame resolution).
+        real_samples (int): Samples of audio the model saw, after trimming.
+        padded_samples (int): Zero samples added to reach ``bucket``.
+        bucket (int): Input length the model ran on (the static length on NPU).
+        device (str): Device the model ran on.
+        trim_ms, pad_ms, preprocess_ms, infer_ms, decode_ms (float): Time per stage.
+        total_ms (float): Whole call, including the cache lookup.
+        cached (bool): Text came from the transcript cache; no stage ran.
+    """
+    __slots__ = ("text", "token_ids", "token_times", "real_samples", "padded_samples", "bucket", "device",
+                 "trim_ms", "pad_ms", "preprocess_ms", "infer_ms", "decode_ms", "total_ms", "cached")
+
+    def __init__(self, text: str, device: str, real_samples: int = 0, bucket: int = 0, stage_ns=None,
+                 total_ms: float = 0.0, token_ids=None, token_times=None, cached: bool = False):
+        self.text = text
+        self.device = device
+        self.real_samples = real_samples
+        self.bucket = bucket
+        self.padded_samples = max(0, bucket - real_samples)
+        if stage_ns is None:
+            stage_ns = (0,) * len(STAGES)
+        self.trim_ms, self.pad_ms, self.preprocess_ms, self.infer_ms, self.decode_ms = (
+            ns / 1e6 for ns in stage_ns)
+        self.total_ms = total_ms
+        self.token_ids = token_ids
+        self.token_times = token_times
+        self.cached = cached
+
+    @property
+    def timings(self) -> dict:
+        """Milliseconds per stage, in pipeline order."""
+        return {stage: getattr(self, f"{stage}_ms") for stage in STAGES}
+
+    @property
+    def padding_ratio(self) -> float:
+        """Share of the model input that was padding."""
+        return self.padded_samples / self.bucket if self.bucket else 0.0
+
+    def __str__(self):
+        return self.text
+
+    def __repr__(self):
+        stages = ", ".join(f"{stage}={ms:.1f}ms" for stage, ms in self.timings.items())
+        return (f"TranscriptionResult(text={self.text!r}, device={self.device}, real={self.real_samples}, "
+                f"bucket={self.bucket}, {stages}, total={self.total_ms:.1f}ms)")
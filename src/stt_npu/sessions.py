@@ -0,0 +1,273 @@
+import itertools
+import sys
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+
+from .capture import INT16_SCALE
+from .utils import BLOCK_SIZE, SAMPLE_RATE
+
+SILENCE_DURATION_MS = 500  # End an utterance after this much silence
+MAX_SEGMENT_SECONDS = 30  # Force transcription at the model window
+
+
+class _Utterance(NamedTuple):
+    """An ended utterance copied out of its slot, waiting for the engine."""
+    session_id: str
+    start_time: float
+    pcm: np.ndarray
+    speech_probs: np.ndarray
+
+
+class SessionTranscript(NamedTuple):
+    """Transcript of one utterance, tagged by session and session time."""
+    session_id: str
+    start_time: float
+    end_time: float
+    text: str
+
+
+class Session:
+    """
+    Compact per-stream state: VAD snapshot, slot index and a few counters.
+
+    Audio lives in the manager's preallocated slot for this session, not here.
+    """
+    __slots__ = ("session_id", "slot", "vad_state", "length", "num_blocks",
+                 "silence_ms", "start_time", "samples_seen")
+
+    def __init__(self, session_id: str, slot: int):
+        self.session_id = session_id
+        self.slot = slot
+        self.vad_state = None  # None = fresh Silero state
+        self.length = 0  # Samples of the current utterance in the slot
+        self.num_blocks = 0
+        self.silence_ms = 0.0
+        self.start_time = 0.0
+        self.samples_seen = 0
+
+    @property
+    def is_speaking(self) -> bool:
+        return self.length > 0
+
+
+class SessionManager:
+    """
+    Many concurrent streams on one VAD model and one transcription engine.
+
+    Each session is a ``__slots__`` object holding its Silero state snapshot
+    (swapped into the shared model around every VAD call) and an index into
+    preallocated int16 slots: one utterance-sized row of audio and one row of
+    VAD probabilities per session. Slots are zero-initialized, so the OS only
+    backs the pages a session has actually spoken into; idle sessions cost
+    their small state object and nothing else. At end of speech the utterance
+    is copied out of its slot, converted into one shared float32 scratch
+    buffer and transcribed.
+
+    Segmentation matches ChannelSegmenter: speech blocks and trailing silence
+    are kept until SILENCE_DURATION_MS of silence, and utterances are cut at
+    MAX_SEGMENT_SECONDS. The VAD state swap and slot writes are serialized
+    with one lock; transcription runs outside it behind a separate engine
+    lock (the Transcriber is not reentrant), so one session's slow inference
+    never holds up other sessions' ``process`` calls.
+    """
+
+    def __init__(self, transcriber, vad=None, max_sessions: int = 256, max_segment_s: float = MAX_SEGMENT_SECONDS,
+                 silence_duration_ms: int = SILENCE_DURATION_MS, block_size: int = BLOCK_SIZE,
+                 sample_rate: int = SAMPLE_RATE):
+        """
+        Args:
+            transcriber (Transcriber): Shared engine.
+            vad (VoiceActivityDetector, optional): Shared VAD. Defaults to a new one.
+            max_sessions (int): Number of slots to reserve.
+            max_segment_s (float): Longest utterance before it is cut (slot length).
+            silence_duration_ms (int): Trailing silence that ends an utterance.
+            block_size (int): Samples per ``process`` call.
+            sample_rate (int): Sample rate of the audio.
+        """
+        if vad is None:
+            from .vad import VoiceActivityDetector
+            vad = VoiceActivityDetector()
+        self.transcriber = transcriber
+        self.vad = vad
+        self.max_sessions = max_sessions
+        self.block_size = block_size
+        self.sample_rate = sample_rate
+        self.silence_duration_ms = silence_duration_ms
+
+        self.slot_blocks = int(max_segment_s * sample_rate) // block_size
+        self.slot_samples = self.slot_blocks * block_size
+        # np.zeros pages are mapped lazily, so reserving every slot up front costs no RSS
+        self._audio = np.zeros((max_sessions, self.slot_samples), dtype=np.int16)
+        self._probs = np.zeros((max_sessions, self.slot_blocks), dtype=np.float32)
+        # Furthest sample ever written per slot (its pages stay resident once touched)
+        self._high_water = np.zeros(max_sessions, dtype=np.int64)
+        # Shared float32 work buffers: one VAD block and one utterance
+        self._block = np.empty(block_size, dtype=np.float32)
+        self._utterance = np.empty(self.slot_samples, dtype=np.float32)
+
+        self._free = list(range(max_sessions - 1, -1, -1))
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        # Serializes the engine and the shared utterance buffer
+        self._engine_lock = threading.Lock()
+        self.sessions: Dict[str, Session] = {}
+
+    def open(self, session_id: Optional[str] = None) -> Session:
+        """
+        Start a session in a free slot.
+
+        Args:
+            session_id (str, optional): Identifier reported on transcripts. Defaults to a counter.
+
+        Returns:
+            Session: Pass it to ``process`` and ``close``.
+        """
+        with self._lock:
+            if not self._free:
+                raise RuntimeError(f"All {self.max_sessions} session slots are in use")
+            session_id = session_id if session_id is not None else str(next(self._ids))
+            if session_id in self.sessions:
+                raise ValueError(f"Session {session_id!r} is already open")
+            session = Session(session_id, self._free.pop())
+            self.sessions[session_id] = session
+            return session
+
+    def close(self, session: Session) -> Optional[SessionTranscript]:
+        """
+        End a session, transcribing any open utterance, and free its slot.
+
+        Returns:
+            SessionTranscript or None: The final utterance, if one was open.
+        """
+        with self._lock:
+            utterance = self._take(session)
+            del self.sessions[session.session_id]
+            self._free.append(session.slot)
+            session.vad_state = None
+        return self._transcribe(utterance)
+
+    def process(self, session: Session, block: np.ndarray) -> Optional[SessionTranscript]:
+        """
+        Feed one block of a session's audio.
+
+        Args:
+            session (Session): An open session.
+            block (np.ndarray): ``block_size`` mono samples, int16 or float32.
+
+        Returns:
+            SessionTranscript or None: The utterance, once it has ended.
+        """
+        with self._lock:
+            utterance = self._segment(session, block)
+        return self._transcribe(utterance)
+
+    def memory_report(self) -> Dict:
+        """
+        Memory cost per session.
+
+        Returns:
+            dict: ``state_bytes`` (Session object plus VAD snapshot, averaged over open
+            sessions), ``slot_bytes_reserved`` (virtual, per slot), ``slot_bytes_resident``
+            (rough: slot pages touched so far, averaged over open sessions) and ``shared_bytes``
+            (work buffers).
+        """
+        with self._lock:
+            sessions = list(self.sessions.values())
+            state_bytes = sum(_session_bytes(session) for session in sessions)
+            # A slot page stays resident once written; estimate from the furthest write per slot
+            touched = sum(self._touched_bytes(session.slot) for session in sessions)
+            per_slot = self._audio[0].nbytes + self._probs[0].nbytes
+            count = max(1, len(sessions))
+            return {
+                "sessions": len(sessions),
+                "state_bytes": state_bytes / count,
+                "slot_bytes_reserved": per_slot,
+                "slot_bytes_resident": touched / count,
+                "shared_bytes": self._block.nbytes + self._utterance.nbytes,
+            }
+
+    def _segment(self, session: Session, block: np.ndarray) -> Optional[_Utterance]:
+        """Run VAD on a block and append it to the slot; returns the utterance once it has ended."""
+        if block.dtype == np.int16:
+            vad_input = np.multiply(block, INT16_SCALE, out=self._block[:len(block)])
+        else:
+            vad_input = block
+        self.vad.set_state(session.vad_state)
+        speech_prob = self.vad.speech_probability(vad_input, self.sample_rate)
+        session.vad_state = self.vad.get_state()
+
+        block_time = session.samples_seen / self.sample_rate
+        session.samples_seen += len(block)
+        if speech_prob > self.vad.threshold:
+            if not session.is_speaking:
+                session.start_time = block_time
+            self._append(session, block, speech_prob)
+            session.silence_ms = 0.0
+        elif session.is_speaking:
+            # Include trailing silence context
+            self._append(session, block, speech_prob)
+            session.silence_ms += len(block) / self.sample_rate * 1000
+            if session.silence_ms >= self.silence_duration_ms:
+                return self._take(session)
+
+        if session.num_blocks >= self.slot_blocks:
+            return self._take(session)
+        return None
+
+    def _append(self, session: Session, block: np.ndarray, speech_prob: float):
+        row = self._audio[session.slot]
+        end = session.length + len(block)
+        if block.dtype == np.int16:
+            row[session.length:end] = block
+        else:
+            scaled = self._block[:len(block)]
+            np.clip(block, -1.0, 32767 / 32768, out=scaled)
+            scaled *= 32768
+            np.copyto(row[session.length:end], scaled, casting="unsafe")
+        self._probs[session.slot, session.num_blocks] = speech_prob
+        session.length = end
+        session.num_blocks += 1
+        if end > self._high_water[session.slot]:
+            self._high_water[session.slot] = end
+
+    def _take(self, session: Session) -> Optional[_Utterance]:
+        """Copy the utterance out of the session's slot and clear it (call with the lock held)."""
+        if not session.is_speaking:
+            return None
+        utterance = _Utterance(session.session_id, session.start_time,
+                               self._audio[session.slot, :session.length].copy(),
+                               self._probs[session.slot, :session.num_blocks].copy())
+        session.length = 0
+        session.num_blocks = 0
+        session.silence_ms = 0.0
+        return utterance
+
+    def _transcribe(self, utterance: Optional[_Utterance]) -> Optional[SessionTranscript]:
+        """Transcribe an utterance taken from a slot, one at a time on the shared engine."""
+        if utterance is None:
+            return None
+        n = len(utterance.pcm)
+        with self._engine_lock:
+            audio = np.multiply(utterance.pcm, INT16_SCALE, out=self._utterance[:n])
+            text = self.transcriber.transcribe(audio, speech_probs=utterance.speech_probs)
+        return SessionTranscript(utterance.session_id, utterance.start_time,
+                                 utterance.start_time + n / self.sample_rate, text)
+
+    def _touched_bytes(self, slot: int) -> int:
+        samples = self._high_water[slot]
+        return samples * self._audio.itemsize + (samples // self.block_size) * self._probs.itemsize
+
+
+def _session_bytes(session: Session) -> int:
+    """Python-level size of a session and its VAD snapshot."""
+    size = sys.getsizeof(session)
+    if session.vad_state is not None:
+        size += sys.getsizeof(session.vad_state)
+        for value in session.vad_state:
+            if hasattr(value, "element_size"):
+                size += value.element_size() * value.nelement() + sys.getsizeof(value)
+            else:
+                size += sys.getsizeof(value)
+    return size
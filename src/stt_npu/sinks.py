@@ -0,0 +1,454 @@
+import json
+import os
+import queue
+import socket
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional, Sequence, TextIO, Union
+
+from .ipc import _socket_for
+
+
+class TranscriptEvent(NamedTuple):
+    """One transcript as handed to the output layer (times in stream seconds)."""
+    text: str
+    start_time: float
+    end_time: float
+    stream: str = ""
+    inference_ms: Optional[float] = None
+    wall_time: Optional[float] = None
+
+
+class Sink(ABC):
+    """
+    Destination for transcripts. ``write`` gets batches from a background
+    writer thread, ``flush`` is called at most once per flush interval.
+
+    Sinks with ``accepts_status`` also get the status text passed to
+    ``TranscriptOutput.status`` as ``str`` items, in order with the events.
+    """
+    name = "sink"
+    accepts_status = False
+
+    @abstractmethod
+    def write(self, events: List[Union[TranscriptEvent, str]]):
+        """Write a batch of transcripts (and status text, if ``accepts_status``)."""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class StdoutSink(Sink):
+    """Human-readable lines (``> text``) on stdout or any text stream, plus status text."""
+    name = "stdout"
+    accepts_status = True
+
+    def __init__(self, stream: Optional[TextIO] = None, show_stats: bool = True):
+        """
+        Args:
+            stream (file, optional): Text stream. Defaults to sys.stdout.
+            show_stats (bool): Add a ``[Stats]`` line with inference time per transcript.
+        """
+        self.stream = stream or sys.stdout
+        self.show_stats = show_stats
+
+    def write(self, events):
+        lines = []
+        for event in events:
+            if isinstance(event, str):
+                lines.append(event)
+                continue
+            prefix = f"[{event.stream}] " if event.stream else ""
+            lines.append(f"{prefix}> {event.text}\n")
+            if self.show_stats and event.inference_ms is not None:
+                duration = max(event.end_time - event.start_time, 1e-9)
+                lines.append(f"[Stats] {event.inference_ms / 1000:.2f}s | "
+                             f"RTF: {event.inference_ms / 1000 / duration:.2f}\n")
+        self.stream.write("".join(lines))
+
+    def flush(self):
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+
+
+class JSONLSink(Sink):
+    """One JSON object per transcript, appended to a file."""
+    name = "jsonl"
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path (str): File to append to (created if missing).
+        """
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def write(self, events):
+        self._file.write("".join(json.dumps(event._asdict()) + "\n" for event in events))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(max(0.0, seconds) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+class SubtitleSink(Sink):
+    """
+    SRT or WebVTT subtitles with stream timestamps.
+
+    Without ``max_cues`` cues are appended as they arrive. With it, the file
+    is a rolling window of the last ``max_cues`` cues, rewritten atomically on
+    each flush (for overlays that re-read the file).
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, max_cues: Optional[int] = None):
+        """
+        Args:
+            path (str): Output file.
+            fmt (str, optional): ``srt`` or ``vtt``. Defaults to the file extension.
+            max_cues (int, optional): Keep only this many recent cues.
+        """
+        self.path = path
+        self.fmt = (fmt or os.path.splitext(path)[1].lstrip(".") or "srt").lower()
+        if self.fmt not in ("srt", "vtt"):
+            raise ValueError(f"Subtitle format must be 'srt' or 'vtt', got {self.fmt!r}")
+        self.name = self.fmt
+        self.max_cues = max_cues
+        self._cues = deque(maxlen=max_cues)
+        self._index = 0
+        self._dirty = False
+        self._file = None
+        if max_cues is None:
+            self._file = open(path, "w", encoding="utf-8")
+            if self.fmt == "vtt":
+                self._file.write("WEBVTT\n\n")
+
+    def _cue(self, index: int, event: TranscriptEvent) -> str:
+        separator = "," if self.fmt == "srt" else "."
+        timing = f"{_timestamp(event.start_time, separator)} --> {_timestamp(event.end_time, separator)}"
+        text = f"{event.stream}: {event.text}" if event.stream else event.text
+        return f"{index}\n{timing}\n{text}\n\n"
+
+    def write(self, events):
+        for event in events:
+            self._index += 1
+            cue = self._cue(self._index, event)
+            if self._file is not None:
+                self._file.write(cue)
+            else:
+                self._cues.append(cue)
+        self._dirty = True
+
+    def flush(self):
+        if self._file is not None:
+            self._file.flush()
+        elif self._dirty:
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                if self.fmt == "vtt":
+                    f.write("WEBVTT\n\n")
+                f.write("".join(self._cues))
+            os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def close(self):
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+
+
+class SocketSink(Sink):
+    """
+    Streams JSON lines to every process connected to a Unix socket (or TCP address).
+
+    Subscribers connect at any time and get transcripts from then on. A
+    subscriber that cannot take a batch within ``send_timeout`` is dropped,
+    so one stuck reader cannot hold up the others.
+    """
+    name = "socket"
+
+    def __init__(self, address, send_timeout: float = 1.0):
+        """
+        Args:
+            address (str or tuple): Socket path, or (host, port).
+            send_timeout (float): Seconds a subscriber may block a send before it is dropped.
+        """
+        self.address = address
+        self.send_timeout = send_timeout
+        self.dropped_subscribers = 0
+        self._clients: List[socket.socket] = []
+        self._clients_lock = threading.Lock()
+        if isinstance(address, str):
+            os.makedirs(os.path.dirname(os.path.abspath(address)), exist_ok=True)
+            if os.path.exists(address):
+                os.unlink(address)
+        self._sock = _socket_for(address)
+        if not isinstance(address, str):
+            self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._sock.bind(address)
+        self._sock.listen()
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._clients)
+
+    def _accept_loop(self):
+        while True:
+            try:
+                conn, _ = self._sock.accept()
+            except OSError:
+                return
+            conn.settimeout(self.send_timeout)
+            with self._clients_lock:
+                self._clients.append(conn)
+
+    def write(self, events):
+        data = "".join(json.dumps(event._asdict()) + "\n" for event in events).encode("utf-8")
+        with self._clients_lock:
+            clients = list(self._clients)
+        for conn in clients:
+            try:
+                conn.sendall(data)
+            except OSError:
+                with self._clients_lock:
+                    self._clients.remove(conn)
+                self.dropped_subscribers += 1
+                conn.close()
+
+    def close(self):
+        self._sock.close()
+        with self._clients_lock:
+            for conn in self._clients:
+                conn.close()
+            self._clients = []
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+class _SinkWriter:
+    """Bounded queue plus background thread for one sink."""
+
+    def __init__(self, sink: Sink, max_queue: int, flush_interval_s: float, max_batch: int):
+        self.sink = sink
+        self.flush_interval_s = flush_interval_s
+        self.max_batch = max_batch
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.max_backlog = 0
+        self.written = 0
+        # Transcripts and status text dropped on overflow, counted apart
+        self.dropped = 0
+        self.dropped_status = 0
+        self.errors = 0
+        self.batches = 0
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def backlog(self) -> int:
+        return self._queue.qsize()
+
+    def put(self, event: Optional[Union[TranscriptEvent, str]]):
+        """
+        Never blocks. When the queue is full a transcript (or the stop marker)
+        replaces the oldest item, while status text is itself discarded, so
+        status never pushes a transcript out.
+        """
+        while True:
+            try:
+                self._queue.put_nowait(event)
+                break
+            except queue.Full:
+                if isinstance(event, str):
+                    self.dropped_status += 1
+                    return
+                try:
+                    oldest = self._queue.get_nowait()
+                except queue.Empty:
+                    continue
+                if isinstance(oldest, str):
+                    self.dropped_status += 1
+                else:
+                    self.dropped += 1
+        backlog = self._queue.qsize()
+        if backlog > self.max_backlog:
+            self.max_backlog = backlog
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        """
+        Ask the thread to write what is queued, flush and close the sink.
+
+        Args:
+            timeout (float, optional): Seconds to wait for it. None waits indefinitely.
+
+        Returns:
+            bool: True if the thread finished; False if the sink is still stuck.
+        """
+        # The stop marker must get in even if the queue is full, so make room as put() does
+        self.put(None)
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def _run(self):
+        last_flush = time.monotonic()
+        unflushed = False
+        stopping = False
+        while not stopping:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval_s)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [event for event in batch if event is not None]
+
+            if batch:
+                try:
+                    self.sink.write(batch)
+                    self.written += sum(not isinstance(event, str) for event in batch)
+                    unflushed = True
+                except Exception as e:
+                    self.errors += 1
+                    if self.errors == 1:
+                        print(f"Sink {self.sink.name} failed: {e}", file=sys.stderr)
+                self.batches += 1
+            # Flush when the interval is up; when caught up, flush sooner unless we just did
+            now = time.monotonic()
+            since_flush = now - last_flush
+            caught_up = self._queue.empty() and since_flush >= self.flush_interval_s / 4
+            if unflushed and (stopping or caught_up or since_flush >= self.flush_interval_s):
+                try:
+                    self.sink.flush()
+                except Exception:
+                    self.errors += 1
+                self.flushes += 1
+                last_flush = now
+                unflushed = False
+        try:
+            self.sink.close()
+        except Exception:
+            self.errors += 1
+
+
+class TranscriptOutput:
+    """
+    Fan-out of transcripts to sinks without blocking the caller.
+
+    ``emit`` only enqueues. Each sink has its own bounded queue and writer
+    thread, which writes whatever has queued up as one batch and flushes at
+    most every ``flush_interval_s``. A slow sink (a stalled terminal, a
+    full pipe, a stuck subscriber) therefore delays neither inference nor
+    the other sinks. If its queue fills, its oldest transcripts are dropped
+    and counted; status text is dropped before any transcript and counted
+    apart. ``stats()`` exposes the backlog per sink.
+    """
+
+    def __init__(self, sinks: Sequence[Sink], max_queue: int = 1000, flush_interval_s: float = 0.2,
+                 max_batch: int = 256):
+        """
+        Args:
+            sinks (list): Sinks to write to.
+            max_queue (int): Transcripts a sink may fall behind before the oldest are dropped.
+            flush_interval_s (float): Longest a written transcript waits for a flush.
+            max_batch (int): Most transcripts per write call.
+        """
+        self._writers = [_SinkWriter(sink, max_queue, flush_interval_s, max_batch) for sink in sinks]
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def status(self, text: str, end: str = "\n"):
+        """
+        Queue status text (progress, stats) for the sinks that show it, like ``print``.
+
+        It goes through the same queues as transcripts, so it never blocks the
+        caller and stays in order with them.
+
+        Args:
+            text (str): Text to show.
+            end (str): Appended to ``text``.
+        """
+        if self._closed:
+            raise RuntimeError("Output is closed")
+        for writer in self._writers:
+            if writer.sink.accepts_status:
+                writer.put(text + end)
+
+    def emit(self, event: TranscriptEvent):
+        """
+        Queue a transcript for every sink (returns immediately).
+
+        Args:
+            event (TranscriptEvent): The transcript. ``wall_time`` is filled in if missing.
+        """
+        if self._closed:
+            raise RuntimeError("Output is closed")
+        if event.wall_time is None:
+            event = event._replace(wall_time=time.time())
+        for writer in self._writers:
+            writer.put(event)
+
+    @property
+    def backlog(self) -> int:
+        """Transcripts queued but not yet written, summed over sinks."""
+        return sum(writer.backlog for writer in self._writers)
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per sink: current and peak backlog, written, dropped transcripts and status, write errors, batches and flushes."""
+        return {
+            writer.sink.name: {
+                "backlog": writer.backlog,
+                "max_backlog": writer.max_backlog,
+                "written": writer.written,
+                "dropped": writer.dropped,
+                "dropped_status": writer.dropped_status,
+                "errors": writer.errors,
+                "batches": writer.batches,
+                "flushes": writer.flushes,
+            }
+            for writer in self._writers
+        }
+
+    def close(self, timeout: float = 5.0):
+        """
+        Write everything queued, flush and close the sinks.
+
+        Args:
+            timeout (float): Seconds to wait for all sinks. A sink still stuck after it
+                is abandoned (its writer is a daemon thread) rather than hanging the caller.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        deadline = time.monotonic() + timeout
+        for writer in self._writers:
+            if not writer.stop(max(0.0, deadline - time.monotonic())):
+                print(f"Sink {writer.sink.name} did not finish within {timeout:.0f}s, "
+                      f"abandoning {writer.backlog} queued", file=sys.stderr)
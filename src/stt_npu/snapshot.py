@@ -0,0 +1,346 @@
+import io
+import json
+import os
+import struct
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import openvino as ov
+
+from .decoding import BLANK_TOKEN, WORD_DELIMITER, load_vocab
+from .results import DECODE, INFER, PAD, PREPROCESS, STAGES, TRIM, TranscriptionResult
+from .utils import FRAME_STRIDE, RECEPTIVE_FIELD, SAMPLE_RATE, find_speech_bounds
+
+NORMALIZE_EPS = 1e-7  # Wav2Vec2FeatureExtractor's variance epsilon
+
+# File layout: magic, header length (uint64 LE), JSON header, zero padding, compiled blob
+MAGIC = b"STTSNAP1"
+BLOB_ALIGNMENT = 64
+SNAPSHOT_EXTENSION = ".sttsnap"
+
+
+def snapshot_name(device: str, input_length: Optional[int]) -> str:
+    """Default file name for a snapshot of a device and shape, e.g. ``snapshot_npu_480000.sttsnap``."""
+    return f"snapshot_{device.lower()}_{input_length or 'dynamic'}{SNAPSHOT_EXTENSION}"
+
+
+def export_snapshot(model_path: str, output_path: Optional[str] = None, device: str = "NPU",
+                    input_length: Optional[int] = None, batch_size: int = 1, ov_config: Optional[Dict] = None,
+                    use_tuned_profile: bool = True) -> str:
+    """
+    Compile a model once and write everything a warm start needs into one file.
+
+    The file holds the compiled blob (``CompiledModel.export_model``) for one
+    device and input shape, the CTC vocab, the feature extractor's
+    normalization settings and metadata. ``SnapshotTranscriber`` loads it
+    with ``Core.import_model`` and numpy alone: no transformers, optimum or
+    torch, no IR parsing and no compilation.
+
+    Args:
+        model_path (str): Exported model directory (IR plus processor files).
+        output_path (str, optional): Snapshot file. Defaults to ``snapshot_name()`` in ``model_path``.
+        device (str): Device to compile for. The blob only loads on this device.
+        input_length (int, optional): Static input length in samples. Defaults to 30s on NPU
+            (as Transcriber) and a dynamic length elsewhere.
+        batch_size (int): Static batch dimension.
+        ov_config (dict, optional): Compile properties. Override the tuned profile.
+        use_tuned_profile (bool): Apply this host's saved tuning profile (see scripts/tune.py).
+
+    Returns:
+        str: Path of the snapshot.
+    """
+    from .tuning import load_profile
+
+    device = device.upper()
+    if input_length is None and device == "NPU":
+        input_length = SAMPLE_RATE * 30
+    output_path = output_path or os.path.join(model_path, snapshot_name(device, input_length))
+
+    config = {}
+    if use_tuned_profile:
+        profile = load_profile(model_path, device, input_length)
+        if profile is not None:
+            config.update(profile["config"])
+    if ov_config:
+        config.update(ov_config)
+
+    core = ov.Core()
+    model = core.read_model(os.path.join(model_path, "openvino_model.xml"))
+    model.reshape({model.inputs[0]: [batch_size, input_length if input_length else -1]})
+    start = time.perf_counter()
+    compiled = core.compile_model(model, device, config)
+    compile_s = time.perf_counter() - start
+    stream = io.BytesIO()
+    compiled.export_model(stream)
+    blob = stream.getbuffer()
+
+    with open(os.path.join(model_path, "preprocessor_config.json"), "r", encoding="utf-8") as f:
+        preprocessor = json.load(f)
+    vocab = load_vocab(model_path)
+    header = {
+        "format": 1,
+        "source_model": os.path.abspath(model_path),
+        "device": device,
+        "input_length": input_length,
+        "batch_size": batch_size,
+        "ov_config": {key: str(value) for key, value in config.items()},
+        "openvino_version": ov.get_version(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "compile_s": compile_s,
+        "sample_rate": preprocessor.get("sampling_rate", SAMPLE_RATE),
+        "do_normalize": preprocessor.get("do_normalize", True),
+        "normalize_eps": NORMALIZE_EPS,
+        "vocab": vocab,
+        "blank_id": vocab.index(BLANK_TOKEN) if BLANK_TOKEN in vocab else 0,
+        "blob_size": len(blob),
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    blob_offset = -(-(len(MAGIC) + 8 + len(header_bytes)) // BLOB_ALIGNMENT) * BLOB_ALIGNMENT
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header_bytes)))
+        f.write(header_bytes)
+        f.write(b"\0" * (blob_offset - f.tell()))
+        f.write(blob)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def read_snapshot(path: str) -> Tuple[Dict, np.ndarray]:
+    """
+    Read a snapshot's header and map its compiled blob.
+
+    Args:
+        path (str): Snapshot file from ``export_snapshot``.
+
+    Returns:
+        tuple: (header dict, blob as a copy-on-write uint8 memmap).
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an STT snapshot")
+        (header_size,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_size).decode("utf-8"))
+        blob_offset = -(-f.tell() // BLOB_ALIGNMENT) * BLOB_ALIGNMENT
+    blob = np.memmap(path, dtype=np.uint8, mode="c", offset=blob_offset, shape=(header["blob_size"],))
+    return header, blob
+
+
+class SnapshotTranscriber:
+    """
+    Transcriber restored from a snapshot, for sub-second process startup.
+
+    Imports the precompiled blob with ``Core.import_model`` and reproduces
+    the feature extractor's zero-mean/unit-variance normalization and the
+    tokenizer's greedy CTC decoding in numpy. Transcripts match ``Transcriber`` on the same
+    device and shape (padding is normalized with the audio, as there).
+    ``transcribe``, ``transcribe_batch``, ``get_logits`` and
+    ``get_logits_batch`` follow Transcriber's signatures. Logits come back
+    as numpy arrays rather than torch tensors.
+    """
+
+    def __init__(self, snapshot_path: str, device: Optional[str] = None, trim_silence: bool = False,
+                 trim_margin_ms: int = 200, decoder=None, ov_config: Optional[Dict] = None):
+        """
+        Args:
+            snapshot_path (str): File written by ``export_snapshot``.
+            device (str, optional): Must match the snapshot's device. Defaults to it.
+            trim_silence (bool): Drop leading/trailing non-speech before padding.
+            trim_margin_ms (int): Audio kept on each side of detected speech when trimming.
+            decoder (CTCBeamSearchDecoder, optional): Beam search decoder. Defaults to greedy.
+            ov_config (dict, optional): Properties for this import (e.g. PERFORMANCE_HINT).
+        """
+        header, blob = read_snapshot(snapshot_path)
+        if device is not None and device.upper() != header["device"]:
+            raise ValueError(f"Snapshot was compiled for {header['device']}, not {device.upper()}")
+        self.model_path = snapshot_path
+        self.metadata = {key: value for key, value in header.items() if key != "vocab"}
+        self.device = header["device"]
+        self.batch_size = header["batch_size"]
+        self.static_length = header["input_length"]
+        self.SAMPLE_RATE = header["sample_rate"]
+        self.vocab = header["vocab"]
+        self._tokens = np.array(self.vocab, dtype=object)
+        self.blank_id = header["blank_id"]
+        self.do_normalize = header["do_normalize"]
+        self.normalize_eps = header["normalize_eps"]
+        self.trim_silence = trim_silence
+        self.trim_margin_samples = self.SAMPLE_RATE * trim_margin_ms // 1000
+        self.decoder = decoder
+        self.last_trimmed_samples = 0
+        self.total_trimmed_samples = 0
+
+        # The plugin may keep pointing into the mapped blob (e.g. for weights); keep it alive
+        self._blob = blob
+        start = time.perf_counter()
+        self.compiled_model = ov.Core().import_model(ov.Tensor(blob, shared_memory=True), self.device,
+                                                     ov_config or {})
+        self.import_s = time.perf_counter() - start
+        self._request = self.compiled_model.create_infer_request()
+        self._input = None  # Reused [batch, length] input; reallocated only when the length changes
+        self._stage_ns = np.zeros(len(STAGES), dtype=np.int64)
+        self._last_bucket = 0
+        self.inference_calls = 0
+
+    def transcribe(self, audio_chunk: np.ndarray, speech_probs: np.ndarray = None, return_result: bool = False):
+        """
+        Transcribe a chunk of audio (see Transcriber.transcribe).
+
+        Args:
+            audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+            speech_probs (np.ndarray, optional): Per-512-sample VAD probabilities for trimming.
+            return_result (bool): Return a TranscriptionResult instead of the text.
+
+        Returns:
+            str or TranscriptionResult: Transcribed text, or the full result.
+        """
+        start_ns = time.perf_counter_ns()
+        self._stage_ns[:] = 0
+        self._last_bucket = 0
+        offset = 0
+        if self.trim_silence:
+            t = time.perf_counter_ns()
+            offset, end = find_speech_bounds(audio_chunk, speech_probs, margin_samples=self.trim_margin_samples)
+            self.last_trimmed_samples = len(audio_chunk) - (end - offset)
+            self.total_trimmed_samples += self.last_trimmed_samples
+            audio_chunk = audio_chunk[offset:end]
+            self._stage_ns[TRIM] += time.perf_counter_ns() - t
+
+        logits = self.get_logits(audio_chunk)[0] if len(audio_chunk) > 0 else None
+        t = time.perf_counter_ns()
+        text = self._decode(logits) if logits is not None else ""
+        self._stage_ns[DECODE] += time.perf_counter_ns() - t
+        if not return_result:
+            return text
+
+        token_ids = token_times = None
+        if logits is not None and self.decoder is None:
+            ids = logits.argmax(axis=-1)
+            keep = ids != self.blank_id
+            keep[1:] &= ids[1:] != ids[:-1]
+            frames = np.flatnonzero(keep)
+            token_ids = ids[frames]
+            token_times = (offset + frames * FRAME_STRIDE) / self.SAMPLE_RATE
+        return TranscriptionResult(text, self.device, real_samples=len(audio_chunk), bucket=self._last_bucket,
+                                   stage_ns=self._stage_ns, total_ms=(time.perf_counter_ns() - start_ns) / 1e6,
+                                   token_ids=token_ids, token_times=token_times)
+
+    def transcribe_batch(self, audio_chunks: list, speech_probs: list = None) -> list:
+        """Transcribe several chunks with batched inference (see Transcriber.transcribe_batch)."""
+        if speech_probs is None:
+            speech_probs = [None] * len(audio_chunks)
+        chunks = list(audio_chunks)
+        if self.trim_silence:
+            self.last_trimmed_samples = 0
+            for i, probs in enumerate(speech_probs):
+                start, end = find_speech_bounds(chunks[i], probs, margin_samples=self.trim_margin_samples)
+                self.last_trimmed_samples += len(chunks[i]) - (end - start)
+                chunks[i] = chunks[i][start:end]
+            self.total_trimmed_samples += self.last_trimmed_samples
+        texts = [""] * len(chunks)
+        non_empty = [i for i, chunk in enumerate(chunks) if len(chunk) > 0]
+        if non_empty:
+            logits = self.get_logits_batch([chunks[i] for i in non_empty])
+            for i, chunk_logits in zip(non_empty, logits):
+                texts[i] = self._decode(chunk_logits[0])
+        return texts
+
+    def get_logits(self, audio_chunk: np.ndarray) -> np.ndarray:
+        """
+        Run the acoustic model without decoding.
+
+        Returns:
+            np.ndarray: CTC logits of shape [1, frames, vocab], limited to the real audio.
+        """
+        return self.get_logits_batch([audio_chunk])[0]
+
+    def get_logits_batch(self, audio_chunks: list) -> list:
+        """
+        Run the acoustic model on several chunks, ``batch_size`` per inference call.
+
+        With a dynamic length only chunks of the same length share a call, as in
+        Transcriber, so no chunk is padded to a longer neighbour.
+
+        Returns:
+            list: Per-chunk logits of shape [1, frames, vocab], limited to the real audio.
+        """
+        if self.static_length:
+            order = list(range(len(audio_chunks)))
+        else:
+            order = sorted(range(len(audio_chunks)), key=lambda i: len(audio_chunks[i]))
+        groups = []
+        for i in order:
+            if (groups and len(groups[-1]) < self.batch_size
+                    and (self.static_length or len(audio_chunks[i]) == len(audio_chunks[groups[-1][0]]))):
+                groups[-1].append(i)
+            else:
+                groups.append([i])
+
+        results = [None] * len(audio_chunks)
+        for group in groups:
+            t = time.perf_counter_ns()
+            lengths = [min(len(audio_chunks[i]), self.static_length or len(audio_chunks[i])) for i in group]
+            length = self.static_length or lengths[0]
+            if self._input is None or self._input.shape[1] != length:
+                self._input = np.zeros((self.batch_size, length), dtype=np.float32)
+            batch = self._input
+            for i in range(self.batch_size):
+                n = lengths[i] if i < len(group) else 0
+                if n:
+                    batch[i, :n] = audio_chunks[group[i]][:n]
+                batch[i, n:] = 0.0
+            self._stage_ns[PAD] += time.perf_counter_ns() - t
+
+            t = time.perf_counter_ns()
+            if self.do_normalize:
+                for i, n in enumerate(lengths):
+                    # Same statistics as the feature extractor in Transcriber: over the padded
+                    # row when the shape is static, over the real audio otherwise
+                    row = batch[i] if self.static_length else batch[i, :n]
+                    if len(row) == 0:
+                        continue
+                    row -= row.mean()
+                    row /= np.sqrt(row.var() + self.normalize_eps)
+            self._stage_ns[PREPROCESS] += time.perf_counter_ns() - t
+
+            t = time.perf_counter_ns()
+            self._request.infer({0: batch})
+            logits = self._request.get_output_tensor(0).data
+            self._stage_ns[INFER] += time.perf_counter_ns() - t
+            self._last_bucket = length
+            self.inference_calls += 1
+
+            for i, n in enumerate(lengths):
+                # Frame count as in Transcriber: real audio only
+                frames = n // FRAME_STRIDE if self.static_length else max(0, (n - RECEPTIVE_FIELD) // FRAME_STRIDE + 1)
+                results[group[i]] = logits[i:i + 1, :frames].copy()
+        return results
+
+    def _decode(self, logits: np.ndarray) -> str:
+        """CTC decode [frames, vocab] logits with the beam search decoder if set, else greedy."""
+        if self.decoder is not None:
+            return self.decoder.decode(logits)
+        ids = logits.argmax(axis=-1)
+        keep = ids != self.blank_id
+        keep[1:] &= ids[1:] != ids[:-1]
+        # As Wav2Vec2CTCTokenizer.decode: specials other than the blank stay in the text
+        return "".join(" " if token == WORD_DELIMITER else token for token in self._tokens[ids[keep]]).strip()
+
+
+def load_snapshot(snapshot_path: str, **kwargs) -> SnapshotTranscriber:
+    """
+    Restore a Transcriber from a snapshot file (see ``export_snapshot``).
+
+    Args:
+        snapshot_path (str): Snapshot file.
+        **kwargs: Passed to ``SnapshotTranscriber``.
+
+    Returns:
+        SnapshotTranscriber: Ready to transcribe.
+    """
+    return SnapshotTranscriber(snapshot_path, **kwargs)
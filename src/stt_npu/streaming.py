@@ -0,0 +1,164 @@
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .decoding import BLANK_TOKEN, WORD_DELIMITER, load_vocab
+from .utils import FRAME_STRIDE, SAMPLE_RATE
+
+
+def _to_frames(seconds: float) -> int:
+    return int(round(seconds * SAMPLE_RATE / FRAME_STRIDE))
+
+
+def window_length(chunk_s: float = 2.0, left_context_s: float = 1.0, right_context_s: float = 0.5) -> int:
+    """
+    Samples encoded per chunk: the static input length to compile on NPU.
+
+    Args:
+        chunk_s (float): Committed audio per chunk (seconds).
+        left_context_s (float): Past audio re-encoded with each chunk.
+        right_context_s (float): Lookahead.
+
+    Returns:
+        int: Window length in samples.
+    """
+    # The last center frame reads 80 samples past its 320-sample stride
+    return (_to_frames(left_context_s) + _to_frames(chunk_s) + _to_frames(right_context_s)) * FRAME_STRIDE + 80
+
+
+class StreamingTranscriber:
+    """
+    Chunked streaming mode on top of a Transcriber's acoustic model.
+
+    Audio is encoded in fixed windows: ``left_context_s`` of past audio, a
+    ``chunk_s`` center, and ``right_context_s`` of lookahead. Only the CTC
+    frames of the center are committed (greedy: argmax, repeats collapsed
+    across chunk boundaries, blanks dropped), so every frame is emitted
+    exactly once, from the window where it has context on both sides. Work
+    per chunk is constant however long the speaker talks, and text arrives
+    one chunk plus the lookahead after it was spoken.
+
+    On NPU, build the Transcriber with ``static_input_length=window_length(...)``
+    so each chunk runs at the window shape rather than the 30s one.
+    """
+
+    def __init__(self, transcriber, chunk_s: float = 2.0, left_context_s: float = 1.0,
+                 right_context_s: float = 0.5, vocab: Optional[Sequence[str]] = None):
+        """
+        Args:
+            transcriber (Transcriber): Provides ``get_logits``.
+            chunk_s (float): Committed audio per chunk (seconds).
+            left_context_s (float): Past audio re-encoded with each chunk.
+            right_context_s (float): Lookahead; adds this much latency.
+            vocab (list, optional): Token strings; read from the transcriber's model dir by default.
+        """
+        self.transcriber = transcriber
+        self.vocab = list(vocab or load_vocab(transcriber.model_path))
+        self.chunk_frames = _to_frames(chunk_s)
+        self.left_frames = _to_frames(left_context_s)
+        self.right_frames = _to_frames(right_context_s)
+        if self.chunk_frames <= 0:
+            raise ValueError("chunk_s must cover at least one 20ms frame")
+
+        self.chunk_samples = self.chunk_frames * FRAME_STRIDE
+        self.left_samples = self.left_frames * FRAME_STRIDE
+        self.window_samples = window_length(chunk_s, left_context_s, right_context_s)
+        self.right_samples = self.window_samples - self.left_samples - self.chunk_samples
+
+        self.blank_id = self.vocab.index(BLANK_TOKEN) if BLANK_TOKEN in self.vocab else 0
+        self._chars: List[str] = []
+        for token in self.vocab:
+            if token == WORD_DELIMITER:
+                self._chars.append(" ")
+            elif token.startswith("<") and token.endswith(">"):
+                self._chars.append("")
+            else:
+                self._chars.append(token)
+        self.reset()
+
+    def reset(self):
+        """Start a new utterance."""
+        self._buffer = np.zeros(0, dtype=np.float32)
+        # Absolute sample position of _buffer[0], and of the next chunk center
+        self._buffer_start = 0
+        self._next_center = 0
+        self._received = 0
+        self._last_id = self.blank_id
+        self._last_char = ""
+        self._committed: List[str] = []
+        self.chunks_encoded = 0
+
+    @property
+    def text(self) -> str:
+        """Everything committed so far in this utterance."""
+        return "".join(self._committed).strip()
+
+    def feed(self, audio_chunk: np.ndarray) -> str:
+        """
+        Add audio and encode every chunk whose lookahead has arrived.
+
+        Args:
+            audio_chunk (np.ndarray): Raw audio data (float32), 16kHz.
+
+        Returns:
+            str: Newly committed text (may be empty, or end mid-word).
+        """
+        self._buffer = np.concatenate([self._buffer, audio_chunk])
+        self._received += len(audio_chunk)
+
+        committed = []
+        while self._next_center + self.chunk_samples + self.right_samples <= self._received:
+            committed.append(self._encode_chunk(self.chunk_frames))
+        return "".join(committed)
+
+    def flush(self) -> str:
+        """
+        Encode the remaining audio without lookahead (end of utterance).
+
+        Returns:
+            str: The last committed text.
+        """
+        committed = []
+        while True:
+            # Round up: a trailing partial frame still holds audio. _encode_chunk commits only the
+            # frames the model emits for the last window (a padded static shape covers the partial
+            # frame; a dynamic shape needs a full receptive field, so it may emit fewer)
+            remaining_frames = -(-(self._received - self._next_center) // FRAME_STRIDE)
+            if remaining_frames <= 0:
+                break
+            committed.append(self._encode_chunk(min(self.chunk_frames, remaining_frames)))
+        self._buffer = self._buffer[:0]
+        self._buffer_start = self._received
+        return "".join(committed)
+
+    def _encode_chunk(self, center_frames: int) -> str:
+        """Run one window and commit the CTC frames of its center."""
+        center = self._next_center
+        window_start = max(0, center - self.left_samples)
+        window_end = min(self._received, center + center_frames * FRAME_STRIDE + self.right_samples)
+        window = self._buffer[window_start - self._buffer_start:window_end - self._buffer_start]
+
+        logits = np.asarray(self.transcriber.get_logits(window)[0])  # torch or numpy (SnapshotTranscriber)
+        self.chunks_encoded += 1
+        first = (center - window_start) // FRAME_STRIDE
+        ids = logits[first:first + center_frames].argmax(axis=-1)
+
+        chars = []
+        for idx in ids.tolist():
+            if idx != self._last_id and idx != self.blank_id:
+                char = self._chars[idx]
+                # No leading or doubled word delimiters, as in greedy decoding
+                if char and not (char == " " and self._last_char in ("", " ")):
+                    chars.append(char)
+                    self._last_char = char
+            self._last_id = idx
+        committed = "".join(chars)
+        self._committed.append(committed)
+
+        # Keep only the left context the next chunk needs
+        self._next_center = center + center_frames * FRAME_STRIDE
+        keep_from = max(0, self._next_center - self.left_samples)
+        if keep_from > self._buffer_start:
+            self._buffer = self._buffer[keep_from - self._buffer_start:]
+            self._buffer_start = keep_from
+        return committed
@@ -0,0 +1,163 @@
+import json
+import os
+
+import numpy as np
+import openvino as ov
+import openvino.opset13 as ops
+
+from .utils import FRAME_STRIDE, RECEPTIVE_FIELD
+
+# Character vocabulary of facebook/wav2vec2-base-960h and -large-960h.
+# Keeping the same table means decode paths behave exactly as with the real export.
+WAV2VEC2_VOCAB = [
+    "<pad>", "<s>", "</s>", "<unk>", "|",
+    "E", "T", "A", "O", "N", "I", "H", "S", "R", "D", "L", "U", "M",
+    "W", "C", "F", "G", "Y", "P", "B", "V", "K", "'", "X", "J", "Q", "Z",
+]
+
+
+def num_output_frames(num_samples: int) -> int:
+    """
+    Number of logit frames a Wav2Vec2 encoder emits for the given input length.
+
+    Args:
+        num_samples (int): Input length in samples.
+
+    Returns:
+        int: Output frame count (0 for inputs shorter than the receptive field).
+    """
+    if num_samples < RECEPTIVE_FIELD:
+        return 0
+    return (num_samples - RECEPTIVE_FIELD) // FRAME_STRIDE + 1
+
+
+def _random_weights(rng: np.random.Generator, shape: tuple, fan_in: int) -> np.ndarray:
+    """Scaled normal init so activations stay in a sane range through the layers."""
+    return (rng.standard_normal(shape) / np.sqrt(fan_in)).astype(np.float32)
+
+
+def build_synthetic_model(hidden_size: int = 64, num_layers: int = 2, seed: int = 0,
+                          global_context: bool = False) -> ov.Model:
+    """
+    Build a small random-weight CTC model with the Wav2Vec2 signature.
+
+    The graph takes ``input_values`` of shape [batch, samples] and returns ``logits``
+    of shape [batch, frames, vocab], with the same frame count as the real encoder.
+    Both dimensions are dynamic, so the model can be reshaped to static NPU shapes.
+
+    Args:
+        hidden_size (int): Width of the hidden projections.
+        num_layers (int): Number of hidden dense layers after the conv front-end.
+        seed (int): Seed for the random weights.
+        global_context (bool): Subtract each feature's mean over the whole input, so every
+            frame depends on all of the audio (as normalization and attention do in the real
+            encoder). Zero padding then changes the logits of the real frames.
+
+    Returns:
+        ov.Model: The OpenVINO model.
+    """
+    rng = np.random.default_rng(seed)
+    vocab_size = len(WAV2VEC2_VOCAB)
+
+    input_values = ops.parameter([-1, -1], ov.Type.f32, name="input_values")
+    input_values.output(0).set_names({"input_values"})
+
+    # [B, N] -> [B, 1, N] -> strided conv -> [B, H, T]
+    x = ops.unsqueeze(input_values, ops.constant(np.array([1], dtype=np.int64)))
+    conv_weights = _random_weights(rng, (hidden_size, 1, RECEPTIVE_FIELD), RECEPTIVE_FIELD)
+    x = ops.convolution(x, ops.constant(conv_weights), [FRAME_STRIDE], [0], [0], [1])
+    x = ops.gelu(x, "erf")
+    if global_context:
+        x = ops.subtract(x, ops.reduce_mean(x, ops.constant(np.array([2], dtype=np.int64)), True))
+
+    # [B, H, T] -> [B, T, H]
+    x = ops.transpose(x, ops.constant(np.array([0, 2, 1], dtype=np.int64)))
+
+    for _ in range(num_layers):
+        weights = _random_weights(rng, (hidden_size, hidden_size), hidden_size)
+        x = ops.gelu(ops.matmul(x, ops.constant(weights), False, False), "erf")
+
+    # Sharpen the head and bias it towards blank so outputs look like a trained
+    # CTC model: mostly <pad> frames with occasional character spikes
+    head_weights = 4.0 * _random_weights(rng, (hidden_size, vocab_size), hidden_size)
+    head_bias = np.zeros(vocab_size, dtype=np.float32)
+    head_bias[0] = 2.5
+    logits = ops.add(ops.matmul(x, ops.constant(head_weights), False, False), ops.constant(head_bias))
+    logits.output(0).set_names({"logits"})
+
+    return ov.Model([logits], [input_values], "synthetic_wav2vec2_ctc")
+
+
+def export_synthetic_model(output_dir: str, hidden_size: int = 64, num_layers: int = 2, seed: int = 0,
+                           global_context: bool = False) -> str:
+    """
+    Write a synthetic model directory loadable by ``Transcriber``.
+
+    The directory mirrors an ``optimum-cli export openvino`` Wav2Vec2 export:
+    ``openvino_model.xml/.bin``, ``config.json`` and the processor files
+    (feature extractor + CTC tokenizer with the real vocab).
+
+    Args:
+        output_dir (str): Directory to write to (created if missing).
+        hidden_size (int): Width of the hidden projections.
+        num_layers (int): Number of hidden dense layers.
+        seed (int): Seed for the random weights.
+        global_context (bool): Make every frame depend on the whole input (see build_synthetic_model).
+
+    Returns:
+        str: The output directory.
+    """
+    from transformers import (
+        Wav2Vec2Config,
+        Wav2Vec2CTCTokenizer,
+        Wav2Vec2FeatureExtractor,
+        Wav2Vec2Processor,
+    )
+
+    os.makedirs(output_dir, exist_ok=True)
+
+    model = build_synthetic_model(hidden_size=hidden_size, num_layers=num_layers, seed=seed,
+                                  global_context=global_context)
+    ov.save_model(model, os.path.join(output_dir, "openvino_model.xml"), compress_to_fp16=False)
+
+    config = Wav2Vec2Config(
+        vocab_size=len(WAV2VEC2_VOCAB),
+        hidden_size=hidden_size,
+        num_hidden_layers=num_layers,
+        num_attention_heads=1,
+        intermediate_size=hidden_size,
+        pad_token_id=0,
+        bos_token_id=1,
+        eos_token_id=2,
+    )
+    config.save_pretrained(output_dir)
+
+    vocab_path = os.path.join(output_dir, "vocab.json")
+    with open(vocab_path, "w", encoding="utf-8") as f:
+        json.dump({token: idx for idx, token in enumerate(WAV2VEC2_VOCAB)}, f)
+
+    tokenizer = Wav2Vec2CTCTokenizer(vocab_path, word_delimiter_token="|")
+    feature_extractor = Wav2Vec2FeatureExtractor(
+        feature_size=1,
+        sampling_rate=16000,
+        padding_value=0.0,
+        do_normalize=True,
+        return_attention_mask=False,
+    )
+    Wav2Vec2Processor(feature_extractor=feature_extractor, tokenizer=tokenizer).save_pretrained(output_dir)
+
+    return output_dir
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export a tiny synthetic Wav2Vec2-shaped CTC model")
+    parser.add_argument("output_dir", type=str, help="Directory to write the model to")
+    parser.add_argument("--hidden-size", type=int, default=64)
+    parser.add_argument("--num-layers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    export_synthetic_model(args.output_dir, args.hidden_size, args.num_layers, args.seed)
+    print(f"Synthetic model written to {args.output_dir}")
@@ -0,0 +1,272 @@
+import itertools
+import json
+import os
+import socket
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+import numpy as np
+import openvino as ov
+
+# Profiles live per host, since the best streams/threads depend on the machine
+TUNING_DIR_ENV = "STT_NPU_TUNING_DIR"
+DEFAULT_TUNING_DIR = os.path.join(os.path.expanduser("~"), ".stt_npu")
+
+OBJECTIVES = ("latency", "throughput")
+
+
+def profile_path(tuning_dir: Optional[str] = None) -> str:
+    """
+    Path of this host's tuning profile file.
+
+    Args:
+        tuning_dir (str, optional): Directory override. Defaults to $STT_NPU_TUNING_DIR or ~/.stt_npu.
+
+    Returns:
+        str: Path to ``tuning_<hostname>.json``.
+    """
+    tuning_dir = tuning_dir or os.environ.get(TUNING_DIR_ENV, DEFAULT_TUNING_DIR)
+    return os.path.join(tuning_dir, f"tuning_{socket.gethostname()}.json")
+
+
+def _profile_key(model_path: str, device: str, input_length: int) -> str:
+    return f"{os.path.abspath(model_path)}|{device.upper()}|{input_length}"
+
+
+def _read_profiles(path: str) -> Dict:
+    if not os.path.exists(path):
+        return {"host": socket.gethostname(), "profiles": {}}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_profile(profile: Dict, tuning_dir: Optional[str] = None) -> str:
+    """
+    Store a tuned profile in this host's profile file, replacing any previous one
+    for the same model, device and input length.
+
+    Args:
+        profile (dict): Profile as returned by ``tune``.
+        tuning_dir (str, optional): Directory override.
+
+    Returns:
+        str: Path of the profile file.
+    """
+    path = profile_path(tuning_dir)
+    data = _read_profiles(path)
+    key = _profile_key(profile["model_path"], profile["device"], profile["input_length"])
+    data["profiles"][key] = profile
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_profile(model_path: str, device: str, input_length: Optional[int] = None,
+                 tuning_dir: Optional[str] = None) -> Optional[Dict]:
+    """
+    Look up the tuned profile for a model on a device.
+
+    An exact input-length match is preferred; otherwise any profile for the
+    same model and device is returned.
+
+    Args:
+        model_path (str): Model directory.
+        device (str): Target device.
+        input_length (int, optional): Input length in samples the model will run at.
+        tuning_dir (str, optional): Directory override.
+
+    Returns:
+        dict or None: The profile, or None if this host has none for the model/device.
+    """
+    profiles = _read_profiles(profile_path(tuning_dir))["profiles"]
+    if input_length is not None:
+        exact = profiles.get(_profile_key(model_path, device, input_length))
+        if exact is not None:
+            return exact
+
+    prefix = _profile_key(model_path, device, 0).rsplit("|", 1)[0] + "|"
+    for key, profile in profiles.items():
+        if key.startswith(prefix):
+            return profile
+    return None
+
+
+def candidate_configs(core: ov.Core, device: str) -> List[Dict[str, str]]:
+    """
+    Build the sweep grid of compile properties supported by the device.
+
+    Covers LATENCY/THROUGHPUT hints, stream count, inference threads, CPU
+    pinning and inference precision. Properties the device plugin does not
+    expose are left out rather than failing at compile time.
+
+    Args:
+        core (ov.Core): OpenVINO core.
+        device (str): Target device.
+
+    Returns:
+        list: Property dicts (string values, as accepted by ``ov_config``).
+    """
+    device = device.upper()
+    supported = core.get_property(device, "SUPPORTED_PROPERTIES")
+    cores = os.cpu_count() or 1
+
+    hints = ["LATENCY", "THROUGHPUT"] if "PERFORMANCE_HINT" in supported else [None]
+    streams = [None, "1", "2", "4"] if "NUM_STREAMS" in supported else [None]
+    threads = [None]
+    if "INFERENCE_NUM_THREADS" in supported:
+        threads += [str(n) for n in sorted({max(1, cores // 2), cores})]
+    pinning = [None, "YES", "NO"] if "ENABLE_CPU_PINNING" in supported else [None]
+
+    precisions = [None]
+    if "INFERENCE_PRECISION_HINT" in supported:
+        capabilities = core.get_property(device, "OPTIMIZATION_CAPABILITIES")
+        precisions = ["f32"]
+        if "BF16" in capabilities:
+            precisions.append("bf16")
+        if "FP16" in capabilities and device != "CPU":
+            precisions.append("f16")
+
+    configs = []
+    seen = set()
+    for hint, num_streams, num_threads, pin, precision in itertools.product(hints, streams, threads, pinning, precisions):
+        # LATENCY already means one stream; explicit stream counts only matter for THROUGHPUT
+        if hint == "LATENCY" and num_streams not in (None, "1"):
+            continue
+        config = {}
+        if hint is not None:
+            config["PERFORMANCE_HINT"] = hint
+        if num_streams is not None:
+            config["NUM_STREAMS"] = num_streams
+        if num_threads is not None:
+            config["INFERENCE_NUM_THREADS"] = num_threads
+        if pin is not None:
+            config["ENABLE_CPU_PINNING"] = pin
+        if precision is not None:
+            config["INFERENCE_PRECISION_HINT"] = precision
+
+        signature = tuple(sorted(config.items()))
+        if signature not in seen:
+            seen.add(signature)
+            configs.append(config)
+    return configs
+
+
+def measure_config(core: ov.Core, model: ov.Model, device: str, config: Dict[str, str],
+                   input_length: int, iterations: int = 10) -> Dict:
+    """
+    Compile the model with a config and measure latency and throughput.
+
+    Latency is measured with a single synchronous request; throughput with an
+    async queue sized to the compiled model's optimal request count.
+
+    Args:
+        core (ov.Core): OpenVINO core.
+        model (ov.Model): Model already reshaped to [1, input_length].
+        device (str): Target device.
+        config (dict): Compile properties.
+        input_length (int): Input length in samples.
+        iterations (int): Timed inferences per measurement.
+
+    Returns:
+        dict: ``latency_p50_ms``, ``latency_p95_ms``, ``throughput_ips`` (inferences/s),
+        ``compile_s`` and ``num_requests``.
+    """
+    start = time.perf_counter()
+    compiled = core.compile_model(model, device, config)
+    compile_s = time.perf_counter() - start
+
+    rng = np.random.default_rng(0)
+    audio = (0.1 * rng.standard_normal((1, input_length))).astype(np.float32)
+
+    request = compiled.create_infer_request()
+    request.infer({0: audio})  # warmup
+    latencies = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        request.infer({0: audio})
+        latencies.append(time.perf_counter() - start)
+
+    num_requests = max(1, int(compiled.get_property("OPTIMAL_NUMBER_OF_INFER_REQUESTS")))
+    queue = ov.AsyncInferQueue(compiled, num_requests)
+    total = max(iterations, num_requests * 2)
+    start = time.perf_counter()
+    for _ in range(total):
+        queue.start_async({0: audio})
+    queue.wait_all()
+    throughput_s = time.perf_counter() - start
+
+    latencies_ms = np.array(latencies) * 1000
+    return {
+        "latency_p50_ms": float(np.percentile(latencies_ms, 50)),
+        "latency_p95_ms": float(np.percentile(latencies_ms, 95)),
+        "throughput_ips": total / throughput_s,
+        "compile_s": compile_s,
+        "num_requests": num_requests,
+    }
+
+
+def tune(model_path: str, device: str, input_length: int, objective: str = "latency",
+         iterations: int = 10, configs: Optional[List[Dict[str, str]]] = None) -> Dict:
+    """
+    Sweep compile configs for a model/device/shape and pick the best one.
+
+    Args:
+        model_path (str): Model directory containing ``openvino_model.xml``.
+        device (str): Target device (NPU, CPU, GPU).
+        input_length (int): Static input length in samples to tune for.
+        objective (str): ``latency`` (lowest p50) or ``throughput`` (highest inferences/s).
+        iterations (int): Timed inferences per config.
+        configs (list, optional): Explicit configs to try instead of the default grid.
+
+    Returns:
+        dict: Winning profile with its ``config``, metrics and every trial.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}, got {objective!r}")
+
+    device = device.upper()
+    core = ov.Core()
+    model = core.read_model(os.path.join(model_path, "openvino_model.xml"))
+    model.reshape({"input_values": [1, input_length]})
+
+    if configs is None:
+        configs = candidate_configs(core, device)
+
+    trials = []
+    for config in configs:
+        try:
+            metrics = measure_config(core, model, device, config, input_length, iterations)
+        except Exception as e:
+            print(f"  {config}: failed ({e})")
+            trials.append({"config": config, "error": str(e)})
+            continue
+        print(f"  {config}: p50 {metrics['latency_p50_ms']:.1f}ms | {metrics['throughput_ips']:.1f} inf/s")
+        trials.append({"config": config, **metrics})
+
+    successful = [t for t in trials if "error" not in t]
+    if not successful:
+        raise RuntimeError(f"No config compiled and ran on {device}")
+
+    if objective == "latency":
+        best = min(successful, key=lambda t: (t["latency_p50_ms"], -t["throughput_ips"]))
+    else:
+        best = max(successful, key=lambda t: (t["throughput_ips"], -t["latency_p50_ms"]))
+
+    return {
+        "model_path": os.path.abspath(model_path),
+        "device": device,
+        "input_length": input_length,
+        "objective": objective,
+        "config": best["config"],
+        "latency_p50_ms": best["latency_p50_ms"],
+        "latency_p95_ms": best["latency_p95_ms"],
+        "throughput_ips": best["throughput_ips"],
+        "openvino_version": ov.get_version(),
+        "tuned_at": datetime.now(timezone.utc).isoformat(),
+        "trials": trials,
+    }
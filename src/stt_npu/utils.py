@@ -0,0 +1,136 @@
+import numpy as np
+
+# Audio constants shared by every module; change them here only
+# Wav2Vec2 expects 16kHz mono audio
+SAMPLE_RATE = 16000
+# Frame size matching one Silero VAD window at 16kHz (32ms)
+FRAME_SIZE = 512
+# Capture and VAD block: one Silero window
+BLOCK_SIZE = FRAME_SIZE
+# Wav2Vec2's conv feature encoder has a 400-sample receptive field and a 320-sample stride
+RECEPTIVE_FIELD = 400
+FRAME_STRIDE = 320
+
+
+def frame_energy_db(audio: np.ndarray, frame_size: int = FRAME_SIZE) -> np.ndarray:
+    """
+    Per-frame RMS energy in dBFS.
+
+    Args:
+        audio (np.ndarray): Audio data (float32, range [-1, 1]).
+        frame_size (int): Samples per frame. A trailing partial frame is included.
+
+    Returns:
+        np.ndarray: Energy of each frame in dB (float32).
+    """
+    num_frames = -(-len(audio) // frame_size)
+    padded = np.zeros(num_frames * frame_size, dtype=np.float32)
+    padded[:len(audio)] = audio
+    frames = padded.reshape(num_frames, frame_size)
+    rms = np.sqrt(np.mean(frames * frames, axis=1))
+    return (20 * np.log10(rms + 1e-10)).astype(np.float32)
+
+
+def find_speech_bounds(
+    audio: np.ndarray,
+    speech_probs: np.ndarray = None,
+    vad_threshold: float = 0.5,
+    dynamic_range_db: float = 40.0,
+    floor_db: float = -60.0,
+    margin_samples: int = 3200,
+    frame_size: int = FRAME_SIZE,
+):
+    """
+    Find the first and last speech sample, padded by a safety margin.
+
+    Speech frames come from VAD probabilities when given (one per ``frame_size``
+    block, as produced by the live loop), otherwise from frame energy: a frame
+    counts as speech if it is within ``dynamic_range_db`` of the loudest frame
+    and above ``floor_db``.
+
+    Args:
+        audio (np.ndarray): Audio data (float32).
+        speech_probs (np.ndarray, optional): Per-frame speech probabilities.
+        vad_threshold (float): Probability above which a frame is speech.
+        dynamic_range_db (float): Energy window below the peak frame treated as speech.
+        floor_db (float): Absolute energy below which a frame is never speech.
+        margin_samples (int): Samples kept on each side of the detected speech.
+        frame_size (int): Samples per frame.
+
+    Returns:
+        tuple: (start, end) sample indices; (0, 0) if no speech was found.
+    """
+    if len(audio) == 0:
+        return 0, 0
+
+    if speech_probs is not None:
+        is_speech = np.asarray(speech_probs) > vad_threshold
+    else:
+        energy = frame_energy_db(audio, frame_size)
+        threshold = max(float(energy.max()) - dynamic_range_db, floor_db)
+        is_speech = energy > threshold
+
+    speech_frames = np.flatnonzero(is_speech)
+    if len(speech_frames) == 0:
+        return 0, 0
+
+    start = max(0, int(speech_frames[0]) * frame_size - margin_samples)
+    end = min(len(audio), (int(speech_frames[-1]) + 1) * frame_size + margin_samples)
+    return start, end
+
+
+def trim_silence(audio: np.ndarray, speech_probs: np.ndarray = None, **kwargs):
+    """
+    Drop non-speech edges from an audio clip, keeping a safety margin.
+
+    Args:
+        audio (np.ndarray): Audio data (float32).
+        speech_probs (np.ndarray, optional): Per-frame speech probabilities.
+        **kwargs: Passed to ``find_speech_bounds``.
+
+    Returns:
+        tuple: (trimmed audio view, number of samples removed).
+    """
+    start, end = find_speech_bounds(audio, speech_probs, **kwargs)
+    return audio[start:end], len(audio) - (end - start)
+
+
+def edit_distance(reference: list, hypothesis: list) -> int:
+    """
+    Levenshtein distance between two token sequences.
+
+    Args:
+        reference (list): Reference tokens.
+        hypothesis (list): Hypothesis tokens.
+
+    Returns:
+        int: Minimum number of substitutions, insertions and deletions.
+    """
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref in enumerate(reference, 1):
+        current = [i]
+        for j, hyp in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref != hyp)))
+        previous = current
+    return previous[-1]
+
+
+def error_rate(reference: str, hypothesis: str, unit: str = "word") -> float:
+    """
+    Word or character error rate of a hypothesis against a reference.
+
+    Args:
+        reference (str): Reference text.
+        hypothesis (str): Hypothesis text.
+        unit (str): ``word`` (WER) or ``char`` (CER, spaces ignored).
+
+    Returns:
+        float: Errors per reference unit (0.0 if both are empty).
+    """
+    if unit == "word":
+        ref, hyp = reference.split(), hypothesis.split()
+    else:
+        ref, hyp = list(reference.replace(" ", "")), list(hypothesis.replace(" ", ""))
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    return edit_distance(ref, hyp) / len(ref)
@@ -5,7 +5,14 @@ import torch
 class VoiceActivityDetector:
     """
     Wrapper for Silero VAD.
+
+    Silero is stateful across calls (RNN state plus the last 64 samples of
+    context). ``get_state``/``set_state`` let one loaded model serve many
+    streams by swapping that state in and out per stream.
     """
+    # Attributes of the Silero model that carry one stream's state
+    STATE_ATTRIBUTES = ("_state", "_context", "_last_sr", "_last_batch_size")
+
     def __init__(self, threshold: float = 0.5):
         """
         Initialize Silence VAD.
@@ -19,13 +26,23 @@ class VoiceActivityDetector:
         # Using trust_repo=True as Silero is a trusted source in this context
         # We load the onnx version if available, or the standard jit version
         # For simplicity in this "Basic Test" we use the torch hub load which is standard
-        self.model, utils = torch.hub.load(
-            repo_or_dir='snakers4/silero-vad',
-            model='silero_vad',
-            force_reload=False,
-            onnx=False  # Using JIT for simplicity, can switch to ONNX for NPU later if supported
-        )
-        self.get_speech_timestamps = utils[0]
+        try:
+            self.model, utils = torch.hub.load(
+                repo_or_dir='snakers4/silero-vad',
+                model='silero_vad',
+                force_reload=False,
+                onnx=False  # Using JIT for simplicity, can switch to ONNX for NPU later if supported
+            )
+            self.get_speech_timestamps = utils[0]
+        except Exception as e:
+            # Offline without a hub cache: the silero-vad package (requirements.txt) ships the same JIT model
+            try:
+                from silero_vad import get_speech_timestamps, load_silero_vad
+            except ImportError:
+                raise e
+            print(f"torch.hub unavailable ({e}); loading Silero VAD from the silero-vad package")
+            self.model = load_silero_vad()
+            self.get_speech_timestamps = get_speech_timestamps
         
     def is_speech(self, audio_chunk: np.ndarray, sample_rate: int = 16000) -> bool:
         """
@@ -38,6 +55,19 @@ class VoiceActivityDetector:
         Returns:
             bool: True if speech detected, False otherwise.
         """
+        return self.speech_probability(audio_chunk, sample_rate) > self.threshold
+
+    def speech_probability(self, audio_chunk: np.ndarray, sample_rate: int = 16000) -> float:
+        """
+        Speech probability of the given audio chunk.
+        
+        Args:
+            audio_chunk (np.ndarray): Audio data (float32).
+            sample_rate (int): Sample rate (must be 8000 or 16000).
+            
+        Returns:
+            float: Probability (0.0 to 1.0) that the chunk contains speech.
+        """
         # Ensure input is torch tensor
         if isinstance(audio_chunk, np.ndarray):
             audio_tensor = torch.from_numpy(audio_chunk)
@@ -54,7 +84,33 @@ class VoiceActivityDetector:
         # Note: Silero VAD is typically stateful for streaming, but 'silero_vad' model call returns probability
         # for the whole chunk or streaming context.
         # For this basic implementation, we just check probability of the chunk.
-        
-        speech_prob = self.model(audio_tensor, sample_rate).item()
-        
-        return speech_prob > self.threshold
+        # No autograd: with it, every call extends a graph hanging off the RNN state
+        with torch.no_grad():
+            return self.model(audio_tensor, sample_rate).item()
+
+    def get_state(self) -> tuple:
+        """
+        Snapshot of the streaming state (about 1.3KB for one 16kHz stream).
+
+        Returns:
+            tuple: Values of ``STATE_ATTRIBUTES``, for ``set_state``.
+        """
+        state = tuple(getattr(self.model, name) for name in self.STATE_ATTRIBUTES)
+        context = state[1]
+        if isinstance(context, torch.Tensor) and context._base is not None:
+            # The context is a slice of the last input window; keep only its 64 samples
+            state = (state[0], context.clone()) + state[2:]
+        return state
+
+    def set_state(self, state: tuple = None):
+        """
+        Restore a snapshot from ``get_state``, or start a fresh stream if None.
+
+        Args:
+            state (tuple, optional): A previous ``get_state()`` result.
+        """
+        if state is None:
+            self.model.reset_states()
+            return
+        for name, value in zip(self.STATE_ATTRIBUTES, state):
+            setattr(self.model, name, value)
@@ -0,0 +1,13 @@
+import pytest
+from src.stt_npu.synthetic import export_synthetic_model
+
+@pytest.fixture(scope="session")
+def synthetic_model_dir(tmp_path_factory):
+    """A tiny random-weight Wav2Vec2-shaped model directory, exported once per test run."""
+    return export_synthetic_model(str(tmp_path_factory.mktemp("synthetic_wav2vec2")))
+
+@pytest.fixture(autouse=True)
+def isolated_tuning_dir(tmp_path, monkeypatch):
+    """Keep tests from reading or writing this host's real tuning profiles."""
+    monkeypatch.setenv("STT_NPU_TUNING_DIR", str(tmp_path / "tuning"))
+    return str(tmp_path / "tuning")
@@ -0,0 +1,79 @@
+import time
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+from src.stt_npu.adaptive import AdaptiveTranscriber, latency_percentiles
+
+def make_tier(name, delay_s):
+    tier = MagicMock()
+    tier.model_path = name
+    tier.transcribe.side_effect = lambda audio: time.sleep(delay_s) or name
+    return tier
+
+def test_choose_tier_degrades_and_recovers_with_hysteresis():
+    """Test the SLO prediction picks the cheaper tier under backlog and needs headroom to move back."""
+    server = AdaptiveTranscriber([make_tier("large", 0), make_tier("base", 0)],
+                                 latency_slo_ms=1000, max_queue_depth=20, warmup=False)
+    server.service_time = [0.2, 0.05]
+    
+    assert server.choose_tier(waited_s=0.0, depth=2) == 0  # 0.6s predicted
+    assert server.choose_tier(waited_s=0.3, depth=4) == 1  # 1.3s predicted
+    assert server.choose_tier(waited_s=0.0, depth=30) == 1  # queue cap
+    server.level = 1
+    assert server.choose_tier(waited_s=0.0, depth=2) == 1  # fits the SLO, not half of it
+    assert server.choose_tier(waited_s=0.0, depth=0) == 0
+    server.close()
+
+def test_short_shape_tier_serves_only_audio_that_fits():
+    """Test a short static-shape tier of the same model serves short requests undegraded and is skipped for long ones."""
+    short, full, base = make_tier("large", 0), make_tier("large", 0), make_tier("base", 0)
+    short.static_length, full.static_length, base.static_length = 5 * 16000, 30 * 16000, None
+    
+    with AdaptiveTranscriber([short, full, base], latency_slo_ms=1000, warmup=False) as server:
+        server.service_time = [0.1, 0.5, 0.05]
+        assert server.choose_tier(waited_s=0.0, depth=0, num_samples=3 * 16000) == 0
+        assert server.choose_tier(waited_s=0.0, depth=0, num_samples=10 * 16000) == 1
+        assert server.choose_tier(waited_s=0.0, depth=3, num_samples=10 * 16000) == 2  # 2.0s on the 30s shape
+        
+        results = [server.transcribe(np.zeros(n, dtype=np.float32)) for n in (3 * 16000, 10 * 16000)]
+    
+    assert [(r.tier, r.degraded) for r in results] == [(0, False), (1, False)]
+    short.transcribe.assert_called_once()
+
+def test_burst_is_served_degraded_and_labeled():
+    """Test a burst shifts requests to the fallback, labels them, and reports stats."""
+    large, base = make_tier("large", 0.05), make_tier("base", 0.001)
+    audio = np.zeros(16000, dtype=np.float32)
+    
+    with AdaptiveTranscriber([large, base], latency_slo_ms=120, warmup=False) as server:
+        server.service_time = [0.05, 0.001]
+        results = [f.result() for f in [server.submit(audio) for _ in range(10)]]
+        stats = server.stats
+    
+    assert any(r.degraded and r.model_path == "base" and r.text == "base" for r in results)
+    assert all(r.degraded == (r.tier == 1) for r in results)
+    assert stats["degraded"] == sum(r.degraded for r in results)
+    assert sum(stats["served"]) == 10
+    assert latency_percentiles(results)["p99_ms"] >= latency_percentiles(results)["p50_ms"]
+
+def test_errors_propagate_to_future():
+    """Test a failing transcription surfaces on the request's future without stopping the worker."""
+    tier = make_tier("large", 0)
+    tier.transcribe.side_effect = [RuntimeError("device lost"), "ok"]
+    
+    with AdaptiveTranscriber([tier], warmup=False) as server:
+        with pytest.raises(RuntimeError):
+            server.transcribe(np.zeros(16000, dtype=np.float32))
+        assert server.transcribe(np.zeros(16000, dtype=np.float32)).text == "ok"
+
+def test_warmup_runs_inference_on_trimming_tier(synthetic_model_dir):
+    """Test the warm-up seeds the estimate from real inference even when the tier trims silence."""
+    from src.stt_npu.core import Transcriber
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU", trim_silence=True)
+    infer = MagicMock(wraps=transcriber._infer)
+    transcriber._infer = infer
+    
+    with AdaptiveTranscriber([transcriber], warmup_s=3.0) as server:
+        assert infer.call_count == 2
+        assert infer.call_args.args[0].shape[-1] == 48000
+        assert server.service_time[0] > 0
@@ -0,0 +1,71 @@
+from unittest.mock import patch
+import numpy as np
+from src.stt_npu.cache import TranscriptCache, audio_key
+from src.stt_npu.core import Transcriber
+from src.stt_npu.decoding import CTCBeamSearchDecoder
+from src.stt_npu.synthetic import WAV2VEC2_VOCAB
+
+def test_audio_key_hashes_exact_samples_and_separates_settings():
+    """Test keys ignore the array dtype but change with audio below 16-bit resolution, identity and VAD probabilities."""
+    pcm = np.random.default_rng(0).integers(-3000, 3000, 16000).astype(np.int16)
+    audio = pcm.astype(np.float32) / 32768
+    
+    assert audio_key(audio, "m") == audio_key(pcm.astype(np.float64) / 32768, "m")
+    assert audio_key(audio, "m") != audio_key(audio + np.float32(1e-6), "m")  # Same int16 samples
+    assert audio_key(audio, "m") != audio_key(audio[:-1], "m")
+    assert audio_key(audio, "m") != audio_key(audio, "other")
+    assert audio_key(audio, "m") != audio_key(audio, "m", np.ones(32))
+
+def test_lru_eviction_and_counters():
+    """Test the memory tier evicts least recently used entries and counts hits/misses."""
+    cache = TranscriptCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # "b" is now least recently used
+    cache.put("c", "C")
+    
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    assert cache.stats["hits"] == 2
+    assert cache.stats["misses"] == 1
+    assert cache.stats["evictions"] == 1
+
+def test_disk_tier_survives_restart(tmp_path):
+    """Test entries persist in SQLite, are promoted on a disk hit, and the disk bound is enforced."""
+    db_path = str(tmp_path / "cache" / "transcripts.sqlite")
+    cache = TranscriptCache(max_entries=1, db_path=db_path, max_disk_entries=2)
+    for key in ("a", "b", "c"):
+        cache.put(key, key.upper())
+    assert cache.stats["disk_evictions"] == 1
+    cache.close()
+    
+    restarted = TranscriptCache(max_entries=1, db_path=db_path)
+    assert restarted.get("a") is None
+    assert restarted.get("b") == "B"
+    assert restarted.get("b") == "B"
+    assert restarted.stats["disk_hits"] == 1
+    assert restarted.stats["hits"] == 1
+
+def test_transcriber_serves_repeats_from_cache(synthetic_model_dir):
+    """Test repeated audio skips inference and a different decoder does not share entries."""
+    cache = TranscriptCache()
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU", cache=cache)
+    audio = (0.1 * np.random.default_rng(0).standard_normal(16000)).astype(np.float32)
+    
+    text = transcriber.transcribe(audio)
+    with patch.object(transcriber, "get_logits_batch") as get_logits_batch:
+        assert transcriber.transcribe(audio.copy()) == text
+        assert transcriber.transcribe_batch([audio, audio]) == [text, text]
+        get_logits_batch.assert_not_called()
+    assert cache.stats["hits"] == 3
+    
+    beam = Transcriber(model_path=synthetic_model_dir, device="CPU", cache=cache,
+                       decoder=CTCBeamSearchDecoder(WAV2VEC2_VOCAB, beam_width=4))
+    assert beam.cache_identity != transcriber.cache_identity
+    beam.transcribe(audio)
+    assert cache.stats["misses"] == 2
+    
+    # Compile properties and the batch size change the logits, so they key separately too
+    for settings in [dict(ov_config={"INFERENCE_PRECISION_HINT": "bf16"}), dict(batch_size=2)]:
+        other = Transcriber(model_path=synthetic_model_dir, device="CPU", cache=cache, **settings)
+        assert other.cache_identity != transcriber.cache_identity
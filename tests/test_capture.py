@@ -0,0 +1,64 @@
+import threading
+import pytest
+import numpy as np
+from src.stt_npu.capture import CaptureRing
+
+def int16_blocks(num_blocks, block_size=512, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(-32768, 32767, (num_blocks, block_size, 1)).astype(np.int16)
+
+def test_reads_scale_int16_across_wraparound():
+    """Test blocks written through the wrap point read back as int16 / 32768, and utterances by position."""
+    ring = CaptureRing(seconds=0.2, block_size=512)  # 3072 frames = 6 blocks
+    blocks = int16_blocks(10)
+    reads = []
+    for block in blocks:
+        ring.callback(block, 512, None, None)
+        reads.append(ring.read().copy())
+    
+    expected = blocks[:, :, 0].astype(np.float32) / 32768
+    np.testing.assert_array_equal(np.stack(reads), expected)
+    # The last 5 blocks straddle the end of the ring
+    np.testing.assert_array_equal(ring.get_range(5 * 512, 10 * 512), expected[5:].reshape(-1))
+    with pytest.raises(ValueError):
+        ring.get_range(0, 512)  # Overwritten
+
+def test_overrun_skips_ahead_and_counts():
+    """Test a reader lapped by the writer skips to recent audio and records what it lost."""
+    ring = CaptureRing(seconds=0.2, block_size=512)
+    blocks = int16_blocks(8)
+    for block in blocks:
+        ring.write(block)
+    
+    block = ring.read()
+    
+    assert ring.overruns == 3 * 512
+    np.testing.assert_array_equal(block, blocks[3, :, 0] / np.float32(32768))
+    # An utterance that began before the lap is fetched from the oldest frame still held
+    assert ring.oldest_position == 3 * 512
+    np.testing.assert_array_equal(ring.get_range(ring.oldest_position, ring.read_position), block)
+
+def test_wait_wakes_on_write():
+    """Test a blocked reader is woken by the callback and a timeout reports no data."""
+    ring = CaptureRing(seconds=1, dtype="float32", channels=2, block_size=512)
+    assert not ring.wait(timeout=0.01)
+    
+    writer = threading.Timer(0.05, ring.write, args=(np.ones((512, 2), dtype=np.float32),))
+    writer.start()
+    assert ring.wait(timeout=5)
+    assert ring.read().shape == (512, 2)
+    writer.join()
+
+def test_seek_rereads_past_audio():
+    """Test seeking back re-reads audio still in the ring and seeking outside it fails."""
+    ring = CaptureRing(seconds=0.2, block_size=512)
+    blocks = int16_blocks(5)
+    for block in blocks:
+        ring.write(block)
+        ring.read()
+    
+    ring.seek(2 * 512)
+    np.testing.assert_array_equal(ring.read(), blocks[2, :, 0] / np.float32(32768))
+    assert ring.available == 2 * 512
+    with pytest.raises(ValueError):
+        ring.seek(6 * 512)  # Not written yet
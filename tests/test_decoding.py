@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+from src.stt_npu.core import Transcriber
+from src.stt_npu.decoding import CTCBeamSearchDecoder, NGramLM, greedy_decode, load_vocab
+from src.stt_npu.synthetic import WAV2VEC2_VOCAB
+
+VOCAB = WAV2VEC2_VOCAB
+
+def peaky_logits(text, frames_per_char=3):
+    """Confident CTC logits spelling ``text``, one spike per character."""
+    logits = np.zeros((len(text) * frames_per_char + 2, len(VOCAB)), dtype=np.float32)
+    logits[:, 0] = 15.0
+    for i, char in enumerate(text):
+        row = 1 + i * frames_per_char
+        logits[row, 0] = 0.0
+        logits[row, VOCAB.index("|" if char == " " else char)] = 15.0
+    return logits
+
+def make_ambiguous(logits, row, token, margin=0.5):
+    """Give ``token`` a logit just below the winning one at ``row``."""
+    logits[row, VOCAB.index(token)] = logits[row].max() - margin
+    return logits
+
+def test_greedy_decode_collapses_repeats_and_blanks():
+    """Test greedy decoding collapses repeats and keeps double letters split by blank."""
+    logits = peaky_logits("HELLO WORLD")
+    
+    assert greedy_decode(logits, VOCAB) == "HELLO WORLD"
+
+def test_beam_search_matches_greedy_on_confident_logits():
+    """Test beam search returns the greedy path when the acoustics are unambiguous."""
+    logits = peaky_logits("THE DOG WAS LYING ON THE GRASS")
+    
+    assert CTCBeamSearchDecoder(VOCAB, beam_width=8).decode(logits) == "THE DOG WAS LYING ON THE GRASS"
+
+def test_hotword_boost_flips_close_call():
+    """Test a boosted hotword wins a near-tie but does not change unrelated text."""
+    logits = make_ambiguous(peaky_logits("THE FOX"), 1 + 5 * 3, "I")
+    
+    assert CTCBeamSearchDecoder(VOCAB).decode(logits) == "THE FOX"
+    assert CTCBeamSearchDecoder(VOCAB, hotwords={"fix": 5.0}).decode(logits) == "THE FIX"
+
+def test_lexicon_constrains_words():
+    """Test hypotheses leaving the lexicon are pruned."""
+    logits = make_ambiguous(peaky_logits("THE FOX"), 1 + 5 * 3, "I", margin=2.0)
+    
+    assert CTCBeamSearchDecoder(VOCAB, lexicon=["THE", "FIX"]).decode(logits) == "THE FIX"
+
+def test_lexicon_generator_and_fingerprint():
+    """Test a generator lexicon constrains decoding and is normalized into the fingerprint."""
+    logits = make_ambiguous(peaky_logits("THE FOX"), 1 + 5 * 3, "I", margin=2.0)
+    decoder = CTCBeamSearchDecoder(VOCAB, lexicon=(word for word in ["the", "fix"]))
+
+    assert decoder.decode(logits) == "THE FIX"
+    assert decoder.fingerprint() == CTCBeamSearchDecoder(VOCAB, lexicon=["THE", " FIX"]).fingerprint()
+    assert decoder.fingerprint() != CTCBeamSearchDecoder(VOCAB).fingerprint()
+    assert decoder.fingerprint() != CTCBeamSearchDecoder(VOCAB, lexicon=[]).fingerprint()
+
+def test_arpa_lm_backoff_and_rescoring(tmp_path):
+    """Test ARPA loading, back-off scoring, and the LM choosing between acoustic near-ties."""
+    arpa = tmp_path / "lm.arpa"
+    arpa.write_text(
+        "\\data\\\nngram 1=5\nngram 2=2\n\n"
+        "\\1-grams:\n-1.0 <s> -0.3\n-1.0 </s>\n-0.5 the -0.2\n-2.0 fox\n-1.0 fix\n\n"
+        "\\2-grams:\n-0.1 <s> the\n-0.2 the fix\n\n\\end\\\n"
+    )
+    lm = NGramLM.from_arpa(str(arpa))
+    logits = make_ambiguous(peaky_logits("THE FOX"), 1 + 5 * 3, "I")
+    
+    assert lm.order == 2
+    assert lm.score(["THE"], "FIX") == pytest.approx(-0.2 * np.log(10))
+    # Unseen bigram backs off: backoff(THE) + P(FOX)
+    assert lm.score(["THE"], "FOX") == pytest.approx((-0.2 - 2.0) * np.log(10))
+    assert CTCBeamSearchDecoder(VOCAB, lm=lm, alpha=1.0).decode(logits) == "THE FIX"
+
+def test_transcriber_uses_beam_decoder(synthetic_model_dir):
+    """Test Transcriber routes decoding through a beam search decoder when given one."""
+    decoder = CTCBeamSearchDecoder.from_pretrained(synthetic_model_dir, beam_width=4)
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU", decoder=decoder)
+    audio = (0.1 * np.random.default_rng(0).standard_normal(32000)).astype(np.float32)
+    
+    logits = transcriber._infer(transcriber._preprocess(audio))[0].numpy()
+    
+    assert load_vocab(synthetic_model_dir) == VOCAB
+    assert transcriber.transcribe(audio) == decoder.decode(logits)
@@ -0,0 +1,128 @@
+import threading
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+from src.stt_npu.core import Transcriber
+from src.stt_npu.hotswap import HotSwapTranscriber
+from src.stt_npu.ipc import TranscriptionClient, TranscriptionDaemon
+
+class NamedTranscriber:
+    """Answers with its model path; optionally blocks until released."""
+    def __init__(self, model_path, device="CPU", gate=None):
+        self.model_path = model_path
+        self.device = device
+        self.gate = gate
+        self.started = threading.Event()
+    
+    def transcribe(self, audio, speech_probs=None):
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(5)
+        return self.model_path
+    
+    def get_logits(self, audio):
+        return np.zeros((1, 0, 32), dtype=np.float32)
+
+def test_switches_new_requests_and_drains_in_flight():
+    """Test a request running during the swap finishes on the old engine, which is then released."""
+    gate = threading.Event()
+    old = NamedTranscriber("old", gate=gate)
+    engine = HotSwapTranscriber(old, factory=NamedTranscriber)
+    results = []
+    worker = threading.Thread(target=lambda: results.append(engine.transcribe(np.zeros(10))))
+    worker.start()
+    assert old.started.wait(5)
+    
+    new = engine.reload("new").result(timeout=5)
+    
+    assert engine.current is new and engine.transcribe(np.zeros(10)) == "new"
+    assert engine.stats()["draining"] == 1
+    gate.set()
+    worker.join(5)
+    assert results == ["old"]
+    assert engine.stats()["draining"] == 0 and engine.swaps == 1
+
+def test_failed_reload_keeps_serving():
+    """Test a replacement that fails to load leaves the current engine in place."""
+    def broken_factory(model_path, **kwargs):
+        raise RuntimeError("compile failed")
+    engine = HotSwapTranscriber(NamedTranscriber("current"), factory=broken_factory)
+    
+    with pytest.raises(RuntimeError, match="compile failed"):
+        engine.reload("bad").result(timeout=5)
+    
+    assert engine.transcribe(np.zeros(10)) == "current"
+    assert engine.swaps == 0
+
+def test_one_reload_at_a_time_and_attributes_forwarded():
+    """Test overlapping reloads are refused and Transcriber attributes come from the current engine."""
+    gate = threading.Event()
+    engine = HotSwapTranscriber(NamedTranscriber("a"), factory=lambda **kwargs: gate.wait(5) and NamedTranscriber(**kwargs))
+    future = engine.reload("b", warmup=False)
+    
+    with pytest.raises(RuntimeError):
+        engine.reload("c")
+    assert engine.model_path == "a" and engine.device == "CPU"
+    gate.set()
+    future.result(timeout=5)
+    assert engine.model_path == "b"
+
+def test_warmup_runs_inference_on_trimming_transcriber(synthetic_model_dir):
+    """Test the replacement is warmed by real inferences even when it trims silence."""
+    calls = []
+    
+    def factory(**kwargs):
+        transcriber = Transcriber(trim_silence=True, **kwargs)
+        transcriber._infer = MagicMock(wraps=transcriber._infer)
+        calls.append(transcriber._infer)
+        return transcriber
+    
+    engine = HotSwapTranscriber(NamedTranscriber(synthetic_model_dir), factory=factory)
+    engine.reload().result(timeout=60)
+    
+    assert calls[0].call_count == 2
+    assert engine.last_warmup_s > 0
+
+def test_daemon_reload_over_ipc(tmp_path):
+    """Test a client can hot-swap the daemon's model and keep transcribing."""
+    models = tmp_path / "models"
+    daemon = TranscriptionDaemon(HotSwapTranscriber(NamedTranscriber("first"), factory=NamedTranscriber),
+                                 str(tmp_path / "stt.sock"), model_root=str(models))
+    daemon.start()
+    try:
+        with TranscriptionClient(daemon.address, ring_seconds=1.0) as client:
+            assert client.transcribe(np.ones(100, dtype=np.float32)) == "first"
+            assert client.reload(str(models / "second")).result(timeout=5) == str(models / "second")
+            assert client.transcribe(np.ones(100, dtype=np.float32)) == str(models / "second")
+            # Only models under the root, however the path is spelled
+            for outside in [str(tmp_path / "other"), str(models / ".." / "other")]:
+                with pytest.raises(RuntimeError, match="not allowed"):
+                    client.reload(outside).result(timeout=5)
+            assert client.transcribe(np.ones(100, dtype=np.float32)) == str(models / "second")
+    finally:
+        daemon.stop()
+
+def test_daemon_without_model_root_reloads_only_current_model(tmp_path):
+    """Test a daemon started without a model root refuses other models but reloads the current one."""
+    daemon = TranscriptionDaemon(HotSwapTranscriber(NamedTranscriber("first"), factory=NamedTranscriber),
+                                 str(tmp_path / "stt.sock"))
+    daemon.start()
+    try:
+        with TranscriptionClient(daemon.address, ring_seconds=1.0) as client:
+            with pytest.raises(RuntimeError, match="not allowed"):
+                client.reload("second").result(timeout=5)
+            assert client.reload().result(timeout=5) == "first"
+    finally:
+        daemon.stop()
+
+def test_daemon_without_hotswap_rejects_reload(tmp_path):
+    """Test reload on a plain Transcriber comes back as an error on the future."""
+    daemon = TranscriptionDaemon(NamedTranscriber("plain"), str(tmp_path / "stt.sock"))
+    daemon.start()
+    try:
+        with TranscriptionClient(daemon.address, ring_seconds=1.0) as client:
+            with pytest.raises(RuntimeError, match="does not support reload"):
+                client.reload("other").result(timeout=5)
+            assert client.transcribe(np.ones(100, dtype=np.float32)) == "plain"
+    finally:
+        daemon.stop()
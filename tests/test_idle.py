@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.stt_npu.capture import CaptureRing
+from src.stt_npu.idle import IdleMonitor, block_levels_db
+
+
+def write_blocks(ring, num_blocks, amplitude, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(num_blocks):
+        ring.write((amplitude * rng.standard_normal((512, 1))).astype(np.int16))
+
+
+def test_block_levels_db():
+    """Test RMS levels of full-scale, quiet and silent blocks."""
+    audio = np.concatenate([np.ones(512), 0.01 * np.ones(512), np.zeros(512)]).astype(np.float32)
+    np.testing.assert_allclose(block_levels_db(audio), [0.0, -40.0, -100.0], atol=1e-3)
+
+
+def test_goes_idle_after_quiet_period():
+    """Test speech resets the quiet timer and the monitor goes idle once, after idle_after_s."""
+    monitor = IdleMonitor(idle_after_s=1.0)
+    transitions = [monitor.observe(False) for _ in range(20)]
+    monitor.observe(True)
+    assert not any(transitions) and not monitor.is_idle
+
+    transitions = [monitor.observe(False) for _ in range(40)]
+    assert transitions.count(True) == 1 and transitions.index(True) == 31  # 32 blocks = 1.024s
+    assert monitor.is_idle and monitor.idle_periods == 1
+
+
+def test_quiet_poll_skips_audio_and_tracks_floor():
+    """Test idle polls consume the captured blocks without waking on room noise."""
+    ring = CaptureRing(seconds=2, block_size=512)
+    monitor = IdleMonitor(idle_after_s=0.0)
+    monitor.observe(False)
+    write_blocks(ring, 10, amplitude=20)  # About -64 dBFS
+
+    assert monitor.poll(ring) is None
+    assert ring.read_position == ring.write_position
+    assert monitor.is_idle and monitor.checks == 1
+    assert -66 < monitor.noise_floor_db < -62
+    assert monitor.wake_level_db == monitor.threshold_db
+
+
+def test_wake_rewinds_to_preroll_and_prewarms():
+    """Test a loud block wakes the monitor, rewinds the ring before the onset and calls on_wake."""
+    ring = CaptureRing(seconds=2, block_size=512)
+    warmups = []
+    monitor = IdleMonitor(idle_after_s=0.0, preroll_s=0.1, on_wake=lambda: warmups.append(1))
+    monitor.observe(False)
+    write_blocks(ring, 10, amplitude=20)
+    monitor.poll(ring)
+
+    write_blocks(ring, 4, amplitude=20)
+    onset = ring.write_position
+    write_blocks(ring, 3, amplitude=8000)
+    resume = monitor.poll(ring)
+
+    assert resume == onset - 3 * 512  # 0.1s rounds down to 3 blocks
+    assert ring.read_position == resume
+    assert not monitor.is_idle and monitor.wakeups == 1
+    assert warmups == [1]
+
+
+def test_wake_level_follows_noisy_room():
+    """Test steady noise above the fixed threshold raises the wake level instead of waking."""
+    ring = CaptureRing(seconds=2, block_size=512)
+    monitor = IdleMonitor(idle_after_s=0.0, threshold_db=-80.0, margin_db=10.0)
+    monitor.observe(False)
+    write_blocks(ring, 10, amplitude=200)  # About -44 dBFS, above -80
+
+    assert monitor.poll(ring) is None
+    assert -46 < monitor.noise_floor_db < -42
+    assert -36 < monitor.wake_level_db < -32
+
+    write_blocks(ring, 2, amplitude=8000, seed=1)
+    assert monitor.poll(ring) is not None
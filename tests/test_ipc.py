@@ -0,0 +1,57 @@
+import json
+import os
+import socket
+import pytest
+import numpy as np
+from src.stt_npu.ipc import TranscriptionClient, TranscriptionDaemon
+
+class EchoTranscriber:
+    """Reports the length and first sample of the audio it was handed."""
+    def transcribe(self, audio):
+        if audio[0] < 0:
+            raise ValueError("bad audio")
+        return f"{len(audio)}:{audio[0]:.0f}"
+
+@pytest.fixture
+def daemon(tmp_path):
+    server = TranscriptionDaemon(EchoTranscriber(), str(tmp_path / "stt.sock"))
+    server.start()
+    yield server
+    server.stop()
+
+def test_round_trip_through_shared_ring(daemon):
+    """Test pipelined requests wrap around a small ring and resolve in order with the right audio."""
+    with TranscriptionClient(daemon.address, ring_seconds=1.0) as client:
+        futures = [client.submit(np.full(6000, i, dtype=np.float32)) for i in range(12)]
+        
+        assert [f.result(timeout=5) for f in futures] == [f"6000:{i}" for i in range(12)]
+        assert client.transcribe(np.ones(16000, dtype=np.float32)) == "16000:1"
+        with pytest.raises(ValueError):
+            client.submit(np.zeros(16001, dtype=np.float32))
+    assert daemon.requests_served == 13
+
+def test_errors_come_back_on_the_future(daemon):
+    """Test a failing request raises on its future and the connection stays usable."""
+    with TranscriptionClient(daemon.address, ring_seconds=1.0) as client:
+        with pytest.raises(RuntimeError, match="bad audio"):
+            client.transcribe(np.full(100, -1, dtype=np.float32))
+        assert client.transcribe(np.full(100, 2, dtype=np.float32)) == "100:2"
+
+def test_daemon_reads_only_the_ring_it_handed_out(daemon):
+    """Test the socket is owner-only, the ring is allocated once, and requests outside it are refused."""
+    assert os.stat(daemon.address).st_mode & 0o777 == 0o600
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(daemon.address)
+        reader = sock.makefile("rb")
+        
+        def request(message):
+            sock.sendall((json.dumps(message) + "\n").encode("utf-8"))
+            return json.loads(reader.readline())
+        
+        assert "error" in request({"op": "transcribe", "id": 0, "offset": 0, "length": 10})  # No ring yet
+        assert "error" in request({"op": "hello", "samples": daemon.max_ring_samples + 1})
+        assert request({"op": "hello", "samples": 1000})["op"] == "ready"
+        assert "error" in request({"op": "hello", "samples": 1000})
+        for offset, length in [(990, 20), (-10, 10), (0, -1)]:
+            assert "outside the shared ring" in request({"op": "transcribe", "id": 1, "offset": offset, "length": length})["error"]
+    assert daemon.requests_served == 0
@@ -0,0 +1,110 @@
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+import torch
+from src.stt_npu.kws import KeywordScorer, KeywordSpotter
+from src.stt_npu.synthetic import WAV2VEC2_VOCAB
+
+VOCAB = WAV2VEC2_VOCAB
+
+def peaky_logits(text, frames_per_char=3, lead_frames=1):
+    """Confident CTC logits spelling ``text``, one spike per character."""
+    logits = np.zeros((lead_frames + len(text) * frames_per_char + 1, len(VOCAB)), dtype=np.float32)
+    logits[:, 0] = 15.0
+    for i, char in enumerate(text):
+        row = lead_frames + i * frames_per_char
+        logits[row, 0] = 0.0
+        logits[row, VOCAB.index("|" if char == " " else char)] = 15.0
+    return logits
+
+def test_detects_phrase_with_timing():
+    """Test a phrase is found with start/end frames at its first and last character."""
+    scorer = KeywordScorer(VOCAB, ["stop", "go home"])
+    
+    hits = scorer.detect(peaky_logits("PLEASE STOP NOW"))
+    
+    assert [hit.keyword for hit in hits] == ["STOP"]
+    hit = hits[0]
+    assert hit.confidence > 0.9
+    # "STOP" starts at character 7, 3 frames per character, 20ms frames
+    assert hit.start_time == pytest.approx((1 + 7 * 3) * 0.02)
+    assert hit.end_time == pytest.approx((1 + 10 * 3 + 1) * 0.02)
+
+def test_scattered_letters_do_not_fire():
+    """Test characters of a phrase spread across other words score low."""
+    scorer = KeywordScorer(VOCAB, ["stop"])
+    confidence, _ = scorer.score(peaky_logits("SO THE OPEN PIT"))
+    
+    assert confidence.max() < 0.5
+
+def test_per_keyword_thresholds():
+    """Test per-phrase thresholds and rejection of characters outside the vocab."""
+    logits = peaky_logits("STOP")
+    logits[1 + 2 * 3, VOCAB.index("U")] = 14.0  # "O" nearly confused with "U"
+    
+    assert KeywordScorer(VOCAB, {"stop": 0.5}).detect(logits)
+    assert not KeywordScorer(VOCAB, {"stop": 0.95}).detect(logits)
+    with pytest.raises(ValueError):
+        KeywordScorer(VOCAB, ["stop!"])
+
+def test_spotter_fires_during_speech_once():
+    """Test the sliding-window spotter reports a hit once, while audio is still coming, with absolute times."""
+    transcriber = MagicMock()
+    # "STOP" spoken from 1.0s: absolute logits for 4 seconds of audio
+    stream_logits = np.zeros((200, len(VOCAB)), dtype=np.float32)
+    stream_logits[:, 0] = 15.0
+    stop = peaky_logits("STOP", lead_frames=0)
+    stream_logits[50:50 + len(stop)] = stop
+    spotter = KeywordSpotter(transcriber, ["stop"], window_s=2.0, hop_s=0.5, vocab=VOCAB)
+    
+    def get_logits(audio):
+        first_frame = (spotter._samples_seen - len(audio)) // 320
+        return torch.from_numpy(stream_logits[first_frame:first_frame + len(audio) // 320][None])
+    
+    transcriber.get_logits.side_effect = get_logits
+    
+    hits_per_block = [spotter.feed(np.zeros(4000, dtype=np.float32)) for _ in range(16)]  # 0.25s blocks
+    hits = [hit for block in hits_per_block for hit in block]
+    
+    assert [hit.keyword for hit in hits] == ["STOP"]
+    assert hits[0].start_time == pytest.approx(1.0)
+    # Fires on the first evaluation after the phrase ends (1.5s), not at end of audio
+    assert hits_per_block[5] == hits
+    assert transcriber.get_logits.call_count == 8
+
+def test_spotter_stream_positions():
+    """Test hit times follow the stream position passed in, and a gap starts a fresh window."""
+    transcriber = MagicMock()
+    offset = 10 * 16000
+    stream_logits = np.zeros((1000, len(VOCAB)), dtype=np.float32)
+    stream_logits[:, 0] = 15.0
+    stop = peaky_logits("STOP", lead_frames=0)
+    stream_logits[550:550 + len(stop)] = stop  # At 11.0s of stream time
+    spotter = KeywordSpotter(transcriber, ["stop"], window_s=2.0, hop_s=0.5, vocab=VOCAB)
+    windows = []
+    
+    def get_logits(audio):
+        first_frame = (spotter._samples_seen - len(audio)) // 320
+        windows.append((first_frame, len(audio)))
+        return torch.from_numpy(stream_logits[first_frame:first_frame + len(audio) // 320][None])
+    
+    transcriber.get_logits.side_effect = get_logits
+    
+    hits = []
+    for i in range(8):
+        hits += spotter.feed(np.zeros(4000, dtype=np.float32), position=offset + i * 4000)
+    
+    assert [hit.keyword for hit in hits] == ["STOP"]
+    assert hits[0].start_time == pytest.approx(11.0)
+    # A block that does not follow on is scored without the audio before the gap
+    spotter.feed(np.zeros(8000, dtype=np.float32), position=offset + 16 * 4000)
+    assert windows[-1] == ((offset + 16 * 4000) // 320, 8000)
+
+def test_spotter_warns_on_long_static_shape(capsys):
+    """Test a spotter on a transcriber padded far past the window warns, and one sized to it does not."""
+    KeywordSpotter(MagicMock(static_length=480000), ["stop"], window_s=2.0, vocab=VOCAB)
+    assert "static_input_length=32000" in capsys.readouterr().out
+    
+    KeywordSpotter(MagicMock(static_length=32000), ["stop"], window_s=2.0, vocab=VOCAB)
+    KeywordSpotter(MagicMock(static_length=None), ["stop"], window_s=2.0, vocab=VOCAB)
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,55 @@
+import pytest
+from unittest.mock import MagicMock
+import numpy as np
+from src.stt_npu.multichannel import MultichannelTranscriber
+
+BLOCK = 512
+
+class LoudnessVAD:
+    """Stand-in VAD: a block is speech when it is not silent."""
+    threshold = 0.5
+    
+    def speech_probability(self, chunk, sr):
+        return 1.0 if np.abs(chunk).max() > 0 else 0.0
+
+def make_pipeline(num_channels, **kwargs):
+    transcriber = MagicMock()
+    transcriber.transcribe_batch.side_effect = lambda chunks, probs: [f"{len(c)}" for c in chunks]
+    return transcriber, MultichannelTranscriber(transcriber, num_channels, vad_factory=LoudnessVAD, **kwargs)
+
+def feed(pipeline, audio):
+    results = []
+    for start in range(0, len(audio), BLOCK):
+        results += pipeline.process_block(audio[start:start + BLOCK])
+    return results
+
+def test_overlapping_speech_is_batched():
+    """Test utterances ending together on different channels share one inference call."""
+    transcriber, pipeline = make_pipeline(2)
+    audio = np.zeros((40 * BLOCK, 2), dtype=np.float32)
+    audio[5 * BLOCK:15 * BLOCK, 0] = 0.5
+    audio[8 * BLOCK:15 * BLOCK, 1] = 0.5
+    
+    results = feed(pipeline, audio)
+    
+    assert transcriber.transcribe_batch.call_count == 1
+    assert [r.channel for r in results] == [0, 1]
+    # 500ms of trailing silence is kept (16 blocks)
+    assert results[0].text == str((10 + 16) * BLOCK)
+    assert results[1].start_time == pytest.approx(8 * BLOCK / 16000)
+    assert pipeline.segments_transcribed == 2
+
+def test_batch_window_and_flush():
+    """Test the batch window holds a finished utterance for a later one, and flush ends open speech."""
+    transcriber, pipeline = make_pipeline(2, batch_window_ms=1000)
+    audio = np.zeros((30 * BLOCK, 2), dtype=np.float32)
+    audio[0:4 * BLOCK, 0] = 0.5
+    audio[10 * BLOCK:, 1] = 0.5
+    
+    assert feed(pipeline, audio) == []
+    results = pipeline.flush()
+    
+    assert transcriber.transcribe_batch.call_count == 1
+    assert [r.channel for r in results] == [0, 1]
+    with pytest.raises(ValueError):
+        pipeline.process_block(np.zeros((BLOCK, 3), dtype=np.float32))
@@ -0,0 +1,85 @@
+import json
+import os
+import pytest
+from src.stt_npu.core import Transcriber
+from src.stt_npu.registry import (
+    METADATA_FILE, Budget, describe_model, load_metadata, parse_budget, probe_variant, save_metadata, select_variant,
+)
+from src.stt_npu.synthetic import export_synthetic_model
+
+def measured(p95_ms, status="ok", memory_mb=100.0):
+    return {"status": status, "p50_ms": p95_ms * 0.8, "p95_ms": p95_ms, "p99_ms": p95_ms * 1.1,
+            "rtf": 0.01, "memory_mb": memory_mb, "input_length": 160000}
+
+@pytest.fixture
+def models_root(tmp_path):
+    """Two exported variants: a small one and a larger (more accurate) one."""
+    export_synthetic_model(str(tmp_path / "small"))
+    export_synthetic_model(str(tmp_path / "large"), hidden_size=128, num_layers=3)
+    return tmp_path
+
+def test_parse_budget():
+    """Test latency, duration, device and memory are read from a budget string."""
+    assert parse_budget("p95 < 300 ms for 10 s audio on CPU") == Budget(300.0, 10.0, "CPU", 95)
+    assert parse_budget("p99<80ms for 5s on npu, memory < 2 GB") == Budget(80.0, 5.0, "NPU", 99, 2048.0)
+    with pytest.raises(ValueError):
+        parse_budget("fast please")
+
+def test_describe_model_reads_ir(models_root):
+    """Test parameter count and precision come from the IR weights."""
+    small, large = describe_model(str(models_root / "small")), describe_model(str(models_root / "large"))
+    
+    assert small["precision"] == "FP32"
+    assert 0 < small["parameters"] < large["parameters"]
+
+def test_select_most_accurate_variant_that_fits(models_root):
+    """Test the largest variant within budget wins, and failures or slow variants are skipped."""
+    for name, results in (("small", {"10": measured(50)}), ("large", {"10": measured(250), "30": measured(700)})):
+        metadata = load_metadata(str(models_root / name))
+        metadata["measurements"]["CPU"] = results
+        metadata["measurements"]["NPU"] = {"30": {"status": "compile_failed", "error": "boom"}}
+        save_metadata(str(models_root / name), metadata)
+    
+    path, measurement = select_variant("p95 < 300 ms for 10 s audio on CPU", str(models_root))
+    assert os.path.basename(path) == "large" and measurement["p95_ms"] == 250
+    # 20s is covered only by the large variant's 30s measurement, which is too slow
+    with pytest.raises(ValueError, match="not probed"):
+        select_variant("p95 < 300 ms for 20 s on CPU", str(models_root))
+    with pytest.raises(ValueError, match="compile_failed"):
+        select_variant("p95 < 300 ms for 10 s on NPU", str(models_root))
+    with pytest.raises(ValueError):
+        select_variant("p95 < 300 ms for 10 s on CPU, memory < 50 MB", str(models_root))
+
+def test_known_wer_overrides_size(models_root):
+    """Test measured WER ranks variants when every variant has one."""
+    for name, wer in (("small", 0.05), ("large", 0.08)):
+        metadata = load_metadata(str(models_root / name))
+        metadata["wer"] = wer
+        metadata["measurements"]["CPU"] = {"10": measured(50)}
+        save_metadata(str(models_root / name), metadata)
+    
+    assert os.path.basename(select_variant(Budget(300.0), str(models_root))[0]) == "small"
+
+def test_probe_records_measurements_and_failures(models_root):
+    """Test a probe stores timings next to the IR and flags a model that cannot load."""
+    results = probe_variant(str(models_root / "small"), "CPU", [1.0], iterations=2)
+    
+    assert results["1"]["status"] == "ok" and results["1"]["p95_ms"] > 0
+    with open(models_root / "small" / METADATA_FILE, encoding="utf-8") as f:
+        assert json.load(f)["measurements"]["CPU"]["1"]["status"] == "ok"
+    
+    broken = models_root / "broken"
+    broken.mkdir()
+    (broken / "openvino_model.xml").write_text("not a model")
+    assert probe_variant(str(broken), "CPU", [1.0], save=False)["1"]["status"] == "compile_failed"
+
+def test_transcriber_from_budget(models_root):
+    """Test a Transcriber is built on the selected variant and the budget's device."""
+    metadata = load_metadata(str(models_root / "small"))
+    metadata["measurements"]["CPU"] = {"10": measured(50)}
+    save_metadata(str(models_root / "small"), metadata)
+    
+    transcriber = Transcriber.from_budget("p95 < 300 ms for 10 s audio on CPU", models_root=str(models_root))
+    
+    assert transcriber.model_path == str(models_root / "small")
+    assert transcriber.device == "CPU"
@@ -0,0 +1,141 @@
+import threading
+import time
+import pytest
+import numpy as np
+from unittest.mock import MagicMock, patch
+from src.stt_npu.sessions import SessionManager
+
+class CountingVAD:
+    """Stateful fake: 'speech' for the first N blocks of each stream, then silence."""
+    threshold = 0.5
+    
+    def __init__(self, speech_blocks=4):
+        self.speech_blocks = speech_blocks
+        self.count = 0
+    
+    def speech_probability(self, block, sample_rate):
+        self.count += 1
+        return 0.9 if self.count <= self.speech_blocks else 0.1
+    
+    def get_state(self):
+        return (self.count,)
+    
+    def set_state(self, state=None):
+        self.count = 0 if state is None else state[0]
+
+def make_manager(max_sessions=4, **kwargs):
+    transcriber = MagicMock()
+    transcriber.transcribe.side_effect = lambda audio, speech_probs=None: f"{len(audio)} samples"
+    return SessionManager(transcriber, vad=CountingVAD(), max_sessions=max_sessions, max_segment_s=2,
+                          silence_duration_ms=100, **kwargs), transcriber
+
+def test_interleaved_sessions_keep_separate_vad_state():
+    """Test each session's VAD state is swapped in, so interleaving does not mix streams."""
+    manager, transcriber = make_manager()
+    a, b = manager.open("a"), manager.open("b")
+    block = np.zeros(512, dtype=np.int16)
+    
+    results = []
+    for _ in range(8):
+        results.append(manager.process(a, block))
+        results.append(manager.process(b, block))
+    
+    transcripts = [r for r in results if r is not None]
+    # 4 speech blocks + 4 silence blocks (>= 100ms) each
+    assert [t.session_id for t in transcripts] == ["a", "b"]
+    assert all(t.text == f"{8 * 512} samples" for t in transcripts)
+    assert transcripts[0].start_time == 0.0
+
+def test_utterance_audio_round_trips_through_int16_slot():
+    """Test float32 and int16 input both reach the engine as the same float32 audio."""
+    manager, transcriber = make_manager()
+    rng = np.random.default_rng(0)
+    pcm = rng.integers(-32768, 32767, (4, 512)).astype(np.int16)
+    float_session, int_session = manager.open(), manager.open()
+    
+    for session, blocks in ((float_session, pcm.astype(np.float32) / 32768), (int_session, pcm)):
+        for block in blocks:
+            manager.process(session, block)
+        manager.close(session)
+        audio = transcriber.transcribe.call_args[0][0]
+        np.testing.assert_array_equal(audio, pcm.reshape(-1).astype(np.float32) / 32768)
+        np.testing.assert_allclose(transcriber.transcribe.call_args[1]["speech_probs"], [0.9] * 4, rtol=1e-6)
+
+def test_utterances_are_cut_at_slot_length():
+    """Test an utterance longer than the slot is transcribed when the slot fills."""
+    manager, transcriber = make_manager()
+    manager.vad.speech_blocks = 1000
+    session = manager.open()
+    
+    transcripts = [manager.process(session, np.ones(512, dtype=np.int16)) for _ in range(manager.slot_blocks)]
+    
+    assert transcripts[-1] is not None and transcripts[-1].text == f"{manager.slot_samples} samples"
+    assert not session.is_speaking
+
+def test_slots_are_reused_and_bounded():
+    """Test opening past max_sessions fails and closing frees the slot."""
+    manager, _ = make_manager(max_sessions=2)
+    first = manager.open()
+    manager.open()
+    with pytest.raises(RuntimeError):
+        manager.open()
+    
+    manager.close(first)
+    
+    assert manager.open().slot == first.slot
+
+def test_memory_report_counts_compact_state():
+    """Test idle sessions report a small state and no resident slot pages."""
+    manager, _ = make_manager()
+    session = manager.open()
+    manager.process(session, np.zeros(512, dtype=np.int16))
+    manager.vad.speech_blocks = 0
+    idle = manager.open()
+    manager.process(idle, np.zeros(512, dtype=np.int16))
+    
+    report = manager.memory_report()
+    
+    assert report["sessions"] == 2
+    assert report["state_bytes"] < 1024
+    # One int16 block and one probability written, averaged over two sessions
+    assert report["slot_bytes_resident"] == (512 * 2 + 4) / 2
+    assert not hasattr(session, "__dict__")
+
+def test_silero_state_swap_matches_separate_models():
+    """Test one Silero model with swapped state scores like one model per stream."""
+    pytest.importorskip("silero_vad")
+    from src.stt_npu.vad import VoiceActivityDetector
+    with patch("torch.hub.load", side_effect=RuntimeError("offline")):
+        shared, separate_a, separate_b = VoiceActivityDetector(), VoiceActivityDetector(), VoiceActivityDetector()
+    rng = np.random.default_rng(0)
+    streams = (0.3 * rng.standard_normal((2, 6, 512))).astype(np.float32)
+    
+    states = [None, None]
+    for i in range(6):
+        for stream, separate in ((0, separate_a), (1, separate_b)):
+            shared.set_state(states[stream])
+            prob = shared.speech_probability(streams[stream, i])
+            states[stream] = shared.get_state()
+            assert prob == pytest.approx(separate.speech_probability(streams[stream, i]), abs=1e-6)
+
+def test_slow_inference_does_not_block_other_sessions():
+    """Test another session's process returns while one session's utterance is still being transcribed."""
+    manager, transcriber = make_manager()
+    started, release = threading.Event(), threading.Event()
+    transcriber.transcribe.side_effect = lambda audio, speech_probs=None: (started.set(), release.wait(5), "slow")[2]
+    a, b = manager.open("a"), manager.open("b")
+    block = np.zeros(512, dtype=np.int16)
+    for _ in range(7):
+        manager.process(a, block)
+    
+    results = []
+    worker = threading.Thread(target=lambda: results.append(manager.process(a, block)))  # Ends a's utterance
+    worker.start()
+    assert started.wait(5)
+    start = time.perf_counter()
+    assert manager.process(b, block) is None
+    assert time.perf_counter() - start < 1.0
+    release.set()
+    worker.join(5)
+    
+    assert results[0].text == "slow" and results[0].session_id == "a"
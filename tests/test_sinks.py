@@ -0,0 +1,170 @@
+import io
+import json
+import os
+import socket
+import threading
+import time
+
+from src.stt_npu.sinks import (JSONLSink, Sink, SocketSink, StdoutSink, SubtitleSink, TranscriptEvent,
+                               TranscriptOutput)
+
+
+class SlowSink(Sink):
+    """Sink that blocks until released, like a stalled terminal or full pipe."""
+    name = "slow"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.events = []
+
+    def write(self, events):
+        self.release.wait()
+        self.events.extend(events)
+
+
+def test_jsonl_sink_writes_one_object_per_transcript(tmp_path):
+    """Test JSONL output has every field of every transcript."""
+    path = str(tmp_path / "out.jsonl")
+    with TranscriptOutput([JSONLSink(path)]) as output:
+        output.emit(TranscriptEvent("HELLO", 0.5, 1.25, inference_ms=12.0))
+        output.emit(TranscriptEvent("WORLD", 2.0, 3.0, stream="mic"))
+
+    with open(path) as f:
+        records = [json.loads(line) for line in f]
+    assert [r["text"] for r in records] == ["HELLO", "WORLD"]
+    assert records[0]["end_time"] == 1.25 and records[0]["inference_ms"] == 12.0
+    assert records[1]["stream"] == "mic"
+    assert all(r["wall_time"] is not None for r in records)
+
+
+def test_stdout_sink_format():
+    """Test the stdout sink prints the transcript and its stats."""
+    stream = io.StringIO()
+    with TranscriptOutput([StdoutSink(stream)]) as output:
+        output.emit(TranscriptEvent("HELLO", 0.0, 2.0, inference_ms=500.0))
+    assert stream.getvalue() == "> HELLO\n[Stats] 0.50s | RTF: 0.25\n"
+
+
+def test_status_text_in_order_on_stdout_only(tmp_path):
+    """Test status text reaches the stdout sink in order with transcripts and skips the other sinks."""
+    stream = io.StringIO()
+    path = str(tmp_path / "out.jsonl")
+    with TranscriptOutput([StdoutSink(stream, show_stats=False), JSONLSink(path)]) as output:
+        output.status("[Speech Detected]", end="")
+        output.status(".", end="")
+        output.emit(TranscriptEvent("HELLO", 0.0, 1.0))
+        output.status("Listening...")
+
+    assert stream.getvalue() == "[Speech Detected].> HELLO\nListening...\n"
+    with open(path) as f:
+        assert len(f.readlines()) == 1
+
+
+def test_subtitle_timestamps(tmp_path):
+    """Test SRT and VTT cue numbering and timestamp formats."""
+    srt, vtt = str(tmp_path / "out.srt"), str(tmp_path / "out.vtt")
+    with TranscriptOutput([SubtitleSink(srt), SubtitleSink(vtt)]) as output:
+        output.emit(TranscriptEvent("HELLO", 1.5, 3661.042))
+
+    with open(srt) as f:
+        assert f.read() == "1\n00:00:01,500 --> 01:01:01,042\nHELLO\n\n"
+    with open(vtt) as f:
+        assert f.read() == "WEBVTT\n\n1\n00:00:01.500 --> 01:01:01.042\nHELLO\n\n"
+
+
+def test_rolling_subtitles_keep_last_cues(tmp_path):
+    """Test a rolling subtitle file only holds the most recent cues."""
+    path = str(tmp_path / "live.srt")
+    sink = SubtitleSink(path, max_cues=2)
+    sink.write([TranscriptEvent(f"T{i}", i, i + 0.5) for i in range(5)])
+    sink.flush()
+
+    with open(path) as f:
+        cues = f.read().strip().split("\n\n")
+    assert [cue.splitlines()[0] for cue in cues] == ["4", "5"]
+    assert cues[-1].endswith("T4")
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_slow_sink_never_blocks_emit(tmp_path):
+    """Test emit returns at once while a sink is stuck, and overflow drops the oldest."""
+    slow = SlowSink()
+    path = str(tmp_path / "out.jsonl")
+    output = TranscriptOutput([slow, JSONLSink(path)], max_queue=4)
+
+    stall = 0.0
+    for i in range(20):
+        start = time.perf_counter()
+        output.emit(TranscriptEvent(f"T{i}", i, i + 1))
+        stall = max(stall, time.perf_counter() - start)
+        time.sleep(0.005)  # Give the healthy sink's writer a turn
+    assert stall < 0.1
+
+    stats = output.stats()
+    assert stats["slow"]["dropped"] > 0
+    assert stats["slow"]["max_backlog"] == 4
+    slow.release.set()
+    output.close()
+
+    # The stuck sink kept the newest transcripts; the other sink got everything
+    assert slow.events[-1].text == "T19"
+    assert len(slow.events) + output.stats()["slow"]["dropped"] == 20
+    with open(path) as f:
+        assert len(f.readlines()) == 20
+
+
+def test_status_never_displaces_transcripts():
+    """Test overflowing status text is counted apart and never pushes a queued transcript out."""
+    slow = SlowSink()
+    slow.accepts_status = True
+    output = TranscriptOutput([slow], max_queue=4)
+    output.emit(TranscriptEvent("T0", 0, 1))
+    deadline = time.time() + 5
+    while output.backlog and time.time() < deadline:
+        time.sleep(0.01)  # T0 is now stuck in write
+    output.status("Listening...")
+    for i in range(1, 3):
+        output.emit(TranscriptEvent(f"T{i}", i, i + 1))
+    for _ in range(10):
+        output.status(".", end="")
+    output.emit(TranscriptEvent("T3", 3, 4))  # Full: replaces the oldest item, the status line
+
+    stats = output.stats()["slow"]
+    assert (stats["dropped"], stats["dropped_status"]) == (0, 10)
+    slow.release.set()
+    while output.backlog and time.time() < deadline:
+        time.sleep(0.01)  # Drain before the stop marker needs room
+    output.close()
+    assert [event.text for event in slow.events if not isinstance(event, str)] == ["T0", "T1", "T2", "T3"]
+
+
+def test_close_does_not_hang_on_stuck_sink():
+    """Test close gives up on a sink that never returns, even with its queue full."""
+    slow = SlowSink()
+    output = TranscriptOutput([slow], max_queue=2)
+    for i in range(5):
+        output.emit(TranscriptEvent(f"T{i}", i, i + 1))
+
+    start = time.perf_counter()
+    output.close(timeout=0.2)
+    assert time.perf_counter() - start < 2
+    slow.release.set()
+
+
+def test_socket_sink_streams_to_subscribers(tmp_path):
+    """Test a connected process receives transcripts as JSON lines."""
+    address = str(tmp_path / "transcripts.sock")
+    sink = SocketSink(address)
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(address)
+    deadline = time.time() + 5
+    while sink.subscribers == 0 and time.time() < deadline:
+        time.sleep(0.01)
+
+    with TranscriptOutput([sink]) as output:
+        output.emit(TranscriptEvent("HELLO", 0.0, 1.0))
+    client.settimeout(5)
+    record = json.loads(client.makefile().readline())
+    client.close()
+    assert record["text"] == "HELLO"
+    assert not os.path.exists(address)
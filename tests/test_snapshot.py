@@ -0,0 +1,93 @@
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from src.stt_npu.core import Transcriber
+from src.stt_npu.snapshot import export_snapshot, load_snapshot, read_snapshot
+from src.stt_npu.streaming import StreamingTranscriber
+from src.stt_npu.synthetic import export_synthetic_model
+
+
+def noise_clips(lengths, seed=0):
+    rng = np.random.default_rng(seed)
+    return [(0.1 * rng.standard_normal(n)).astype(np.float32) for n in lengths]
+
+
+def test_snapshot_matches_transcriber(synthetic_model_dir, tmp_path):
+    """Test a dynamic-shape CPU snapshot gives the same logits and text as Transcriber."""
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU")
+    snapshot = load_snapshot(export_snapshot(synthetic_model_dir, str(tmp_path / "cpu.sttsnap"), device="CPU"))
+    clips = noise_clips([16000, 8000, 24000, 40000])
+
+    for clip in clips:
+        np.testing.assert_allclose(snapshot.get_logits(clip), transcriber.get_logits(clip).numpy(), atol=1e-5)
+        assert snapshot.transcribe(clip) == transcriber.transcribe(clip)
+    assert snapshot.transcribe_batch(clips) == transcriber.transcribe_batch(clips)
+    assert snapshot.transcribe(np.zeros(0, dtype=np.float32)) == ""
+
+
+def test_batched_snapshot_does_not_pad_rows(tmp_path):
+    """Test a dynamic snapshot with a batch of 2 only batches equal lengths, on a model that sees padding."""
+    model_dir = export_synthetic_model(str(tmp_path / "global-context"), global_context=True)
+    path = export_snapshot(model_dir, str(tmp_path / "batch.sttsnap"), device="CPU", batch_size=2)
+    snapshot = load_snapshot(path)
+    clips = noise_clips([16000, 8000, 16000])
+
+    logits = snapshot.get_logits_batch(clips)
+
+    assert snapshot.inference_calls == 2
+    for clip, batched in zip(clips, logits):
+        np.testing.assert_allclose(batched, snapshot.get_logits(clip), atol=1e-5)
+
+
+def test_static_snapshot_pads_like_npu(synthetic_model_dir, tmp_path):
+    """Test a static-shape snapshot normalizes and trims frames like Transcriber's NPU padding path."""
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU", static_input_length=32000)
+    path = export_snapshot(synthetic_model_dir, str(tmp_path / "static.sttsnap"), device="CPU", input_length=32000)
+    snapshot = load_snapshot(path)
+
+    for clip in noise_clips([8000, 20000, 32000]):
+        assert snapshot.transcribe(clip) == transcriber.transcribe(clip)
+    result = snapshot.transcribe(noise_clips([8000])[0], return_result=True)
+    assert (result.real_samples, result.padded_samples, result.bucket) == (8000, 24000, 32000)
+    assert result.infer_ms > 0
+
+
+def test_snapshot_file_contents(synthetic_model_dir, tmp_path):
+    """Test the snapshot is one file carrying blob, vocab, normalization and metadata."""
+    path = export_snapshot(synthetic_model_dir, str(tmp_path / "cpu.sttsnap"), device="CPU", input_length=16000)
+    header, blob = read_snapshot(path)
+
+    assert header["device"] == "CPU" and header["input_length"] == 16000
+    assert header["vocab"][:5] == ["<pad>", "<s>", "</s>", "<unk>", "|"]
+    assert header["do_normalize"] is True and header["blob_size"] == len(blob) > 0
+    with pytest.raises(ValueError):
+        load_snapshot(path, device="NPU")
+    (tmp_path / "model.xml").write_bytes(b"<?xml" + b"\0" * 32)
+    with pytest.raises(ValueError):
+        read_snapshot(str(tmp_path / "model.xml"))
+
+
+def test_snapshot_drives_streaming(synthetic_model_dir, tmp_path):
+    """Test streaming runs on a snapshot: numpy logits and the vocab from the snapshot file."""
+    snapshot = load_snapshot(export_snapshot(synthetic_model_dir, str(tmp_path / "cpu.sttsnap"), device="CPU"))
+    streamer = StreamingTranscriber(snapshot, chunk_s=1.0)
+    for block in np.array_split(noise_clips([48000])[0], 48000 // 512):
+        streamer.feed(block)
+    streamer.flush()
+    assert streamer.chunks_encoded > 0
+
+
+def test_loader_needs_no_torch(synthetic_model_dir, tmp_path):
+    """Test loading and running a snapshot imports neither torch nor transformers."""
+    path = export_snapshot(synthetic_model_dir, str(tmp_path / "cpu.sttsnap"), device="CPU")
+    code = (
+        "import sys, numpy as np\n"
+        "from src.stt_npu.snapshot import load_snapshot\n"
+        f"load_snapshot({path!r}).transcribe(np.zeros(16000, dtype=np.float32))\n"
+        "print(sorted(m for m in ('torch', 'transformers', 'optimum') if m in sys.modules))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
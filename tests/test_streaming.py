@@ -0,0 +1,76 @@
+import numpy as np
+from src.stt_npu.core import Transcriber
+from src.stt_npu.decoding import greedy_decode, load_vocab
+from src.stt_npu.streaming import StreamingTranscriber
+from src.stt_npu.synthetic import WAV2VEC2_VOCAB
+
+def noise(seconds, seed=0):
+    rng = np.random.default_rng(seed)
+    return (0.1 * rng.standard_normal(int(seconds * 16000))).astype(np.float32)
+
+def test_streaming_matches_whole_utterance(synthetic_model_dir):
+    """Test chunked streaming commits the same text as greedy decoding of the whole utterance."""
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU")
+    audio = noise(9.0)
+    expected = greedy_decode(transcriber.get_logits(audio)[0].numpy(), load_vocab(synthetic_model_dir))
+    
+    streamer = StreamingTranscriber(transcriber, chunk_s=2.0, left_context_s=1.0, right_context_s=0.5)
+    deltas = [streamer.feed(audio[i:i + 512]) for i in range(0, len(audio), 512)]
+    deltas.append(streamer.flush())
+    
+    assert streamer.text == expected
+    assert "".join(deltas).strip() == expected
+    assert streamer.chunks_encoded == 5
+
+class FrameLetterModel:
+    """Padded static-shape stand-in: one frame per started 320 samples, spelling each frame's stream index."""
+    model_path = None
+    
+    def get_logits(self, audio):
+        frames = -(-len(audio) // 320)
+        logits = np.zeros((1, frames, len(WAV2VEC2_VOCAB)), dtype=np.float32)
+        for k in range(frames):
+            logits[0, k, WAV2VEC2_VOCAB.index(chr(ord("A") + int(audio[k * 320]) % 26))] = 1.0
+        return logits
+
+def test_flush_commits_trailing_partial_frame(synthetic_model_dir):
+    """Test flush commits a last frame shorter than the 320-sample stride, and matches whole-utterance text."""
+    stream = np.repeat(np.arange(51, dtype=np.float32), 320)[:50 * 320 + 100]  # Sample value = frame index
+    streamer = StreamingTranscriber(FrameLetterModel(), chunk_s=0.5, left_context_s=0.2, right_context_s=0.1,
+                                    vocab=WAV2VEC2_VOCAB)
+    for i in range(0, len(stream), 512):
+        streamer.feed(stream[i:i + 512])
+    streamer.flush()
+    
+    assert streamer.text == "".join(chr(ord("A") + f % 26) for f in range(51))
+    
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU")
+    audio = noise(9.0)[:9 * 16000 - 130]
+    streamer = StreamingTranscriber(transcriber, chunk_s=2.0, left_context_s=1.0, right_context_s=0.5)
+    for i in range(0, len(audio), 512):
+        streamer.feed(audio[i:i + 512])
+    streamer.flush()
+    assert streamer.text == greedy_decode(transcriber.get_logits(audio)[0].numpy(), load_vocab(synthetic_model_dir))
+
+def test_buffer_stays_bounded(synthetic_model_dir):
+    """Test only the left context plus unconsumed audio is kept, and windows never exceed window_samples."""
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU")
+    streamer = StreamingTranscriber(transcriber, chunk_s=1.0, left_context_s=0.5, right_context_s=0.25)
+    lengths = []
+    original = transcriber.get_logits
+    transcriber.get_logits = lambda audio: lengths.append(len(audio)) or original(audio)
+    
+    audio = noise(20.0)
+    for i in range(0, len(audio), 512):
+        streamer.feed(audio[i:i + 512])
+        assert len(streamer._buffer) <= streamer.window_samples
+    
+    assert max(lengths) == streamer.window_samples
+    streamer.reset()
+    assert streamer.text == "" and len(streamer._buffer) == 0
+
+def test_static_input_length_sets_npu_window(synthetic_model_dir):
+    """Test a window-sized static shape can be requested for streaming on NPU."""
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU", static_input_length=16000)
+    
+    assert transcriber.STATIC_INPUT_LENGTH == 16000
@@ -0,0 +1,31 @@
+import pytest
+import numpy as np
+import openvino as ov
+from src.stt_npu.synthetic import WAV2VEC2_VOCAB, build_synthetic_model, num_output_frames
+
+@pytest.mark.parametrize("num_samples", [16000, 48000, 16000 * 30])
+def test_output_frames_match_wav2vec2_stride(num_samples):
+    """Test the synthetic model emits the same frame count as the real encoder."""
+    compiled = ov.Core().compile_model(build_synthetic_model(), "CPU")
+    
+    logits = compiled(np.zeros((1, num_samples), dtype=np.float32))["logits"]
+    
+    assert logits.shape == (1, num_output_frames(num_samples), len(WAV2VEC2_VOCAB))
+
+def test_model_signature_matches_export():
+    """Test input/output names match an optimum Wav2Vec2 export."""
+    model = build_synthetic_model()
+    
+    assert model.input(0).get_any_name() == "input_values"
+    assert model.output(0).get_any_name() == "logits"
+    assert model.input(0).get_partial_shape().is_dynamic
+
+def test_weights_are_seeded():
+    """Test the same seed gives identical logits."""
+    audio = np.random.default_rng(1).standard_normal((1, 16000)).astype(np.float32)
+    core = ov.Core()
+    
+    a = core.compile_model(build_synthetic_model(seed=3), "CPU")(audio)["logits"]
+    b = core.compile_model(build_synthetic_model(seed=3), "CPU")(audio)["logits"]
+    
+    np.testing.assert_array_equal(a, b)
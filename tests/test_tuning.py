@@ -0,0 +1,61 @@
+from unittest.mock import MagicMock
+from src.stt_npu.core import Transcriber
+from src.stt_npu.tuning import candidate_configs, load_profile, save_profile, tune
+
+def make_profile(model_path, device="CPU", input_length=16000, config=None):
+    return {
+        "model_path": model_path,
+        "device": device,
+        "input_length": input_length,
+        "objective": "latency",
+        "config": config or {"PERFORMANCE_HINT": "LATENCY"},
+    }
+
+def test_profile_roundtrip(tmp_path):
+    """Test a saved profile is found by exact shape and falls back to any shape."""
+    model_path = str(tmp_path / "model")
+    save_profile(make_profile(model_path, input_length=16000))
+    
+    assert load_profile(model_path, "cpu", 16000)["input_length"] == 16000
+    assert load_profile(model_path, "CPU", 32000)["input_length"] == 16000
+    assert load_profile(model_path, "NPU", 16000) is None
+
+def test_candidate_configs_respect_supported_properties():
+    """Test properties the plugin does not expose are left out of the sweep."""
+    core = MagicMock()
+    core.get_property.side_effect = lambda device, name: {
+        "SUPPORTED_PROPERTIES": {"PERFORMANCE_HINT": "RW", "INFERENCE_PRECISION_HINT": "RW"},
+        "OPTIMIZATION_CAPABILITIES": ["FP16"],
+    }[name]
+    
+    configs = candidate_configs(core, "npu")
+    
+    assert {c["PERFORMANCE_HINT"] for c in configs} == {"LATENCY", "THROUGHPUT"}
+    assert {c["INFERENCE_PRECISION_HINT"] for c in configs} == {"f32", "f16"}
+    assert all(set(c) == {"PERFORMANCE_HINT", "INFERENCE_PRECISION_HINT"} for c in configs)
+
+def test_tuned_profile_applied_at_startup(synthetic_model_dir):
+    """Test the tuner picks a winner and Transcriber loads it automatically."""
+    configs = [
+        {"PERFORMANCE_HINT": "LATENCY", "INFERENCE_NUM_THREADS": "1"},
+        {"PERFORMANCE_HINT": "THROUGHPUT"},
+    ]
+    profile = tune(synthetic_model_dir, "CPU", 16000, objective="throughput", iterations=2, configs=configs)
+    save_profile(profile)
+    
+    transcriber = Transcriber(model_path=synthetic_model_dir, device="CPU")
+    
+    assert profile["config"] in configs
+    assert len(profile["trials"]) == 2
+    assert transcriber.ov_config == profile["config"]
+
+def test_explicit_ov_config_overrides_profile(synthetic_model_dir):
+    """Test explicit ov_config wins over the tuned profile, and profiles can be disabled."""
+    save_profile(make_profile(synthetic_model_dir, input_length=Transcriber.STATIC_INPUT_LENGTH,
+                              config={"PERFORMANCE_HINT": "THROUGHPUT", "INFERENCE_NUM_THREADS": "1"}))
+    
+    overridden = Transcriber(synthetic_model_dir, device="CPU", ov_config={"PERFORMANCE_HINT": "LATENCY"})
+    untuned = Transcriber(synthetic_model_dir, device="CPU", use_tuned_profile=False)
+    
+    assert overridden.ov_config == {"PERFORMANCE_HINT": "LATENCY", "INFERENCE_NUM_THREADS": "1"}
+    assert untuned.ov_config == {}
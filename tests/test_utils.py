@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from src.stt_npu.utils import error_rate, find_speech_bounds, frame_energy_db, trim_silence
+
+def make_clip(lead=16000, speech=8000, tail=16000):
+    """Silence, a burst of noise standing in for speech, then silence."""
+    rng = np.random.default_rng(0)
+    clip = np.zeros(lead + speech + tail, dtype=np.float32)
+    clip[lead:lead + speech] = 0.3 * rng.standard_normal(speech)
+    return clip
+
+def test_frame_energy_includes_partial_frame():
+    """Test energy has one value per (partial) frame."""
+    energy = frame_energy_db(np.ones(1000, dtype=np.float32), frame_size=512)
+    
+    assert energy.shape == (2,)
+    assert energy[0] == pytest.approx(0.0, abs=1e-3)
+
+def test_trim_silence_energy_keeps_margin():
+    """Test energy-based trimming removes silent edges but keeps the margin."""
+    clip = make_clip()
+    
+    start, end = find_speech_bounds(clip, margin_samples=1600)
+    trimmed, removed = trim_silence(clip, margin_samples=1600)
+    
+    assert start <= 16000 - 1600
+    assert end >= 24000 + 1600
+    assert removed == len(clip) - len(trimmed)
+    assert removed > 20000
+
+def test_trim_silence_uses_vad_probabilities():
+    """Test VAD probabilities take precedence over energy."""
+    clip = make_clip()
+    probs = np.zeros(-(-len(clip) // 512))
+    probs[10:12] = 0.9
+    
+    assert find_speech_bounds(clip, probs, margin_samples=0) == (10 * 512, 12 * 512)
+
+def test_trim_silence_all_silent():
+    """Test a clip without speech trims to nothing."""
+    trimmed, removed = trim_silence(np.zeros(16000, dtype=np.float32))
+    
+    assert len(trimmed) == 0
+    assert removed == 16000
+
+def test_error_rates():
+    """Test WER counts word edits and CER ignores spaces."""
+    assert error_rate("THE CAT SAT", "THE CAT SAT") == 0.0
+    assert error_rate("THE CAT SAT", "THE BAT") == 2 / 3
+    assert error_rate("THE CAT", "THECAT", unit="char") == 0.0
+    assert error_rate("ABCD", "ABXD", unit="char") == 0.25
+    assert error_rate("", "") == 0.0
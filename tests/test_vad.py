@@ -53,3 +53,13 @@ def test_is_speech_not_detected(mock_torch_hub):
     result = vad.is_speech(dummy_audio, sample_rate)
     
     assert result is False
+
+def test_speech_probability(mock_torch_hub):
+    """Test speech_probability returns the raw model probability."""
+    mock_model = MagicMock()
+    mock_model.return_value = torch.tensor([0.7])
+    mock_torch_hub.return_value = (mock_model, (MagicMock(), MagicMock(), MagicMock()))
+    
+    vad = VoiceActivityDetector(threshold=0.5)
+    
+    assert vad.speech_probability(np.zeros(512, dtype=np.float32)) == pytest.approx(0.7)